@@ -46,11 +46,37 @@ DATABASES = {
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
         'OPTIONS': {
-            'connect_timeout': 20,
-        }
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+        },
+        # Постоянные соединения (при DB_POOL=false): соединение живет CONN_MAX_AGE секунд
+        # и переиспользуется следующими запросами потока, перед этим проверяется
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Пул соединений psycopg 3 в каждом процессе (DB_POOL, по умолчанию включен). Заменяет CONN_MAX_AGE:
+# Django требует CONN_MAX_AGE = 0, соединение возвращается в пул в конце запроса.
+# Одновременно соединение нужно не больше чем потокам воркера gunicorn и потокам
+# обработки изображений, поэтому max_size по умолчанию - их сумма. Всего соединений:
+# воркеры * max_size, это должно укладываться в max_connections PostgreSQL (см. docker-compose.yaml)
+# Проверку соединения при выдаче из пула Django включает сам по CONN_HEALTH_CHECKS
+if os.environ.get('DB_POOL', 'True').lower() in ('true', '1', 'yes', 'on'):
+    DB_POOL_MAX_SIZE = int(
+        os.environ.get('DB_POOL_MAX_SIZE')
+        or int(os.environ.get('GUNICORN_THREADS') or 4) + int(os.environ.get('IMAGE_PROCESSING_WORKERS') or 2)
+    )
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': min(int(os.environ.get('DB_POOL_MIN_SIZE', '2')), DB_POOL_MAX_SIZE),
+        'max_size': DB_POOL_MAX_SIZE,
+        # Сколько ждать свободного соединения, прежде чем запрос упадет
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        # Простаивающие и слишком старые соединения закрываются и пересоздаются
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+    }
+
 # ==============================================================================
 # CORS CONFIGURATION
 # ==============================================================================
@@ -64,14 +90,34 @@ CORS_ALLOW_ALL_ORIGINS = os.environ.get('CORS_ALLOW_ALL_ORIGINS', 'True').lower(
 
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1')
 ITEMS_COUNT_CACHE_TIMEOUT = int(os.environ.get('ITEMS_COUNT_CACHE_TIMEOUT', '300'))
+# Порог (в строках), с которого количество берется из pg_class.reltuples; пусто - всегда точный COUNT
+ITEMS_COUNT_ESTIMATE_THRESHOLD = os.environ.get('ITEMS_COUNT_ESTIMATE_THRESHOLD')
+ITEMS_COUNT_ESTIMATE_THRESHOLD = int(ITEMS_COUNT_ESTIMATE_THRESHOLD) if ITEMS_COUNT_ESTIMATE_THRESHOLD else None
+
+# Модели, для которых ведутся версии данных (core/versions.py): публичный каталог
+# и встраиваемые в него изображения. По версиям строятся ETag и сбрасывается кеш ответов
+VERSIONED_MODELS = [
+    'goods.Good',
+    'tests.Test',
+    'news.News',
+    'services.Service',
+    'specialists.Specialist',
+    'service_directions.ServiceDirection',
+    'service_types.ServiceType',
+    'job_titles.JobTitle',
+    'images.ImageModel',
+]
+
+# Кеш ответов каталога для анонимных запросов (core/response_cache.py):
+# мягкий срок записи, время блокировки пересчета и коэффициент досрочного обновления
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '300'))
+RESPONSE_CACHE_LOCK_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_LOCK_TIMEOUT', '10'))
+RESPONSE_CACHE_EARLY_REFRESH_BETA = float(os.environ.get('RESPONSE_CACHE_EARLY_REFRESH_BETA', '1.0'))
 
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': REDIS_URL,
-        'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-        },
         'KEY_PREFIX': 'alekhin',
         'TIMEOUT': ITEMS_COUNT_CACHE_TIMEOUT,
     }
@@ -127,6 +173,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     'rest_framework',
     'drf_yasg',
@@ -134,6 +181,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'watson',
+    'core',
     'accounts',
     'specialists',
     'services',
@@ -192,6 +240,20 @@ WSGI_APPLICATION = 'alekhin.wsgi.application'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Фоновая обработка загруженных изображений (images/tasks.py)
+IMAGE_PROCESSING_WORKERS = int(os.environ.get('IMAGE_PROCESSING_WORKERS', '2'))
+# Обрабатывать сразу в запросе (для тестов и отладки)
+IMAGE_PROCESSING_SYNC = os.environ.get('IMAGE_PROCESSING_SYNC', 'False').lower() in ('true', '1', 'yes', 'on')
+# Загрузка по частям (/images/uploads/): каталог для собираемых файлов вне MEDIA_ROOT и предельный размер
+IMAGE_UPLOAD_TEMP_DIR = os.environ.get('IMAGE_UPLOAD_TEMP_DIR', os.path.join(BASE_DIR, 'uploads_tmp'))
+IMAGE_UPLOAD_MAX_SIZE = int(os.environ.get('IMAGE_UPLOAD_MAX_SIZE', str(200 * 1024 * 1024)))
+# Варианты изображений для srcset: ширины и форматы (avif - если Pillow собран с libavif)
+IMAGE_VARIANT_WIDTHS = [int(width) for width in os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,1024,1920').split(',')]
+IMAGE_VARIANT_FORMATS = os.environ.get('IMAGE_VARIANT_FORMATS', 'webp').split(',')
+# Ограничение большей стороны основного изображения (пусто или 0 - сохранять исходный размер).
+# Оригинал после обработки удаляется, поэтому по умолчанию основное изображение не уменьшается
+IMAGE_MAX_SIDE = int(os.environ.get('IMAGE_MAX_SIDE') or 0) or None
+
 # ==============================================================================
 # AUTHENTICATION CONFIGURATION
 # ==============================================================================
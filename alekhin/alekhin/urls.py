@@ -61,6 +61,7 @@ urlpatterns = [
     path('goods/', include('goods.urls')),
     path('items_count/', include('items_count.urls')),
     path('news/', include('news.urls')),  
+    path('response_cache/', include('core.urls')),
 
 ] 
 
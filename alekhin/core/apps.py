@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from django.db.models import CharField, ForeignKey, TextField
+        from .lookups import AnyLookup, ImmutableUnaccent
+
+        CharField.register_lookup(ImmutableUnaccent)
+        TextField.register_lookup(ImmutableUnaccent)
+        ForeignKey.register_lookup(AnyLookup)
+
+        from .versions import connect_version_signals
+
+        connect_version_signals()
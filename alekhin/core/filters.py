@@ -0,0 +1,68 @@
+# alekhin/core/filters.py
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+
+def normalize_list_value(value):
+    """
+    Значение фильтра в каноническом виде: числа и числовые строки -
+    int ("1" и 1 - один и тот же ID), остальное - строка без пробелов по краям
+    """
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if value.lstrip('-').isdigit():
+        return int(value)
+    return value
+
+
+def normalize_json_list(values):
+    """Нормализует элементы и убирает повторы, сохраняя порядок"""
+    if not isinstance(values, list):
+        return values
+    result = []
+    for value in map(normalize_list_value, values):
+        if value != '' and value not in result:
+            result.append(value)
+    return result
+
+
+def strip_json_list(values):
+    """
+    Пробелы по краям строковых элементов: "3 " -> "3". Типы элементов
+    не меняются, иначе клиенты получили бы не то, что записали
+    """
+    if not isinstance(values, list):
+        return values
+    return [value.strip() if isinstance(value, str) else value for value in values]
+
+
+def parse_list_param(value):
+    """Параметр запроса '1,3/' -> [1, 3]"""
+    return normalize_json_list(value.rstrip('/').split(','))
+
+
+def json_value_variants(value):
+    """
+    Сохраненные списки не нормализуются (клиенты получают их как записали),
+    поэтому ID ищется и числом, и строкой: 3 и "3"
+    """
+    return [value, str(value)] if isinstance(value, int) else [value]
+
+
+def json_contains_any(field, values):
+    """
+    Условие "список содержит хотя бы одно из values" через jsonb @>.
+
+    Каждое значение (в обеих формах ID) - отдельное field @> '[value]',
+    условия объединяются через OR: планировщик выполняет их как BitmapOr
+    по GIN-индексу (jsonb_path_ops), без приведения jsonb к тексту и ложных
+    совпадений вроде "1" внутри "12"
+    """
+    return reduce(or_, (
+        Q(**{f'{field}__contains': [variant]})
+        for value in values
+        for variant in json_value_variants(value)
+    ))
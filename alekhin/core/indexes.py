@@ -0,0 +1,13 @@
+# alekhin/core/indexes.py
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Lower
+
+from .lookups import ImmutableUnaccent
+
+
+def trigram_index(field, name):
+    """Триграммный GIN-индекс по LOWER(F_UNACCENT(field)) - выражению из SmartSearch"""
+    return GinIndex(
+        OpClass(Lower(ImmutableUnaccent(field)), name='gin_trgm_ops'),
+        name=name,
+    )
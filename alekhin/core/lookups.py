@@ -0,0 +1,30 @@
+# alekhin/core/lookups.py
+from django.db.models import Lookup, Transform
+
+
+class ImmutableUnaccent(Transform):
+    """
+    unaccent() через IMMUTABLE-обертку f_unaccent (миграция core.0002).
+
+    Штатный unaccent() помечен как STABLE, поэтому по нему нельзя построить
+    индекс по выражению. Поиск использует эту трансформацию, а индексы
+    строятся по тому же выражению LOWER(F_UNACCENT(поле)).
+    """
+
+    bilateral = True
+    lookup_name = 'immutable_unaccent'
+    function = 'F_UNACCENT'
+
+
+class AnyLookup(Lookup):
+    """
+    поле = ANY(массив). В паре с ArraySubquery дает условие, которое
+    планировщик может выполнить индексным сканированием внутри OR.
+    """
+
+    lookup_name = 'any'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} = ANY({rhs})', (*lhs_params, *rhs_params)
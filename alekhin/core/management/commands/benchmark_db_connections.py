@@ -0,0 +1,105 @@
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+
+# Режимы соединений: переменные окружения для settings.DATABASES
+MODES = {
+    'per-request': {'DB_POOL': 'false', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': 'false', 'DB_CONN_MAX_AGE': '60'},
+    'pool': {'DB_POOL': 'true'},
+}
+
+# Дешевые эндпойнты, где подключение к БД заметнее всего
+DEFAULT_URL_NAMES = ['job-titles-list', 'service-types-list', 'good-list']
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку запроса и число новых соединений с PostgreSQL '
+        'при конкурентной нагрузке: без постоянных соединений, с CONN_MAX_AGE и с пулом psycopg'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=MODES,
+            help='Замерить один режим в текущем процессе (по умолчанию - все, каждый в своем процессе)'
+        )
+        parser.add_argument('--threads', type=int, default=8, help='Одновременных потоков (как потоки gunicorn)')
+        parser.add_argument('--requests', type=int, default=200, help='Запросов на поток')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            self.run_mode(options['mode'], options['threads'], options['requests'])
+            return
+
+        # Настройки БД читаются при старте, поэтому каждый режим - отдельный процесс
+        self.stdout.write(
+            f"{'режим':<12} {'запросов':>9} {'RPS':>8} {'p50, мс':>8} {'p95, мс':>8} "
+            f"{'connect()':>10} {'новых соединений':>17}"
+        )
+        for mode, env in MODES.items():
+            subprocess.run(
+                [
+                    sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'),
+                    'benchmark_db_connections', '--mode', mode,
+                    '--threads', str(options['threads']), '--requests', str(options['requests']),
+                ],
+                # Размер пула по умолчанию следует за числом потоков воркера
+                env={**os.environ, **env, 'GUNICORN_THREADS': str(options['threads'])},
+                check=True,
+            )
+
+    def run_mode(self, mode, threads, requests):
+        urls = [reverse(name) for name in DEFAULT_URL_NAMES]
+        connects = []
+        # Физическое соединение - объект соединения psycopg; из пула он выдается повторно
+        physical = set()
+        lock = threading.Lock()
+
+        def on_connection_created(sender, connection, **kwargs):
+            with lock:
+                connects.append(1)
+                physical.add(connection.connection)
+
+        def worker(index):
+            client = Client()
+            latencies = []
+            try:
+                for number in range(requests):
+                    started = time.perf_counter()
+                    # Как WSGI-обработчик: request_started / request_finished.
+                    # Тестовый клиент эти обработчики отключает
+                    close_old_connections()
+                    client.get(urls[(index + number) % len(urls)])
+                    close_old_connections()
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+            return latencies
+
+        connection_created.connect(on_connection_created)
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                results = list(pool.map(worker, range(threads)))
+            elapsed = time.perf_counter() - started
+        connection_created.disconnect(on_connection_created)
+
+        latencies = sorted(latency for result in results for latency in result)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'{mode:<12} {len(latencies):>9} {len(latencies) / elapsed:>8.1f} '
+            f'{statistics.median(latencies) * 1000:>8.2f} {p95 * 1000:>8.2f} '
+            f'{len(connects):>10} {len(physical):>17}'
+        )
@@ -0,0 +1,84 @@
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand
+from django.db.models import Func, IntegerField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+# Эндпойнт, модель и поля карточки для ?fields=
+CATALOG_ENDPOINTS = [
+    ('good-list', 'goods.Good', 'id,name,image,price,article,slug', {}),
+    ('test-list', 'tests.Test', 'id,name,price,time,slug', {'cursor': ''}),
+    ('news-list', 'news.News', 'id,title,image,time_to_read,slug,created_at', {}),
+    ('service-list', 'services.Service', 'id,name,price,main_image,is_popular,slug', {}),
+    ('specialist-list', 'specialists.Specialist', 'id,name,image,experience,is_reliable', {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает размер страницы списка каталога (байты ответа и байты '
+        'прочитанных колонок в БД) в полном виде и с ?fields= для карточек'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        client = APIClient()
+        page_size = options['page_size']
+
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for url_name, model_label, fields, extra in CATALOG_ENDPOINTS:
+                model = apps.get_model(model_label)
+                params = {'page_size': page_size, **extra}
+
+                full = self.measure(client, url_name, model, params)
+                compact = self.measure(client, url_name, model, {**params, 'fields': fields})
+                if full is None:
+                    self.stdout.write(f'{url_name}: нет данных')
+                    continue
+
+                self.stdout.write(
+                    f'{url_name} ({full["rows"]} записей): '
+                    f'ответ {full["response"]} -> {compact["response"]} байт '
+                    f'({self.ratio(full["response"], compact["response"])}), '
+                    f'колонки в БД {full["db"]} -> {compact["db"]} байт '
+                    f'({self.ratio(full["db"], compact["db"])})'
+                )
+
+    def measure(self, client, url_name, model, params):
+        response = client.get(reverse(url_name), params)
+        data = response.json()
+        results = data['results'] if isinstance(data, dict) else data
+        if not results:
+            return None
+
+        columns = []
+        for key in results[0]:
+            try:
+                field = model._meta.get_field(key)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                columns.append(field.attname)
+
+        return {
+            'rows': len(results),
+            'response': len(response.content),
+            'db': self.column_bytes(model, [item['id'] for item in results], columns),
+        }
+
+    def column_bytes(self, model, ids, columns):
+        """Сумма pg_column_size выбранных колонок по записям страницы"""
+        size = sum(
+            (Coalesce(Func(column, function='pg_column_size', output_field=IntegerField()), Value(0))
+             for column in columns),
+            Value(0),
+        )
+        return model._default_manager.filter(pk__in=ids).aggregate(bytes=Sum(size))['bytes'] or 0
+
+    def ratio(self, full, compact):
+        return f'в {full / compact:.1f} раза меньше' if compact else '-'
@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import SearchDocumentModel
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поисковые документы (search_vector) для существующих записей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Модели в формате app_label.Model (по умолчанию - все с поисковым документом)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество записей, обновляемых одним UPDATE'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size должен быть положительным числом')
+
+        for model in self.get_models(options['models']):
+            updated = 0
+            last_pk = None
+            queryset = model._default_manager.order_by('pk')
+
+            while True:
+                batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+                pks = list(batch.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                updated += model._default_manager.filter(pk__in=pks).update_search_vector()
+                last_pk = pks[-1]
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.label}: обновлено записей - {updated}'
+            ))
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model for model in apps.get_models()
+                if issubclass(model, SearchDocumentModel)
+            ]
+
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError(f'Модель {label} не найдена')
+            if not issubclass(model, SearchDocumentModel):
+                raise CommandError(f'У модели {label} нет поискового документа')
+            models.append(model)
+        return models
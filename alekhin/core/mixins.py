@@ -0,0 +1,257 @@
+# alekhin/core/mixins.py
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from . import response_cache
+from .versions import get_model_versions
+
+
+class CountedListMixin:
+    """
+    list() со счетчиками в заголовках Total-Count и count_headers.
+
+    Все счетчики считаются одним aggregate(Count, Count(filter=...)),
+    а общее количество передается пагинатору вместо его собственного COUNT.
+    Для поиска по триграммам это один проход по выборке вместо трех.
+    """
+
+    count_headers = {
+        'Enabled-Count': Q(enabled=True),
+    }
+
+    def get_list_counts(self, queryset):
+        aggregates = {'total': Count('pk')}
+        for index, condition in enumerate(self.count_headers.values()):
+            aggregates[f'count_{index}'] = Count('pk', filter=condition)
+        result = queryset.aggregate(**aggregates)
+
+        counts = {'Total-Count': result['total']}
+        for index, header in enumerate(self.count_headers):
+            counts[header] = result[f'count_{index}']
+        return counts
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        counts = self.get_list_counts(queryset)
+
+        if self.paginator is not None:
+            self.paginator.known_count = counts['Total-Count']
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = self.get_unpaginated_response(serializer.data, counts)
+
+        # Добавляем счетчики в заголовки
+        for header, value in counts.items():
+            response[header] = str(value)
+        response['Access-Control-Expose-Headers'] = ', '.join(counts)
+
+        return response
+
+    def get_unpaginated_response(self, data, counts):
+        return Response(data)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Для list/retrieve с ?fields= или ?omit= выбирает из базы только колонки,
+    нужные сериализатору (SparseFieldsetMixin.get_model_fields), через only().
+    Тяжелые TextField карточкам не нужны и не читаются с диска.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions:
+            return queryset
+
+        params = self.request.query_params
+        if 'fields' not in params and 'omit' not in params:
+            return queryset
+
+        serializer = self.get_serializer()
+        model_fields = getattr(serializer, 'get_model_fields', lambda: None)()
+        if model_fields:
+            # Keyset-пагинация строит курсор из полей сортировки
+            cursor_fields = {name.lstrip('-') for name in getattr(self.paginator, 'cursor_ordering', ())}
+            queryset = queryset.only(*model_fields, *cursor_fields)
+        return queryset
+
+
+class NotModified(Exception):
+    pass
+
+
+class CachedResponse(Exception):
+    """Ответ найден в кеше (ResponseCacheMixin); отдается без вызова обработчика"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET для list/retrieve: ETag и Last-Modified, ответ 304 на
+    If-None-Match / If-Modified-Since без выборки и сериализации.
+
+    Валидатор строится из версии модели (core.versions, меняется сигналами
+    post_save/post_delete) и одного запроса count + max(updated_at), если
+    у модели есть updated_at - он ловит и изменения в обход сигналов (update()).
+    В ETag входят также аудитория (аноним/сотрудник) и параметры запроса.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+    # Данные, встраиваемые по ?expand=, тоже влияют на ответ
+    expand_models = {'images': 'images.ImageModel'}
+
+    def get_conditional_model(self):
+        return self.get_queryset().model
+
+    def get_dependent_models(self, request):
+        expand = request.query_params.get('expand', '').split(',')
+        return [apps.get_model(label) for name, label in self.expand_models.items() if name in expand]
+
+    def get_validators(self, request):
+        """(ETag, Last-Modified как timestamp)"""
+        model = self.get_conditional_model()
+        versions = get_model_versions([model, *self.get_dependent_models(request)])
+        last_modified = max(versions)
+        parts = [
+            model._meta.label,
+            *map(repr, versions),
+            'staff' if request.user.is_authenticated else 'anonymous',
+            request.path,
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+        ]
+
+        aggregates = {'count': Count('pk')}
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            aggregates['last'] = Max('updated_at')
+        state = model._default_manager.aggregate(**aggregates)
+        parts.append(state['count'])
+        if state.get('last'):
+            parts.append(state['last'].isoformat())
+            last_modified = max(last_modified, state['last'].timestamp())
+
+        etag = hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+        return f'"{etag}"', int(last_modified)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        # Проверка после аутентификации и прав, но до выборки и сериализации
+        self.validators = self.get_validators(request)
+        etag, last_modified = self.validators
+        if get_conditional_response(request._request, etag=etag, last_modified=last_modified) is not None:
+            raise NotModified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # Клиент должен перепроверять ответ при каждом обращении
+            patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """
+    Кеш ответов list/retrieve для анонимных запросов в Redis.
+
+    Запись хранится по ключу из пути и нормализованной строки запроса
+    (core.response_cache) вместе с ETag, при котором она построена.
+    ETag меняется с версией модели (post_save/post_delete) и состоянием
+    таблицы, поэтому отдельного сброса кеша не нужно: запись с чужим
+    ETag просто устарела. На попадании остаются запрос валидатора
+    и рендеринг; выборка, счетчики и сериализация не выполняются.
+
+    Защита от лавины запросов: устаревшую запись пересчитывает только
+    запрос, взявший блокировку, остальные получают прежний ответ
+    (без ETag, чтобы клиент не закешировал его под новым). Перед
+    истечением срока запись обновляется досрочно (XFetch).
+    Счетчики hit/miss/stale - GET /response_cache/stats/.
+    """
+
+    cached_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        if (
+            request.method != 'GET'
+            or self.action not in self.cached_actions
+            or request.user.is_authenticated
+            or not self.validators
+        ):
+            return
+
+        label = self.get_conditional_model()._meta.label_lower
+        key = response_cache.get_cache_key(label, request)
+        etag = self.validators[0]
+        entry = cache.get(key)
+
+        self.response_cache_locked = False
+        if response_cache.is_fresh(entry, etag):
+            outcome = 'hit'
+        elif response_cache.acquire_lock(key):
+            outcome = 'miss'
+            self.response_cache_locked = True
+        elif entry is not None and entry['etag'] == etag:
+            # Досрочное обновление уже идет, запись еще актуальна
+            outcome = 'hit'
+        elif entry is not None:
+            outcome = 'stale'
+            self.validators = None
+        else:
+            # Холодный кеш: ждать некого, строим ответ сами
+            outcome = 'miss'
+        response_cache.record(label, outcome)
+
+        if outcome == 'miss':
+            self.response_cache_key = key
+            self.response_cache_started = time.perf_counter()
+            return
+        raise CachedResponse(Response(entry['data'], status=entry['status'], headers=entry['headers']))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, CachedResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        key = getattr(self, 'response_cache_key', None)
+        if key and response.status_code == 200:
+            # Заголовки обработчика (счетчики и т.п.), до служебных заголовков DRF
+            headers = {name: value for name, value in response.items() if name != 'Content-Type'}
+            delta = time.perf_counter() - self.response_cache_started
+            response_cache.store(key, self.validators[0], response, headers, delta)
+        if key and self.response_cache_locked:
+            response_cache.release_lock(key)
+        return super().finalize_response(request, response, *args, **kwargs)
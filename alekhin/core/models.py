@@ -0,0 +1,55 @@
+# alekhin/core/models.py
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+
+
+SEARCH_CONFIG = 'russian'
+
+
+class SearchDocumentQuerySet(models.QuerySet):
+    def update_search_vector(self):
+        """Пересчитывает поисковый документ для всех записей queryset"""
+        return self.update(search_vector=self.model.search_vector_expression())
+
+
+class SearchDocumentManager(models.Manager.from_queryset(SearchDocumentQuerySet)):
+    def get_queryset(self):
+        # Поисковый документ нужен только в WHERE, не тянем его в выборки
+        return super().get_queryset().defer('search_vector')
+
+
+class SearchDocumentModel(models.Model):
+    """
+    Абстрактная модель с предвычисленным поисковым документом.
+
+    Наследник задает SEARCH_VECTOR_FIELDS - пары (поле, вес A-D).
+    Документ пересчитывается после каждого save() одним UPDATE,
+    для существующих записей есть команда rebuild_search_vectors.
+    """
+
+    SEARCH_VECTOR_FIELDS = ()
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = SearchDocumentManager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def search_vector_expression(cls):
+        return reduce(add, (
+            SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+            for field, weight in cls.SEARCH_VECTOR_FIELDS
+        ))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        source_fields = {field for field, weight in self.SEARCH_VECTOR_FIELDS}
+        if update_fields is None or source_fields.intersection(update_fields):
+            type(self)._default_manager.filter(pk=self.pk).update_search_vector()
@@ -0,0 +1,147 @@
+# alekhin/core/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CustomPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с опциональным keyset-режимом.
+
+    По умолчанию - обычные ?page=N. Если в запросе есть ?cursor=
+    (в том числе пустой - первая страница), выборка идет по ключу
+    (created_at, id) без OFFSET, поэтому глубокие страницы не замедляются.
+    Под ключ есть составной индекс (created_at, id) у каждой модели.
+    """
+
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Неверный курсор'
+
+    # Количество записей, уже посчитанное вьюсетом (см. CountedListMixin).
+    # Если задано, пагинатор не делает собственный COUNT
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page, *args, **kwargs):
+        paginator = DjangoPaginator(object_list, per_page, *args, **kwargs)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_by_cursor(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.known_count,
+            'next': self.get_cursor_link(self.next_position, reverse=False),
+            'previous': self.get_cursor_link(self.previous_position, reverse=True),
+            'results': data,
+        })
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        created_at, pk, reverse = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+
+        queryset = self.detach_window_filter(queryset)
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+        else:
+            queryset = queryset.order_by(*self.cursor_ordering)
+
+        if created_at is not None:
+            # Первое условие - диапазон по индексу, второе отсекает
+            # уже выданные записи с тем же created_at
+            if reverse:
+                queryset = queryset.filter(created_at__gte=created_at).filter(
+                    Q(created_at__gt=created_at) | Q(id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(id__lt=pk)
+                )
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        first, last = (results[0], results[-1]) if results else (None, None)
+        if reverse:
+            self.next_position = last if created_at is not None else None
+            self.previous_position = first if has_more else None
+        else:
+            self.next_position = last if has_more else None
+            self.previous_position = first if created_at is not None else None
+        return results
+
+    def detach_window_filter(self, queryset):
+        """
+        Выносит queryset с фильтром по оконной функции (ступень SmartSearch)
+        в подзапрос pk__in. Иначе условие курсора попадает во внутренний
+        WHERE рядом с поиском, окно считается только по оставшимся строкам,
+        и на следующих страницах появляются совпадения худшей ступени
+        """
+        if not any(
+            getattr(annotation, 'contains_over_clause', False)
+            for annotation in queryset.query.annotations.values()
+        ):
+            return queryset
+
+        outer = queryset.model._default_manager.filter(pk__in=queryset.order_by().values('pk'))
+        outer = outer.prefetch_related(*queryset._prefetch_related_lookups)
+        # select_related и only()/defer() внешнего запроса - как у исходного
+        outer.query.select_related = queryset.query.select_related
+        outer.query.deferred_loading = queryset.query.deferred_loading
+        return outer
+
+    def encode_cursor(self, instance, reverse):
+        payload = json.dumps({
+            'c': instance.created_at.isoformat(),
+            'i': instance.pk,
+            'r': int(reverse),
+        })
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            return datetime.fromisoformat(payload['c']), int(payload['i']), bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_cursor_link(self, instance, reverse):
+        if instance is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(instance, reverse))
+
+
+class CursorOnlyPagination(CustomPagination):
+    """Без ?cursor= список отдается целиком, как раньше"""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_mode = False
+            return None
+        return super().paginate_queryset(queryset, request, view)
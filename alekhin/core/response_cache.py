@@ -0,0 +1,100 @@
+# alekhin/core/response_cache.py
+import hashlib
+import math
+import random
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = 'response_cache'
+OUTCOMES = ('hit', 'miss', 'stale')
+
+
+def get_cache_key(label, request):
+    """
+    Ключ ответа: модель, хост (ссылки пагинации абсолютные), путь
+    и отсортированные параметры запроса - ?a=1&b=2 и ?b=2&a=1 дают один ключ
+    """
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(f'{request.get_host()}{request.path}?{query}'.encode()).hexdigest()
+    return f'{CACHE_KEY_PREFIX}:{label}:{digest}'
+
+
+def get_lock_key(key):
+    return f'{key}:lock'
+
+
+def get_stats_key(label, outcome):
+    return f'{CACHE_KEY_PREFIX}:stats:{label}:{outcome}'
+
+
+def is_fresh(entry, etag):
+    """
+    Запись актуальна, если ее ETag совпадает с текущим и мягкий срок
+    не истек. Срок проверяется с вероятностным досрочным обновлением
+    (XFetch): чем дольше строился ответ и чем ближе срок, тем вероятнее,
+    что один из запросов пересчитает его заранее
+    """
+    if entry is None or entry['etag'] != etag:
+        return False
+    beta = settings.RESPONSE_CACHE_EARLY_REFRESH_BETA
+    return time.time() - entry['delta'] * beta * math.log(1 - random.random()) < entry['expires']
+
+
+def acquire_lock(key):
+    """Только один запрос пересчитывает устаревший ответ"""
+    return cache.add(get_lock_key(key), 1, timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT)
+
+
+def release_lock(key):
+    cache.delete(get_lock_key(key))
+
+
+def store(key, etag, response, headers, delta):
+    """
+    Сохраняет данные ответа (до рендеринга)
+
+    В Redis запись живет вдвое дольше мягкого срока: после него ее еще
+    можно отдать как устаревшую, пока другой запрос строит новую
+    """
+    timeout = settings.RESPONSE_CACHE_TIMEOUT
+    entry = {
+        'etag': etag,
+        'expires': time.time() + timeout,
+        'delta': delta,
+        'status': response.status_code,
+        'data': response.data,
+        'headers': headers,
+    }
+    cache.set(key, entry, timeout=timeout * 2)
+
+
+def record(label, outcome):
+    """Счетчики попаданий для мониторинга; хранятся без таймаута"""
+    key = get_stats_key(label, outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Ключ вытеснен между add и incr
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats(labels):
+    """Счетчики по моделям за один get_many: {label: {hit, miss, stale, hit_ratio}}"""
+    keys = {(label, outcome): get_stats_key(label, outcome) for label in labels for outcome in OUTCOMES}
+    values = cache.get_many(keys.values())
+
+    stats = {}
+    for label in labels:
+        counts = {outcome: values.get(keys[label, outcome], 0) for outcome in OUTCOMES}
+        total = sum(counts.values())
+        served = counts['hit'] + counts['stale']
+        stats[label] = {**counts, 'hit_ratio': round(served / total, 4) if total else None}
+    return stats
+
+
+def reset_stats(labels):
+    cache.delete_many([get_stats_key(label, outcome) for label in labels for outcome in OUTCOMES])
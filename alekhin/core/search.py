@@ -0,0 +1,124 @@
+# alekhin/core/search.py
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, TrigramSimilarity
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When, Window
+from django.db.models.functions import Greatest, Lower
+from rest_framework import filters
+
+from .lookups import ImmutableUnaccent
+from .models import SEARCH_CONFIG
+
+
+class SmartSearch:
+    """
+    Умный поиск одним запросом.
+
+    Раньше поиск выполнялся каскадом: сначала точное совпадение, и только
+    если ничего не нашлось - триграммное сходство. Каждая ступень стоила
+    отдельного exists() по всей таблице. Здесь обе ступени считаются в одном
+    запросе: каждой строке присваивается ранг совпадения, а оконная функция
+    оставляет только строки лучшего найденного ранга.
+
+    Точное совпадение - это полнотекстовый поиск по search_vector
+    (если задан vector_field) и/или подстрока в contains_fields.
+
+    Все предикаты строятся по выражению LOWER(F_UNACCENT(поле)), под которое
+    есть триграммные GIN-индексы, поэтому OR выполняется через BitmapOr
+    без последовательного сканирования таблицы. Поля связанных моделей
+    ('specialist__name') ищутся через fk = ANY(ARRAY(SELECT ...)), чтобы
+    условие тоже оставалось индексируемым.
+    """
+
+    RANK_EXACT = 2
+    RANK_TRIGRAM = 1
+
+    rank_field = 'search_rank'
+    tier_field = 'search_tier'
+    similarity_field = 'search_similarity'
+
+    def __init__(self, contains_fields=(), trigram_fields=None, vector_field=None):
+        self.contains_fields = tuple(contains_fields)
+        self.trigram_fields = tuple(trigram_fields or contains_fields)
+        self.vector_field = vector_field
+
+    def exact_q(self, model, query):
+        conditions = [
+            self.field_q(model, field, 'contains', query.lower())
+            for field in self.contains_fields
+        ]
+        if self.vector_field:
+            conditions.append(Q(**{
+                self.vector_field: SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+            }))
+        return reduce(or_, conditions)
+
+    def trigram_q(self, model, query):
+        return reduce(or_, (
+            self.field_q(model, field, 'trigram_similar', query)
+            for field in self.trigram_fields
+        ))
+
+    def field_q(self, model, field, lookup, query):
+        lookup = f'{ImmutableUnaccent.lookup_name}__lower__{lookup}'
+        relation, _, related_field = field.partition('__')
+        if not related_field:
+            return Q(**{f'{field}__{lookup}': query})
+
+        related_model = model._meta.get_field(relation).related_model
+        related_pks = related_model._default_manager.filter(**{
+            f'{related_field}__{lookup}': query,
+        }).order_by().values('pk')
+        return Q(**{f'{relation}__any': ArraySubquery(related_pks)})
+
+    def similarity(self, query):
+        scores = [
+            TrigramSimilarity(Lower(ImmutableUnaccent(F(field))), query)
+            for field in self.trigram_fields
+        ]
+        return scores[0] if len(scores) == 1 else Greatest(*scores)
+
+    def filter(self, queryset, query):
+        """Фильтрует и аннотирует queryset рангом совпадения"""
+        query = (query or '').strip()
+        if not query:
+            return queryset
+
+        lowered = query.lower()
+        exact = self.exact_q(queryset.model, query)
+        # Условие в WHERE - дизъюнкция индексируемых предикатов,
+        # ранг считается только для уже отобранных строк
+        return queryset.filter(exact | self.trigram_q(queryset.model, lowered)).annotate(**{
+            self.rank_field: Case(
+                When(exact, then=Value(self.RANK_EXACT)),
+                default=Value(self.RANK_TRIGRAM),
+                output_field=IntegerField(),
+            ),
+        }).annotate(**{
+            self.tier_field: Window(Max(self.rank_field)),
+            self.similarity_field: self.similarity(lowered),
+        }).filter(**{
+            self.rank_field: F(self.tier_field),
+        })
+
+
+class SearchRankOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter, который при активном поиске и без явного ?ordering=
+    сортирует по качеству совпадения, а затем по сортировке вьюсета.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if request.query_params.get(self.ordering_param):
+            return super().get_ordering(request, queryset, view)
+
+        default_ordering = list(self.get_default_ordering(view) or [])
+        if SmartSearch.rank_field in queryset.query.annotations:
+            return [
+                f'-{SmartSearch.rank_field}',
+                f'-{SmartSearch.similarity_field}',
+                *default_ordering,
+            ]
+        return default_ordering or None
@@ -0,0 +1,58 @@
+# alekhin/core/serializers.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def parse_field_list(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Разреженные наборы полей для GET: ?fields=id,name,price оставляет только
+    перечисленные поля, ?omit=description исключает поля. Неизвестные имена
+    игнорируются.
+
+    get_model_fields() сообщает вью, какие колонки нужны для выбранных полей
+    (см. core.mixins.SparseFieldsetViewMixin, который сужает выборку через only()).
+    """
+
+    fields_param = 'fields'
+    omit_param = 'omit'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return fields
+
+        requested = parse_field_list(request.query_params.get(self.fields_param))
+        omitted = parse_field_list(request.query_params.get(self.omit_param))
+        for name in list(fields):
+            if (requested and name not in requested) or name in omitted:
+                fields.pop(name)
+        return fields
+
+    def get_extra_model_fields(self):
+        """Колонки, которые представлению нужны помимо объявленных полей"""
+        return set()
+
+    def get_model_fields(self):
+        """
+        Колонки модели для выбранных полей или None, если поле нельзя
+        однозначно сопоставить колонке (source='*', метод, свойство)
+        """
+        model = self.Meta.model
+        names = {model._meta.pk.name}
+        for field in self.fields.values():
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                return None
+            name = field.source.split('.')[0]
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+            names.add(model_field.name)
+        return names | self.get_extra_model_fields()
@@ -0,0 +1,144 @@
+# alekhin/core/slugs.py
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, connections, models, router, transaction
+from django.utils.text import slugify
+from unidecode import unidecode
+
+# Место под суффикс "-N" в пределах max_length поля
+SUFFIX_RESERVE = 10
+
+# (модель, поле) -> имена уникальных ограничений и индексов по этому полю
+_unique_constraints = {}
+
+
+def build_base_slug(value, max_length=None, fallback='item'):
+    slug = slugify(unidecode(value or '')) or fallback
+    if max_length:
+        slug = slug[:max_length - SUFFIX_RESERVE].rstrip('-') or fallback
+    return slug
+
+
+def allocate_slugs(model, bases, field='slug', exclude_pk=None):
+    """
+    Подбирает свободные slug для списка основ одним запросом
+
+    Занятые варианты каждой основы (основа и основа-N) читаются одним
+    SELECT. Якорное регулярное выражение ^основа-[0-9]+$ Postgres выполняет
+    диапазонным сканированием по префиксу в индексе varchar_pattern_ops,
+    который Django создает для уникальных slug-полей. Основы из slugify
+    содержат только [a-z0-9_-], экранировать их не нужно.
+    Повторы основ внутри списка получают последовательные суффиксы.
+    Возвращает slug в порядке bases
+    """
+    unique_bases = list(dict.fromkeys(bases))
+    if not unique_bases:
+        return []
+
+    queryset = model._default_manager.filter(reduce(or_, (
+        models.Q(**{field: base}) | models.Q(**{f'{field}__regex': rf'^{base}-[0-9]+$'})
+        for base in unique_bases
+    )))
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    patterns = {base: re.compile(rf'{re.escape(base)}(?:-(\d+))?') for base in unique_bases}
+    taken = {base: set() for base in unique_bases}
+    for slug in queryset.values_list(field, flat=True).iterator():
+        for base, pattern in patterns.items():
+            match = pattern.fullmatch(slug)
+            if match:
+                taken[base].add(int(match.group(1) or 0))
+
+    result = []
+    for base in bases:
+        # Основа без суффикса - номер 0; иначе следующий за максимальным
+        number = 0 if 0 not in taken[base] else max(taken[base]) + 1
+        taken[base].add(number)
+        result.append(f'{base}-{number}' if number else base)
+    return result
+
+
+def get_unique_constraint_names(model, field='slug'):
+    """
+    Имена уникальных ограничений по одному полю, из схемы БД: Django называет
+    их по-разному (_key при создании таблицы, _uniq при AlterField)
+    """
+    key = (model._meta.label_lower, field)
+    if key not in _unique_constraints:
+        column = model._meta.get_field(field).column
+        connection = connections[router.db_for_write(model)]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        _unique_constraints[key] = {
+            name for name, info in constraints.items()
+            if info['unique'] and info['columns'] == [column]
+        }
+    return _unique_constraints[key]
+
+
+def is_slug_conflict(error, model, field='slug'):
+    """Нарушено именно уникальное ограничение slug (по diag.constraint_name psycopg)"""
+    constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+    return constraint is not None and constraint in get_unique_constraint_names(model, field)
+
+
+class UniqueSlugMixin:
+    """
+    Уникальный slug из поля SLUG_SOURCE_FIELD для save() и bulk_create
+
+    Свободный суффикс подбирается одним запросом (allocate_slugs).
+    Если параллельный запрос занял тот же slug, вставка откатывается
+    до точки сохранения и slug подбирается заново
+    """
+
+    SLUG_SOURCE_FIELD = 'name'
+    SLUG_FIELD = 'slug'
+    SLUG_RETRIES = 3
+
+    def get_slug_base(self):
+        field = self._meta.get_field(self.SLUG_FIELD)
+        return build_base_slug(
+            getattr(self, self.SLUG_SOURCE_FIELD), field.max_length, fallback=self._meta.model_name
+        )
+
+    def save(self, *args, **kwargs):
+        if getattr(self, self.SLUG_FIELD):
+            return super().save(*args, **kwargs)
+
+        for attempt in range(self.SLUG_RETRIES):
+            slug, = allocate_slugs(type(self), [self.get_slug_base()], self.SLUG_FIELD, exclude_pk=self.pk)
+            setattr(self, self.SLUG_FIELD, slug)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError as e:
+                setattr(self, self.SLUG_FIELD, '')
+                if attempt == self.SLUG_RETRIES - 1 or not is_slug_conflict(e, type(self), self.SLUG_FIELD):
+                    raise
+
+    @classmethod
+    def bulk_create_with_slugs(cls, objs, batch_size=None):
+        """
+        bulk_create с подбором slug для всех записей без него одним запросом.
+        При конфликте с параллельной вставкой пачка подбирается заново
+        """
+        pending = [obj for obj in objs if not getattr(obj, cls.SLUG_FIELD)]
+        for attempt in range(cls.SLUG_RETRIES):
+            slugs = allocate_slugs(cls, [obj.get_slug_base() for obj in pending], cls.SLUG_FIELD)
+            for obj, slug in zip(pending, slugs):
+                setattr(obj, cls.SLUG_FIELD, slug)
+            try:
+                with transaction.atomic():
+                    created = cls._default_manager.bulk_create(objs, batch_size=batch_size)
+                    break
+            except IntegrityError as e:
+                if attempt == cls.SLUG_RETRIES - 1 or not is_slug_conflict(e, cls, cls.SLUG_FIELD):
+                    raise
+
+        # bulk_create не вызывает save(): поисковый документ (SearchDocumentModel) пересчитываем сами
+        if hasattr(cls._default_manager, 'update_search_vector'):
+            cls._default_manager.filter(pk__in=[obj.pk for obj in created]).update_search_vector()
+        return created
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request as APIRequest
+from rest_framework.test import APIRequestFactory, APITestCase
+from core import response_cache
+from goods.models import Good
+
+# Кеш ответов, версии моделей и счетчики - в памяти процесса, а не в общем Redis
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'response-cache-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ResponseCacheAPITest(APITestCase):
+    LABEL = 'goods.good'
+
+    def setUp(self):
+        cache.clear()
+        self.good = Good.objects.create(name="Бандаж", service_direction=1, price=500)
+
+    def get_stats(self):
+        return response_cache.get_stats([self.LABEL])[self.LABEL]
+
+    def test_repeated_request_served_from_cache(self):
+        """Тест: повторный анонимный запрос отдается из кеша, остается только запрос валидатора"""
+        first = self.client.get(reverse('good-list'))
+
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('good-list'))
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Total-Count'], '1')
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.get_stats()['miss'], 1)
+        self.assertEqual(self.get_stats()['hit'], 1)
+
+    def test_query_string_is_normalized(self):
+        """Тест: порядок параметров не влияет на ключ кеша"""
+        self.client.get(reverse('good-list'), {'page_size': 10, 'page': 1})
+        self.client.get(f"{reverse('good-list')}?page=1&page_size=10")
+        self.assertEqual(self.get_stats()['hit'], 1)
+
+    def test_save_invalidates_cache(self):
+        """Тест: после сохранения товара ответ строится заново"""
+        self.client.get(reverse('good-list'))
+
+        self.good.price = 600
+        self.good.save()
+
+        response = self.client.get(reverse('good-list'))
+        self.assertEqual(response.data['results'][0]['price'], 600)
+        self.assertEqual(self.get_stats()['miss'], 2)
+
+    def test_authenticated_requests_bypass_cache(self):
+        """Тест: запросы с токеном не читают и не пишут кеш"""
+        user = get_user_model().objects.create_user(email='staff@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+        self.client.get(reverse('good-list'))
+        self.client.get(reverse('good-list'))
+        self.assertEqual(self.get_stats(), {'hit': 0, 'miss': 0, 'stale': 0, 'hit_ratio': None})
+
+    def test_stale_response_while_rebuilding(self):
+        """Тест: пока другой запрос пересчитывает ответ, отдается прежний без ETag"""
+        self.client.get(reverse('good-list'))
+        self.good.price = 600
+        self.good.save()
+
+        # Блокировку держит "другой" запрос
+        key = response_cache.get_cache_key(self.LABEL, APIRequest(APIRequestFactory().get(reverse('good-list'))))
+        self.assertTrue(response_cache.acquire_lock(key))
+        self.addCleanup(response_cache.release_lock, key)
+
+        response = self.client.get(reverse('good-list'))
+        self.assertEqual(response.data['results'][0]['price'], 500)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.get_stats()['stale'], 1)
@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test import TestCase
+from core.filters import json_contains_any
+from goods.models import Good
+from goods.views import GOOD_SEARCH
+from news.models import News
+from news.views import NEWS_SEARCH
+from requests.models import Request
+from requests.views import REQUEST_SEARCH
+from services.models import Service
+from specialists.models import Specialist
+from tests.models import Test
+from tests.views import TEST_SEARCH
+
+
+class SearchIndexUsageTest(TestCase):
+    """
+    Проверяет по EXPLAIN, что поисковые запросы вьюсетов используют
+    триграммные и полнотекстовые индексы, а не сканируют таблицу целиком.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        specialist = Specialist.objects.create(name="Иванова Анна", image="images/a.webp")
+        Good.objects.create(name="Компрессионные чулки", service_direction=1, price=3000)
+        Test.objects.create(name="Общий анализ крови", service_direction=1, price=500)
+        News.objects.create(title="Варикоз", text="Лечение вен")
+        Request.objects.create(name="Петр", phone="+79990000000", specialist=specialist)
+
+    def setUp(self):
+        # На маленьких таблицах планировщик и так выбрал бы Seq Scan.
+        # Если индекс применим, с enable_seqscan = off он обязан его выбрать
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndexes(self, queryset, indexes):
+        plan = queryset.explain()
+        self.assertNotIn(f'Seq Scan on {queryset.model._meta.db_table}', plan)
+        for index in indexes:
+            self.assertIn(index, plan)
+
+    def test_goods_search_uses_indexes(self):
+        queryset = GOOD_SEARCH.filter(Good.objects.all(), 'чулки')
+        self.assertUsesIndexes(queryset, ['goods_search_gin', 'goods_name_trgm', 'goods_contra_trgm'])
+
+    def test_tests_search_uses_indexes(self):
+        queryset = TEST_SEARCH.filter(Test.objects.all(), 'анализ')
+        self.assertUsesIndexes(queryset, ['tests_search_gin', 'tests_name_trgm', 'tests_depends_trgm'])
+
+    def test_news_search_uses_indexes(self):
+        queryset = NEWS_SEARCH.filter(News.objects.all(), 'варикоз')
+        self.assertUsesIndexes(queryset, ['news_search_gin', 'news_title_trgm', 'news_text_trgm'])
+
+    def test_services_job_titles_filter_uses_index(self):
+        queryset = Service.objects.filter(json_contains_any('job_titles', [1, 3]))
+        self.assertUsesIndexes(queryset, ['services_job_titles_gin'])
+
+    def test_specialists_directions_filter_uses_index(self):
+        queryset = Specialist.objects.filter(json_contains_any('directions', ['flebologiya', 2]))
+        self.assertUsesIndexes(queryset, ['specialists_directions_gin'])
+
+    def test_requests_search_uses_indexes(self):
+        queryset = REQUEST_SEARCH.filter(Request.objects.all(), 'иванова')
+        self.assertUsesIndexes(queryset, [
+            'requests_search_gin', 'requests_name_trgm', 'specialists_name_trgm'
+        ])
@@ -0,0 +1,49 @@
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from core.slugs import allocate_slugs, is_slug_conflict
+from goods.models import Good
+from images.models import ImageModel
+from tests.models import Test
+
+
+class SlugAllocationTest(TestCase):
+    def test_same_name_gets_next_suffix(self):
+        """Тест: одинаковые названия получают суффиксы вместо IntegrityError"""
+        slugs = [Test.objects.create(name="Общий анализ крови", service_direction=1, price=500).slug for _ in range(3)]
+        self.assertEqual(slugs, ['obshchii-analiz-krovi', 'obshchii-analiz-krovi-1', 'obshchii-analiz-krovi-2'])
+
+    def test_allocation_in_one_query(self):
+        """Тест: свободные slug для пачки подбираются одним запросом, похожие основы не мешают"""
+        Good.objects.create(name="Бандаж", service_direction=1, price=500)
+        Good.objects.create(name="Бандаж", service_direction=1, price=500)
+        Good.objects.create(name="Бандаж послеоперационный", service_direction=1, price=500)
+
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(Good, ['bandazh', 'bandazh', 'chulki'])
+        self.assertEqual(slugs, ['bandazh-2', 'bandazh-3', 'chulki'])
+
+    def test_bulk_create_with_slugs(self):
+        """Тест: bulk_create_with_slugs подбирает slug и поисковый документ для всей пачки"""
+        Test.objects.create(name="Ферритин", service_direction=1, price=700)
+        created = Test.bulk_create_with_slugs([
+            Test(name="Ферритин", service_direction=1, price=700),
+            Test(name="Ферритин", service_direction=1, price=700),
+            Test(name="Глюкоза", service_direction=1, price=300),
+        ])
+
+        self.assertEqual([test.slug for test in created], ['ferritin-1', 'ferritin-2', 'gliukoza'])
+        self.assertFalse(Test.objects.filter(search_vector__isnull=True).exists())
+
+    def test_conflict_detected_by_constraint_name(self):
+        """Тест: повтор вставки считается конфликтом slug только для ограничения slug"""
+        Good.objects.create(name="Бандаж", service_direction=1, price=500, slug='bandazh')
+        with self.assertRaises(IntegrityError) as slug_error, transaction.atomic():
+            Good.objects.create(name="Бандаж", service_direction=1, price=500, slug='bandazh')
+        self.assertTrue(is_slug_conflict(slug_error.exception, Good))
+
+        # Значение "slug" в тексте ошибки другого ограничения - не конфликт slug
+        ImageModel.objects.create(original_filename='a.png', image='images/a.webp', file_size=1, sha256='slug')
+        with self.assertRaises(IntegrityError) as other_error, transaction.atomic():
+            ImageModel.objects.create(original_filename='b.png', image='images/b.webp', file_size=1, sha256='slug')
+        self.assertIn('slug', str(other_error.exception))
+        self.assertFalse(is_slug_conflict(other_error.exception, Good))
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('stats/', views.response_cache_stats, name='response_cache_stats'),
+]
@@ -0,0 +1,53 @@
+# alekhin/core/versions.py
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+VERSION_KEY_PREFIX = 'model_version'
+
+
+def get_version_key(model):
+    return f'{VERSION_KEY_PREFIX}:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """
+    Версия данных модели - время последнего изменения (time.time()).
+    Хранится в кеше без таймаута; если ключа нет, версия начинается заново
+    """
+    key = get_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_model_versions(models):
+    """Версии нескольких моделей за один get_many, в том же порядке"""
+    keys = [get_version_key(model) for model in models]
+    values = cache.get_many(keys)
+    return [
+        values[key] if key in values else get_model_version(model)
+        for key, model in zip(keys, models)
+    ]
+
+
+def bump_model_version(sender, **kwargs):
+    """Обработчик post_save/post_delete: модель изменилась"""
+    cache.set(get_version_key(sender), time.time(), timeout=None)
+
+
+def get_versioned_models():
+    return [apps.get_model(label) for label in settings.VERSIONED_MODELS]
+
+
+def connect_version_signals():
+    """Версии ведутся для моделей из settings.VERSIONED_MODELS"""
+    for model in get_versioned_models():
+        dispatch_uid = f'{VERSION_KEY_PREFIX}_{model._meta.label_lower}'
+        post_save.connect(bump_model_version, sender=model, dispatch_uid=dispatch_uid)
+        post_delete.connect(bump_model_version, sender=model, dispatch_uid=dispatch_uid)
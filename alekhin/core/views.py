@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import response_cache
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def response_cache_stats(request):
+    """
+    Счетчики кеша ответов по моделям каталога
+
+    GET: hit/miss/stale и доля ответов из кеша
+    DELETE: обнуляет счетчики
+    """
+    labels = [label.lower() for label in settings.VERSIONED_MODELS]
+
+    if request.method == 'DELETE':
+        response_cache.reset_stats(labels)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response(response_cache.get_stats(labels), status=status.HTTP_200_OK)
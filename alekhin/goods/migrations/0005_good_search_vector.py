@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goods', '0004_alter_good_article'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='good',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='goods_search_gin'),
+        ),
+    ]
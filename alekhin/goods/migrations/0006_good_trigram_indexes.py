@@ -0,0 +1,88 @@
+import core.lookups
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_immutable_unaccent'),
+        ('goods', '0005_good_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('article')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_article_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('description')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_descr_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('sizes')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_sizes_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('product_care')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_care_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('important')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_important_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='good',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('contraindications')),
+                    name='gin_trgm_ops',
+                ),
+                name='goods_contra_trgm',
+            ),
+        ),
+    ]
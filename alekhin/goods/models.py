@@ -2,13 +2,25 @@
 # Исправленная модель Good с необязательным полем article
 
 from django.db import models
-from django.utils.text import slugify
 from django.core.validators import MinValueValidator
-from images.models import Image
+from django.contrib.postgres.indexes import GinIndex
+from core.indexes import trigram_index
+from core.models import SearchDocumentModel
+from core.slugs import UniqueSlugMixin
 import uuid
 
 
-class Good(models.Model):
+class Good(UniqueSlugMixin, SearchDocumentModel):
+    SEARCH_VECTOR_FIELDS = (
+        ('name', 'A'),
+        ('article', 'A'),
+        ('description', 'B'),
+        ('sizes', 'C'),
+        ('product_care', 'C'),
+        ('important', 'D'),
+        ('contraindications', 'D'),
+    )
+
     # Основная информация
     name = models.CharField(max_length=255, verbose_name="Название товара")
     image = models.CharField(max_length=255, blank=True, null=True, verbose_name="Изображение товара")
@@ -41,6 +53,15 @@ class Good(models.Model):
             models.Index(fields=['enabled']),
             models.Index(fields=['slug']),
             models.Index(fields=['article']),
+            models.Index(fields=['created_at', 'id'], name='goods_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='goods_search_gin'),
+            trigram_index('name', 'goods_name_trgm'),
+            trigram_index('article', 'goods_article_trgm'),
+            trigram_index('description', 'goods_descr_trgm'),
+            trigram_index('sizes', 'goods_sizes_trgm'),
+            trigram_index('product_care', 'goods_care_trgm'),
+            trigram_index('important', 'goods_important_trgm'),
+            trigram_index('contraindications', 'goods_contra_trgm'),
         ]
     
     def __str__(self):
@@ -49,25 +70,6 @@ class Good(models.Model):
         else:
             return self.name
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            from django.utils.text import slugify
-            from unidecode import unidecode
-            
-            # Создаем slug на основе названия
-            base_slug = slugify(unidecode(self.name))
-            slug = base_slug
-            counter = 1
-            
-            # Проверяем уникальность slug
-            while Good.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            self.slug = slug
-        
-        super().save(*args, **kwargs)
-    
     def clean(self):
         from django.core.exceptions import ValidationError
         
@@ -3,7 +3,8 @@
 
 from rest_framework import serializers
 from .models import Good
-from images.serializers import ImageSerializer
+from core.serializers import SparseFieldsetMixin
+from images.serializers import ImageMetadataMixin
 
 
 class GoodCreateSerializer(serializers.ModelSerializer):
@@ -39,7 +40,8 @@ class GoodCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class GoodSerializer(serializers.ModelSerializer):
+class GoodSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    image_fields = ('image',)
     image = serializers.CharField(allow_null=True, required=False)
     article = serializers.CharField(allow_blank=True, allow_null=True, required=False)
     
@@ -81,7 +83,8 @@ class GoodUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class GoodListSerializer(serializers.ModelSerializer):
+class GoodListSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    image_fields = ('image',)
     image = serializers.CharField(allow_null=True, required=False)
     article = serializers.CharField(allow_blank=True, allow_null=True, required=False)
     
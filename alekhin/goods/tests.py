@@ -1,3 +1,320 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from images.models import ImageModel
+from .models import Good
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'goods-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GoodAPITestCase(APITestCase):
+    """Кеш ответов и версии моделей - в памяти процесса, а не в общем Redis"""
+
+    def setUp(self):
+        cache.clear()
+
+
+class GoodSearchAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.bandage = Good.objects.create(
+            name="Bandage elastic", service_direction=1, price=500
+        )
+        self.bandaje = Good.objects.create(
+            name="Bandaje", service_direction=1, price=700
+        )
+        self.stockings = Good.objects.create(
+            name="Compression stockings", service_direction=1, price=3000
+        )
+        self.disabled = Good.objects.create(
+            name="Compression sleeve", service_direction=1, price=2000, enabled=False
+        )
+        self.url = reverse('good-list')
+
+    def search(self, query):
+        response = self.client.get(self.url, {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_substring_search_is_case_insensitive(self):
+        """Тест поиска по подстроке без учета регистра"""
+        self.assertEqual(self.search('STOCKINGS'), [self.stockings.id])
+
+    def test_substring_match_hides_fuzzy_matches(self):
+        """Тест: при точном совпадении триграммные результаты не возвращаются"""
+        self.assertEqual(self.search('bandage'), [self.bandage.id])
+
+    def test_trigram_fallback(self):
+        """Тест триграммного поиска при отсутствии точных совпадений"""
+        self.assertEqual(self.search('compresion'), [self.stockings.id])
+
+    def test_search_hides_disabled_goods_for_anonymous(self):
+        """Тест: неактивные товары не попадают в поиск без токена"""
+        self.assertNotIn(self.disabled.id, self.search('compression'))
+
+    def test_search_query_count(self):
+        """Бенчмарк: количество SQL-запросов на один поисковый запрос"""
+        # Валидатор условного GET, один aggregate на все счетчики и пагинатор,
+        # плюс выборка страницы
+        with self.assertNumQueries(3):
+            self.search('compresion')
+        with self.assertNumQueries(3):
+            self.search('bandage')
+
+
+class GoodSearchCursorAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.fuzzy = Good.objects.create(name="Bandaje", service_direction=1, price=700)
+        self.exact = [
+            Good.objects.create(name=f"Bandage elastic {index}", service_direction=1, price=500)
+            for index in range(3)
+        ]
+        self.url = reverse('good-list')
+
+    def test_cursor_pages_keep_search_tier(self):
+        """Тест: при обходе поиска курсором триграммные совпадения не попадают на следующие страницы"""
+        response = self.client.get(self.url, {'search': 'bandage', 'cursor': '', 'page_size': 2})
+        seen = [item['id'] for item in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [item['id'] for item in response.data['results']]
+
+        self.assertEqual(sorted(seen), sorted(good.id for good in self.exact))
+
+    def test_cursor_tier_is_computed_over_whole_result(self):
+        """Тест: ступень поиска считается по всей выдаче, а не по строкам после курсора"""
+        response = self.client.get(self.url, {'search': 'bandage', 'cursor': '', 'page_size': 2})
+        # Последнее точное совпадение пропало между запросами страниц
+        self.exact[0].delete()
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(self.fuzzy.id, [item['id'] for item in response.data['results']])
+
+
+class GoodImageExpandAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.image = ImageModel.objects.create(
+            image='images/bandage.webp', original_filename='bandage.jpg',
+            file_size=1, width=800, height=600, status=ImageModel.STATUS_READY
+        )
+        for index in range(5):
+            Good.objects.create(
+                name=f"Бандаж {index}", service_direction=1, price=500,
+                image='/media/images/bandage.webp'
+            )
+        Good.objects.create(name="Без фото", service_direction=1, price=100)
+
+    def test_list_embeds_image_data_in_one_query(self):
+        """Тест: ?expand=images добавляет данные изображений одним запросом на страницу"""
+        # Валидатор условного GET, aggregate счетчиков, выборка страницы
+        # и один запрос изображений
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('good-list'), {'expand': 'images'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_image = {item['image']: item['image_data'] for item in response.data['results']}
+        self.assertEqual(by_image['/media/images/bandage.webp']['width'], 800)
+        self.assertIsNone(by_image[None])
+
+    def test_list_without_expand(self):
+        """Тест: без ?expand=images ответ прежний"""
+        response = self.client.get(reverse('good-list'))
+        self.assertNotIn('image_data', response.data['results'][0])
+
+
+class GoodSparseFieldsetAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Good.objects.create(
+            name="Бандаж", service_direction=1, price=500,
+            description="Длинное описание" * 100, product_care="Уход" * 100
+        )
+
+    def test_fields_narrow_response_and_sql(self):
+        """Тест: ?fields= оставляет только нужные поля и не читает тяжелые колонки"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('good-list'), {'fields': 'id,name,price'})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'price'})
+        page_sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('"description"', page_sql)
+        self.assertNotIn('"product_care"', page_sql)
+
+    def test_omit_excludes_fields(self):
+        """Тест: ?omit= исключает перечисленные поля"""
+        response = self.client.get(reverse('good-list'), {'omit': 'description,product_care'})
+        item = response.data['results'][0]
+        self.assertNotIn('description', item)
+        self.assertIn('important', item)
+
+
+class GoodConditionalGetAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.good = Good.objects.create(name="Бандаж", service_direction=1, price=500)
+
+    def test_list_returns_validators(self):
+        """Тест: список отдает ETag и Last-Modified"""
+        response = self.client.get(reverse('good-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_not_modified_without_serialization(self):
+        """Тест: повтор с If-None-Match отдает 304 одним запросом к БД"""
+        etag = self.client.get(reverse('good-list'))['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('good-list'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_change_invalidates_etag(self):
+        """Тест: после изменения товара ответ снова 200 с новым ETag"""
+        url = reverse('good-detail', kwargs={'slug': self.good.slug})
+        etag = self.client.get(url)['ETag']
+
+        self.good.price = 600
+        self.good.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_params_change_etag(self):
+        """Тест: разные параметры запроса дают разные ETag"""
+        first = self.client.get(reverse('good-list'))['ETag']
+        second = self.client.get(reverse('good-list'), {'fields': 'id,name'})['ETag']
+        self.assertNotEqual(first, second)
+
+
+class GoodBulkAPITest(GoodAPITestCase):
+    def setUp(self):
+        super().setUp()
+        user = get_user_model().objects.create_user(email='staff@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+        self.url = reverse('good-bulk')
+        self.first = Good.objects.create(name="Бандаж", service_direction=1, price=500)
+        self.second = Good.objects.create(name="Бандаж", service_direction=1, price=700)
+
+    def test_bulk_create_allocates_slugs_in_batch(self):
+        """Тест: пакетное создание одной транзакцией с уникальными slug"""
+        items = [{'name': "Бандаж", 'service_direction': 1, 'price': 100 * i} for i in range(1, 4)]
+
+        response = self.client.post(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['slug'] for item in response.data], ['bandazh-2', 'bandazh-3', 'bandazh-4'])
+        self.assertEqual(Good.objects.filter(search_vector__isnull=True).count(), 0)
+
+    def test_bulk_update_prices_and_enabled(self):
+        """Тест: пакетное изменение цен и активности"""
+        items = [
+            {'slug': self.first.slug, 'price': 550},
+            {'slug': self.second.slug, 'enabled': False},
+        ]
+
+        # Выборка товаров и один UPDATE в точке сохранения; поисковый документ
+        # не пересчитывается: цена и активность в него не входят
+        with self.assertNumQueries(4):
+            response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.price, 550)
+        self.assertFalse(self.second.enabled)
+        self.assertGreater(self.first.updated_at, self.first.created_at)
+
+    def test_bulk_update_validates_all_items(self):
+        """Тест: при ошибке в одном элементе не меняется ни один товар"""
+        items = [
+            {'slug': self.first.slug, 'price': 550},
+            {'slug': self.second.slug, 'price': -1},
+            {'slug': 'missing', 'price': 10},
+        ]
+
+        response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('price', response.data[1])
+        self.assertIn('slug', response.data[2])
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.price, 500)
+
+    def test_bulk_delete(self):
+        """Тест: пакетное удаление по списку slug со статусом по каждой позиции"""
+        response = self.client.delete(self.url, [self.first.slug, 'missing', self.second.slug], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'slug': self.first.slug, 'id': self.first.id, 'status': 'deleted'},
+            {'slug': 'missing', 'id': None, 'status': 'not_found'},
+            {'slug': self.second.slug, 'id': self.second.id, 'status': 'deleted'},
+        ])
+        self.assertFalse(Good.objects.exists())
+
+    def test_bulk_delete_keeps_receivers_and_bumps_version(self):
+        """Тест: пакетное удаление вызывает post_delete по строкам и сбрасывает кеши"""
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=Good)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Good)
+
+        with mock.patch('goods.views.bump_model_version') as bump, \
+                mock.patch('goods.views.CachedItemCountService.invalidate_model') as invalidate:
+            self.client.delete(self.url, [self.first.slug, self.second.slug], format='json')
+
+        self.assertEqual(receiver.call_count, 2)
+        bump.assert_called_once_with(Good)
+        invalidate.assert_called_once_with(Good)
+
+    def test_bulk_delete_nothing_found(self):
+        """Тест: если ни один slug не найден - 404 и кеши не сбрасываются"""
+        with mock.patch('goods.views.bump_model_version') as bump:
+            response = self.client.delete(self.url, ['missing'], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data, [{'slug': 'missing', 'id': None, 'status': 'not_found'}])
+        bump.assert_not_called()
+        self.assertEqual(Good.objects.count(), 2)
+
+    def test_bulk_invalidates_cached_list(self):
+        """Тест: после пакетного изменения публичный список не отдается из кеша"""
+        self.client.force_authenticate(None)
+        etag = self.client.get(reverse('good-list'))['ETag']
+        self.client.force_authenticate(get_user_model().objects.get(email='staff@example.com'))
+
+        self.client.patch(self.url, [{'slug': self.first.slug, 'price': 550}], format='json')
+
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse('good-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {item['slug']: item['price'] for item in response.data['results']}[self.first.slug], 550
+        )
+
+    def test_bulk_requires_authentication(self):
+        """Тест: пакетные операции без токена запрещены"""
+        self.client.force_authenticate(None)
+        response = self.client.delete(self.url, [self.first.slug], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,26 +1,35 @@
-from django.db.models import Q
-from rest_framework import viewsets, filters, status
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters import rest_framework as django_filters
-from rest_framework.pagination import PageNumberPagination
 from .models import Good
 from .serializers import (
     GoodCreateSerializer, GoodSerializer, GoodUpdateSerializer, GoodListSerializer
 )
 from .filters import GoodFilter
+from core.mixins import CountedListMixin, ResponseCacheMixin, SparseFieldsetViewMixin
+from core.pagination import CustomPagination
+from core.search import SmartSearch, SearchRankOrderingFilter
+from core.versions import bump_model_version
+from items_count.utils import CachedItemCountService
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+GOOD_SEARCH = SmartSearch(
+    contains_fields=[
+        'name', 'article', 'description', 'sizes', 'product_care',
+        'important', 'contraindications'
+    ],
+    vector_field='search_vector',
+)
 
 
-class GoodViewSet(viewsets.ModelViewSet):
+class GoodViewSet(ResponseCacheMixin, CountedListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     filter_backends = [django_filters.DjangoFilterBackend,
                         # filters.SearchFilter,
-                        filters.OrderingFilter]
+                        SearchRankOrderingFilter]
     # search_fields = [
     #     'name', 'article', 'description', 'sizes', 'product_care', 
     #     'important', 'contraindications'
@@ -31,6 +40,8 @@ class GoodViewSet(viewsets.ModelViewSet):
     lookup_field = 'slug'
     http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     pagination_class = CustomPagination
+    # Предел элементов в одном запросе к bulk/
+    bulk_max_items = 500
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -52,90 +63,17 @@ class GoodViewSet(viewsets.ModelViewSet):
         # Для неаутентифицированных пользователей показываем только активные товары
         if not self.request.user.is_authenticated:
             queryset = queryset.filter(enabled=True)
-            # Smart search
+
+        # Smart search
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(article__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(sizes__icontains=search_query) |
-                Q(product_care__icontains=search_query) |
-                Q(important__icontains=search_query) |
-                Q(contraindications__icontains=search_query)
-            )
-        if not queryset.exists():
-            search_query = str(search_query).capitalize()
-            queryset = Good.objects.filter(
-                Q(name__icontains=search_query) |
-                Q(article__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(sizes__icontains=search_query) |
-                Q(product_care__icontains=search_query) |
-                Q(important__icontains=search_query) |
-                Q(contraindications__icontains=search_query)
-                )
-        if not queryset.exists():
-            search_query = str(search_query).upper()
-            queryset = Good.objects.filter(
-                Q(name__icontains=search_query) |
-                Q(article__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(sizes__icontains=search_query) |
-                Q(product_care__icontains=search_query) |
-                Q(important__icontains=search_query) |
-                Q(contraindications__icontains=search_query)
-            )
-        if not queryset.exists():
-            search_query = str(search_query).lower()
-            queryset = Good.objects.filter(
-                Q(name__unaccent__lower__trigram_similar=search_query) |
-                Q(article__unaccent__lower__trigram_similar=search_query) |
-                Q(description__unaccent__lower__trigram_similar=search_query) |
-                Q(sizes__icontains=search_query) |
-                Q(product_care__unaccent__lower__trigram_similar=search_query) |
-                Q(important__unaccent__lower__trigram_similar=search_query) |
-                Q(contraindications__unaccent__lower__trigram_similar=search_query)
-                )
-        if not queryset.exists():
-            search_query = str(search_query).title()
-            queryset = Good.objects.filter(
-                Q(name__unaccent__lower__trigram_similar=search_query) |
-                Q(article__unaccent__lower__trigram_similar=search_query) |
-                Q(description__unaccent__lower__trigram_similar=search_query) |
-                Q(sizes__unaccent__lower__trigram_similar=search_query) |
-                Q(product_care__unaccent__lower__trigram_similar=search_query) |
-                Q(important__unaccent__lower__trigram_similar=search_query) |
-                Q(contraindications__unaccent__lower__trigram_similar=search_query)
-            )
-        
+            queryset = GOOD_SEARCH.filter(queryset, search_query)
+
         return queryset
+
     def list(self, request, *args, **kwargs):
         """GET /goods - получение списка товаров"""
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Получаем общее количество товаров
-        total_count = queryset.count()
-        enabled_count = queryset.filter(enabled=True).count()
-        
-        # Применяем пагинацию если она настроена
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
-        
-        # Добавляем счетчики в заголовки
-        response['Total-Count'] = str(total_count)
-        response['Enabled-Count'] = str(enabled_count)
-        response['Access-Control-Expose-Headers'] = 'Total-Count, Enabled-Count'
-        service_direction = self.request.query_params.get('service_direction', None)
-        # Получаем общее количество анализов
-        if service_direction:
-            queryset = queryset.filter(service_direction=str(service_direction))
-        return response
+        return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         """POST /goods - создание товара (требует токен)"""
@@ -158,4 +96,100 @@ class GoodViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         """DELETE /goods/{slug} - удаление товара (требует токен)"""
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
+        return super().destroy(request, *args, **kwargs)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST/PATCH/DELETE /goods/bulk - пакетные операции (требует токен).
+
+        POST - список товаров как для создания, PATCH - список изменений
+        с полем slug, DELETE - список slug. Для POST и PATCH все элементы
+        проверяются заранее: при любой ошибке ничего не меняется, в ответе
+        400 - ошибки по позициям списка ({} для корректных). DELETE удаляет
+        найденные товары и возвращает статус по каждой позиции (deleted или
+        not_found), 404 - если не найден ни один. Изменения пишутся одной
+        транзакцией, кеши сбрасываются один раз
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'non_field_errors': ['Ожидается непустой список']}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'non_field_errors': [f'Не более {self.bulk_max_items} элементов за запрос']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        handler = {'post': self.bulk_create, 'patch': self.bulk_update, 'delete': self.bulk_destroy}
+        response = handler[request.method.lower()](items)
+        if status.is_success(response.status_code):
+            # bulk_create/bulk_update не вызывают post_save
+            bump_model_version(Good)
+            CachedItemCountService.invalidate_model(Good)
+        return response
+
+    def bulk_create(self, items):
+        serializer = GoodCreateSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        goods = [Good(**data) for data in serializer.validated_data]
+        with transaction.atomic():
+            # Slug для всей пачки подбирается одним запросом
+            created = Good.bulk_create_with_slugs(goods)
+        return Response(GoodSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        slugs = [item.get('slug') if isinstance(item, dict) else None for item in items]
+        goods = Good.objects.in_bulk([slug for slug in slugs if slug], field_name='slug')
+
+        errors, changes = [], []
+        for slug, item in zip(slugs, items):
+            if not slug:
+                errors.append({'slug': ['Обязательное поле']})
+                continue
+            if slug not in goods:
+                errors.append({'slug': ['Товар не найден']})
+                continue
+            serializer = GoodUpdateSerializer(goods[slug], data=item, partial=True)
+            if serializer.is_valid():
+                changes.append((goods[slug], serializer.validated_data))
+                errors.append({})
+            else:
+                errors.append(serializer.errors)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # bulk_update не заполняет auto_now, updated_at ставим сами
+        now = timezone.now()
+        fields = {'updated_at'}
+        for good, data in changes:
+            for field, value in data.items():
+                setattr(good, field, value)
+            good.updated_at = now
+            fields.update(data)
+
+        updated = [good for good, _ in changes]
+        with transaction.atomic():
+            Good.objects.bulk_update(updated, sorted(fields))
+            if fields.intersection(field for field, weight in Good.SEARCH_VECTOR_FIELDS):
+                Good.objects.filter(pk__in=[good.pk for good in updated]).update_search_vector()
+        return Response(GoodSerializer(updated, many=True).data)
+
+    def bulk_destroy(self, slugs):
+        if not all(isinstance(slug, str) and slug for slug in slugs):
+            return Response({'non_field_errors': ['Ожидается список slug']}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            goods = Good.objects.select_for_update().filter(slug__in=slugs)
+            found = dict(goods.values_list('slug', 'id'))
+            if found:
+                Good.objects.filter(pk__in=found.values()).delete()
+
+        results = [
+            {'slug': slug, 'id': found[slug], 'status': 'deleted'} if slug in found
+            else {'slug': slug, 'id': None, 'status': 'not_found'}
+            for slug in slugs
+        ]
+        # Ничего не удалено - кеши не сбрасываются
+        return Response(results, status=status.HTTP_200_OK if found else status.HTTP_404_NOT_FOUND)
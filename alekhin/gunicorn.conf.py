@@ -0,0 +1,62 @@
+# alekhin/gunicorn.conf.py
+# Конфигурация gunicorn для production: gunicorn -c gunicorn.conf.py alekhin.wsgi:application
+# Все параметры переопределяются переменными окружения GUNICORN_*
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_bool(name, default=False):
+    return os.environ.get(name, str(default)).lower() in ('true', '1', 'yes', 'on')
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Воркеры по числу ядер: запрос в основном ждет PostgreSQL и Redis,
+# поэтому берем 2 * CPU + 1 процесса и по несколько потоков в каждом
+# У каждого воркера свой пул соединений с БД на threads + IMAGE_PROCESSING_WORKERS
+# соединений: workers * пул должно укладываться в max_connections (см. docker-compose.yaml)
+workers = env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+worker_class = 'gthread'
+threads = env_int('GUNICORN_THREADS', 4)
+
+# Приложение импортируется один раз в мастере и разделяется воркерами
+# через copy-on-write: быстрее старт и меньше памяти. Пул обработки
+# изображений (images/tasks.py) создается лениво, уже в воркере после fork.
+# С preload SIGHUP перечитывает конфигурацию, но не код: новый код -
+# перезапуском контейнера (воркеры дорабатывают запросы graceful_timeout)
+# или USR2 + WINCH/QUIT. В разработке GUNICORN_RELOAD=true включает
+# перезагрузку при изменении файлов и отключает preload
+reload = env_bool('GUNICORN_RELOAD')
+preload_app = not reload
+
+# Перезапуск воркеров после N запросов (со случайным разбросом, чтобы
+# не все сразу) ограничивает рост памяти от фрагментации и утечек
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# Таймауты: зависший воркер убивается через timeout, при остановке
+# и перезапуске текущие запросы дорабатываются graceful_timeout секунд
+timeout = env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Keep-alive соединений от прокси/балансировщика (gthread его поддерживает)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Файл heartbeat воркеров - в памяти: на overlayfs контейнера запись
+# в /tmp может подвисать, и мастер примет воркер за зависший
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR', '/dev/shm')
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Соединения, открытые мастером при preload, не должны делиться между процессами
+    from django.db import connections
+
+    connections.close_all()
@@ -1,13 +1,17 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import ImageModel
+from .tasks import enqueue_processing
 
 
 @admin.register(ImageModel)
 class ImageModelAdmin(admin.ModelAdmin):
-    list_display = ['id', 'original_filename', 'width', 'height', 'file_size', 'created_at']
-    list_filter = ['created_at']
+    list_display = ['id', 'original_filename', 'status', 'width', 'height', 'file_size', 'created_at']
+    list_filter = ['status', 'created_at']
     search_fields = ['original_filename', 'id']
-    readonly_fields = ['id', 'file_size', 'width', 'height', 'created_at', 'updated_at']
+    readonly_fields = [
+        'id', 'file_size', 'width', 'height', 'status', 'processing_error',
+        'processed_at', 'created_at', 'updated_at'
+    ]
     
     fieldsets = (
         ('Основная информация', {
@@ -16,7 +20,29 @@ class ImageModelAdmin(admin.ModelAdmin):
         ('Изображения', {
             'fields': ('image', 'cropped_image')
         }),
+        ('Обработка', {
+            'fields': ('status', 'processing_error', 'processed_at')
+        }),
         ('Метаданные', {
             'fields': ('file_size', 'width', 'height', 'created_at', 'updated_at')
         }),
-    )
\ No newline at end of file
+    )
+
+    def save_model(self, request, obj, form, change):
+        if 'image' in form.changed_data:
+            obj.file_size = obj.image.size
+            obj.status = ImageModel.STATUS_PENDING
+            # Новый файл обрабатывается целиком, а не только обрезка (см. ImageModel.process)
+            obj.processed_at = None
+            if obj.cropped_image:
+                obj.cropped_image.delete(save=False)
+            obj.sha256 = ImageModel.compute_sha256(obj.image.file)
+            if ImageModel.objects.filter(sha256=obj.sha256).exclude(pk=obj.pk).exists():
+                # Такой файл уже есть у другой записи: эта в дедупликации не участвует
+                obj.sha256 = None
+                self.message_user(
+                    request, 'Такое изображение уже загружено в другую запись', level=messages.WARNING
+                )
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data:
+            enqueue_processing(obj)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from images.processing import process_upload
+
+CORPUS_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def measure_file(path, crop):
+    """
+    Обрабатывает один файл в отдельном процессе и возвращает
+    (время в секундах, прирост пикового RSS в КБ).
+    tracemalloc не видит память Pillow, поэтому пик берется из getrusage
+    """
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as media_root:
+        storage = FileSystemStorage(location=media_root)
+        started = time.perf_counter()
+        with open(path, 'rb') as file:
+            process_upload(file, os.path.basename(path), storage, crop=crop)
+        elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, rss_after - rss_before
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время и пиковую память обработки изображения (processing.process_upload) '
+        'на наборе больших JPEG/PNG. Каждый файл обрабатывается в новом процессе'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'corpus', nargs='?',
+            help='Каталог с JPEG/PNG (по умолчанию - сгенерированный набор)'
+        )
+        parser.add_argument('--crop', action='store_true', help='Создавать обрезанную версию')
+        parser.add_argument(
+            '--generate', type=int, default=6,
+            help='Сколько файлов сгенерировать, если каталог не указан'
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as generated:
+            corpus = options['corpus'] or self.generate_corpus(generated, options['generate'])
+            paths = self.get_paths(corpus)
+
+            # maxtasksperchild=1: у каждого файла свой процесс и свой пик RSS
+            with multiprocessing.get_context('fork').Pool(1, maxtasksperchild=1) as pool:
+                results = [pool.apply(measure_file, (path, options['crop'])) for path in paths]
+
+        for path, (elapsed, peak_kb) in zip(paths, results):
+            with Image.open(path) as img:
+                size = f'{img.width}x{img.height} {img.format}'
+            self.stdout.write(
+                f'{os.path.basename(path)} ({size}): {elapsed * 1000:.0f} мс, '
+                f'пик памяти +{peak_kb / 1024:.1f} МБ'
+            )
+
+        times = [elapsed for elapsed, _ in results]
+        peaks = [peak_kb for _, peak_kb in results]
+        self.stdout.write(self.style.SUCCESS(
+            f'Файлов: {len(results)}, время: медиана {statistics.median(times) * 1000:.0f} мс, '
+            f'максимум {max(times) * 1000:.0f} мс; пик памяти: максимум +{max(peaks) / 1024:.1f} МБ'
+        ))
+
+    def get_paths(self, corpus):
+        if not os.path.isdir(corpus):
+            raise CommandError(f'Каталог {corpus} не найден')
+        paths = sorted(
+            os.path.join(corpus, name) for name in os.listdir(corpus)
+            if name.lower().endswith(CORPUS_EXTENSIONS)
+        )
+        if not paths:
+            raise CommandError(f'В каталоге {corpus} нет JPEG/PNG файлов')
+        return paths
+
+    def generate_corpus(self, directory, count):
+        sizes = [(4000, 3000), (6000, 4000), (3024, 4032)]
+        for index in range(count):
+            width, height = sizes[index % len(sizes)]
+            # Градиент с шумом: сжимается примерно как фотография
+            image = Image.merge('RGB', [
+                Image.linear_gradient('L').resize((width, height)),
+                Image.effect_noise((width, height), 48),
+                Image.radial_gradient('L').resize((width, height)),
+            ])
+            if index % 2:
+                image.save(os.path.join(directory, f'corpus_{index}.png'), optimize=False)
+            else:
+                image.save(os.path.join(directory, f'corpus_{index}.jpg'), quality=92)
+        return directory
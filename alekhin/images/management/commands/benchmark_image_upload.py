@@ -0,0 +1,80 @@
+import statistics
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку загрузки изображения (p50/p99) при синхронной '
+        'обработке в запросе и при фоновой. Записи и файлы не сохраняются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Количество загрузок в каждом режиме')
+        parser.add_argument('--width', type=int, default=4000)
+        parser.add_argument('--height', type=int, default=3000)
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('--requests должен быть не меньше 2')
+
+        payload = self.make_jpeg(options['width'], options['height'])
+        self.stdout.write(
+            f"Изображение {options['width']}x{options['height']}, {len(payload) // 1024} КБ, "
+            f"загрузок в режиме: {options['requests']}"
+        )
+
+        for label, sync in (('синхронно', True), ('в фоне', False)):
+            latencies = self.measure(payload, options['requests'], sync)
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f'{label:>10}: p50 = {percentiles[49] * 1000:.1f} мс, '
+                f'p99 = {percentiles[98] * 1000:.1f} мс'
+            )
+
+    def make_jpeg(self, width, height):
+        # Шум плохо сжимается - размер файла близок к реальной фотографии
+        image = Image.effect_noise((width, height), 64).convert('RGB')
+        output = BytesIO()
+        image.save(output, format='JPEG', quality=90)
+        return output.getvalue()
+
+    def measure(self, payload, requests, sync):
+        client = APIClient()
+        url = reverse('image-list')
+        latencies = []
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root,
+            IMAGE_PROCESSING_SYNC=sync,
+            ALLOWED_HOSTS=['testserver'],
+        ):
+            # Транзакция откатывается: в фоновом режиме on_commit не срабатывает,
+            # и измеряется ровно то время, которое клиент ждет ответа
+            try:
+                with transaction.atomic():
+                    for _ in range(requests):
+                        upload = SimpleUploadedFile('photo.jpg', payload, content_type='image/jpeg')
+                        started = time.perf_counter()
+                        response = client.post(url, {'image': upload}, format='multipart')
+                        latencies.append(time.perf_counter() - started)
+                        if response.status_code >= 400:
+                            raise CommandError(f'Загрузка завершилась с кодом {response.status_code}')
+                    raise Rollback
+            except Rollback:
+                pass
+
+        return latencies
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from images.models import ImageUpload
+
+
+class Command(BaseCommand):
+    help = 'Удаляет незавершенные загрузки по частям, которые давно не продолжались'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=24,
+            help='Сколько часов без новых частей загрузка считается брошенной'
+        )
+
+    def handle(self, *args, **options):
+        threshold = timezone.now() - timedelta(hours=options['hours'])
+        uploads = list(ImageUpload.objects.filter(updated_at__lt=threshold))
+        for upload in uploads:
+            upload.delete_file()
+            upload.delete()
+
+        self.stdout.write(self.style.SUCCESS(f'Удалено загрузок: {len(uploads)}'))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.models import ImageModel
+
+
+class Command(BaseCommand):
+    help = (
+        'Создает варианты для srcset у уже загруженных изображений. '
+        'Изображения, у которых есть все варианты из настроек, пропускаются, '
+        'поэтому прерванный запуск можно просто повторить'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Количество изображений, читаемых из базы за раз'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать варианты даже там, где они уже есть'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size должен быть положительным числом')
+
+        queryset = ImageModel.objects.filter(status=ImageModel.STATUS_READY).order_by('id')
+        generated = skipped = failed = 0
+        last_id = None
+
+        while True:
+            batch = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            images = list(batch[:batch_size])
+            if not images:
+                break
+
+            for image in images:
+                if not options['force'] and image.has_all_variants():
+                    skipped += 1
+                    continue
+                try:
+                    image.generate_variants()
+                except (OSError, ValueError) as e:
+                    failed += 1
+                    self.stderr.write(f'{image.id}: {e}')
+                    continue
+                # Сохраняем сразу: при повторном запуске изображение будет пропущено
+                image.save(update_fields=['variants', 'updated_at'])
+                generated += 1
+
+            last_id = images[-1].id
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {generated}, пропущено: {skipped}, с ошибкой: {failed}'
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from images.models import ImageModel
+from images.tasks import process_image
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает изображения, оставшиеся в очереди (например, после перезапуска сервера)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Повторить обработку изображений со статусом failed'
+        )
+        parser.add_argument(
+            '--reset-processing', action='store_true',
+            help='Вернуть в очередь изображения, зависшие в статусе processing'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset_processing']:
+            ImageModel.objects.filter(status=ImageModel.STATUS_PROCESSING).update(
+                status=ImageModel.STATUS_PENDING
+            )
+
+        statuses = [ImageModel.STATUS_PENDING]
+        if options['retry_failed']:
+            statuses.append(ImageModel.STATUS_FAILED)
+
+        ids = list(ImageModel.objects.filter(status__in=statuses).values_list('id', flat=True))
+        for image_id in ids:
+            process_image(image_id)
+
+        failed = ImageModel.objects.filter(id__in=ids, status=ImageModel.STATUS_FAILED).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {len(ids) - failed}, с ошибкой: {failed}'
+        ))
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='status',
+            # Существующие записи обработаны синхронно при загрузке
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'Обрабатывается'), ('ready', 'Готово'), ('failed', 'Ошибка обработки')], default='ready', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='imagemodel',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'Обрабатывается'), ('ready', 'Готово'), ('failed', 'Ошибка обработки')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='needs_crop',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='processing_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='imagemodel',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='imagemodel',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
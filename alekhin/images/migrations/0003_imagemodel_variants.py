@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_imagemodel_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
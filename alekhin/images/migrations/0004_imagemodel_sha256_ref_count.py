@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0003_imagemodel_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='ref_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
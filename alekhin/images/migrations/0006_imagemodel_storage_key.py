@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_storage_key(apps, schema_editor):
+    # В колонке image уже хранится путь относительно MEDIA_ROOT (images/...)
+    ImageModel = apps.get_model('images', 'ImageModel')
+    ImageModel.objects.exclude(image='').update(storage_key=F('image'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0005_imageupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='storage_key',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(fill_storage_key, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='imagemodel',
+            name='storage_key',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -1,19 +1,76 @@
-import uuid
+import hashlib
 import os
-from django.db import models
+import uuid
+from urllib.parse import unquote, urlsplit
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 from PIL import Image
-from io import BytesIO
-from django.core.files.base import ContentFile
+from .processing import (
+    CROP_WIDTH, ImageWriter, decode_image, generate_variants, get_target_widths,
+    get_variant_formats, process_upload, write_cropped_image
+)
+
+
+def normalize_storage_key(path):
+    """
+    Приводит путь к изображению к ключу хранилища: полный URL, /media/images/x.webp,
+    media/images/x.webp и images/x.webp дают одно и то же images/x.webp
+    """
+    if not path:
+        return ''
+    path = unquote(urlsplit(str(path).strip()).path)
+    media_prefix = settings.MEDIA_URL.strip('/') + '/'
+    if media_prefix in path:
+        path = path.split(media_prefix)[-1]
+    return path.lstrip('/')
+
+
+class ImageQuerySet(models.QuerySet):
+    def resolve(self, paths):
+        """
+        Находит записи для списка путей одним запросом по индексу storage_key.
+        Возвращает {исходный путь: запись}; ненайденных путей в словаре нет
+        """
+        keys = {path: normalize_storage_key(path) for path in paths if path}
+        found = {image.storage_key: image for image in self.filter(storage_key__in=set(keys.values()))}
+        return {path: found[key] for path, key in keys.items() if key in found}
 
 
 class ImageModel(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Ожидает обработки'),
+        (STATUS_PROCESSING, 'Обрабатывается'),
+        (STATUS_READY, 'Готово'),
+        (STATUS_FAILED, 'Ошибка обработки'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     original_filename = models.CharField(max_length=255)
     image = models.ImageField(upload_to='images/')
     cropped_image = models.ImageField(upload_to='images/', null=True, blank=True)
     file_size = models.PositiveIntegerField()
-    width = models.PositiveIntegerField()
-    height = models.PositiveIntegerField()
+    # Размеры известны только после обработки
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    needs_crop = models.BooleanField(default=False)
+    processing_error = models.TextField(blank=True, default='')
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Варианты для srcset: {формат: {ширина: путь}}, см. processing.py
+    variants = models.JSONField(default=dict, blank=True)
+    # SHA-256 исходных байтов загрузки: повторная загрузка того же файла
+    # возвращает существующую запись. У записей до дедупликации пусто
+    sha256 = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    # Сколько загрузок ссылаются на запись; файлы удаляются с последней ссылкой
+    ref_count = models.PositiveIntegerField(default=1)
+    # Нормализованный путь основного файла (см. normalize_storage_key) для поиска по пути
+    storage_key = models.CharField(max_length=255, unique=True, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -22,64 +79,252 @@ class ImageModel(models.Model):
         verbose_name = 'Image'
         verbose_name_plural = 'Images'
 
+    objects = ImageQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.original_filename} ({self.id})"
 
     def save(self, *args, **kwargs):
-        if self.image:
-            # Конвертируем в WebP и сжимаем
-            self.image = self.convert_to_webp(self.image)
-            
-            # Получаем размеры изображения
-            with Image.open(self.image) as img:
-                self.width, self.height = img.size
-                
+        # Новый файл записываем в хранилище заранее, как это сделал бы pre_save:
+        # ключ нужно строить по итоговому пути, а не по имени загруженного файла
+        if self.image and not self.image._committed:
+            self.image.save(self.image.name, self.image.file, save=False)
+        # Ключ следует за путем файла, который меняется после конвертации в WebP
+        self.storage_key = normalize_storage_key(self.image.name) or None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'storage_key'}
         super().save(*args, **kwargs)
 
-    def convert_to_webp(self, image_field, quality=85):
-        """Конвертирует изображение в формат WebP"""
-        with Image.open(image_field) as img:
-            # Конвертируем в RGB если необходимо
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
-            
-            # Создаем BytesIO объект для сохранения
-            output = BytesIO()
-            
-            # Сохраняем в формате WebP с сжатием
-            img.save(output, format='WebP', quality=quality, optimize=True)
-            output.seek(0)
-            
-            # Создаем новое имя файла с расширением .webp
-            name = os.path.splitext(image_field.name)[0] + '.webp'
-            
-            return ContentFile(output.read(), name=name)
-
-    def create_cropped_version(self):
-        """Создает обрезанную версию изображения для мобильных устройств"""
-        if not self.image:
-            return
-            
-        with Image.open(self.image.path) as img:
-            # Если ширина больше 600px, обрезаем
-            if img.width > 600:
-                # Вычисляем новую высоту с сохранением пропорций
-                ratio = 600 / img.width
-                new_height = int(img.height * ratio)
-                
-                # Изменяем размер
-                resized_img = img.resize((600, new_height), Image.Resampling.LANCZOS)
-                
-                # Сохраняем в BytesIO
-                output = BytesIO()
-                resized_img.save(output, format='WebP', quality=85, optimize=True)
-                output.seek(0)
-                
-                # Создаем имя файла с префиксом _cropped
-                name = os.path.splitext(self.image.name)[0] + '_cropped.webp'
-                
-                self.cropped_image.save(
-                    name,
-                    ContentFile(output.read()),
-                    save=False
-                )
\ No newline at end of file
+    def process(self):
+        """
+        Конвертирует загруженный оригинал в WebP, считывает размеры,
+        создает варианты и, если запрошено, обрезанную версию - за одно
+        декодирование (см. processing.py). Выполняется в фоне (см. tasks.py).
+        Уже обработанной записи достраивается только обрезанная версия
+        (повторная загрузка того же файла с обрезкой)
+        """
+        if self.processed_at:
+            return self.process_crop()
+
+        original = self.image.name
+        old_variant_paths = self.get_variant_paths()
+
+        with self.image.open('rb'):
+            result = process_upload(self.image, original, self.image.storage, crop=self.needs_crop)
+
+        self.width, self.height = result['width'], result['height']
+        self.image.name = result['image']
+        if result['cropped_image']:
+            self.cropped_image.name = result['cropped_image']
+        self.variants = result['variants']
+
+        if original != self.image.name:
+            self.image.storage.delete(original)
+        for path in old_variant_paths - self.get_variant_paths():
+            self.image.storage.delete(path)
+
+        self.mark_ready(['width', 'height', 'image', 'cropped_image', 'variants'])
+
+    def process_crop(self):
+        """Обрезанная версия из уже сконвертированного WebP, без перекодирования основного файла"""
+        with self.image.open('rb'), decode_image(self.image) as img:
+            cropped = write_cropped_image(img, self.image.name, ImageWriter(self.image.storage))
+        if cropped:
+            self.cropped_image.name = cropped
+        self.mark_ready(['cropped_image'])
+
+    def mark_ready(self, fields):
+        # Только измененные поля: needs_crop могла выставить параллельная повторная загрузка
+        self.status = self.STATUS_READY
+        self.processing_error = ''
+        self.processed_at = timezone.now()
+        self.save(update_fields=[*fields, 'status', 'processing_error', 'processed_at', 'updated_at'])
+
+    def needs_processing(self):
+        """Обработка не удалась или запрошена обрезка, которой у готовой записи нет"""
+        if self.status == self.STATUS_FAILED:
+            return True
+        return (
+            self.status == self.STATUS_READY and self.needs_crop and not self.cropped_image
+            and self.width > CROP_WIDTH
+        )
+
+    def generate_variants(self):
+        """Создает варианты для srcset, заменяя ранее созданные"""
+        old_paths = self.get_variant_paths()
+        with self.image.open('rb'), decode_image(self.image) as img:
+            self.variants = generate_variants(img, self.image.name, self.image.storage)
+        for path in old_paths - self.get_variant_paths():
+            self.image.storage.delete(path)
+
+    @classmethod
+    def compute_sha256(cls, file):
+        """Потоковый SHA-256 загруженного файла, без чтения его в память целиком"""
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        return digest.hexdigest()
+
+    @classmethod
+    def create_from_file(cls, file, original_filename, needs_crop=False):
+        """
+        Создает запись для загруженного файла или возвращает существующую
+        с тем же SHA-256. Возвращает (запись, создана ли новая).
+        Существующая запись, которую нужно обработать заново (см. acquire),
+        возвращается в статусе pending
+        """
+        sha256 = cls.compute_sha256(file)
+        existing = cls.objects.filter(sha256=sha256).first()
+        if existing:
+            existing.acquire(needs_crop)
+            return existing, False
+
+        # Сохраняем оригинал как есть: конвертация и обрезка - в фоне
+        instance = cls(
+            image=file,
+            original_filename=original_filename,
+            file_size=file.size,
+            needs_crop=needs_crop,
+            sha256=sha256,
+        )
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError:
+            # Параллельная загрузка того же файла успела раньше
+            instance.image.delete(save=False)
+            existing = cls.objects.get(sha256=sha256)
+            existing.acquire(needs_crop)
+            return existing, False
+
+        return instance, True
+
+    def acquire(self, needs_crop=False):
+        """
+        Добавляет ссылку на запись (повторная загрузка того же файла).
+        Если загрузка просит обрезку, которой нет, или прежняя обработка
+        не удалась, запись возвращается в pending для повторной обработки
+        """
+        changes = {'ref_count': F('ref_count') + 1}
+        if needs_crop:
+            changes['needs_crop'] = True
+        ImageModel.objects.filter(pk=self.pk).update(**changes)
+        self.refresh_from_db(fields=['ref_count', 'needs_crop', 'status', 'cropped_image', 'width'])
+
+        if self.needs_processing():
+            # Условие по статусу - чтобы не перехватить запись у параллельной загрузки
+            if ImageModel.objects.filter(pk=self.pk, status=self.status).update(status=self.STATUS_PENDING):
+                self.status = self.STATUS_PENDING
+
+    def release(self):
+        """
+        Снимает одну ссылку. С последней удаляет запись, а файлы - после
+        коммита транзакции. Возвращает True, если запись удалена
+        """
+        with transaction.atomic():
+            instance = ImageModel.objects.select_for_update().get(pk=self.pk)
+            if instance.ref_count > 1:
+                instance.ref_count -= 1
+                instance.save(update_fields=['ref_count', 'updated_at'])
+                self.ref_count = instance.ref_count
+                return False
+            instance.delete()
+        transaction.on_commit(instance.delete_files)
+        return True
+
+    def delete_files(self):
+        if self.image:
+            self.image.delete(save=False)
+        if self.cropped_image:
+            self.cropped_image.delete(save=False)
+        self.delete_variant_files()
+
+    def get_variant_paths(self):
+        return {path for paths in self.variants.values() for path in paths.values()}
+
+    def has_all_variants(self):
+        """Есть ли варианты всех форматов и ширин из текущих настроек"""
+        if not self.width:
+            return False
+        widths = {str(width) for width in get_target_widths(self.width)}
+        return all(
+            widths <= set(self.variants.get(fmt, {}))
+            for fmt in get_variant_formats()
+        )
+
+    def delete_variant_files(self):
+        for path in self.get_variant_paths():
+            self.image.storage.delete(path)
+
+
+class ImageUpload(models.Model):
+    """
+    Сеанс загрузки изображения по частям (init -> append -> complete)
+
+    Части пишутся прямо в файл IMAGE_UPLOAD_TEMP_DIR/<id>.part по указанному
+    смещению, поэтому повтор части после обрыва безопасен, а память воркера
+    не зависит от размера файла. Клиент узнает, с какого места продолжать, по offset
+    """
+
+    # Сколько байт нужно для проверки заголовка изображения
+    HEADER_SIZE = 64 * 1024
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    crop = models.BooleanField(default=False)
+    header_checked = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'image_uploads'
+        verbose_name = 'Image upload'
+        verbose_name_plural = 'Image uploads'
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def path(self):
+        return os.path.join(settings.IMAGE_UPLOAD_TEMP_DIR, f'{self.id}.part')
+
+    @property
+    def is_complete(self):
+        return self.offset == self.size
+
+    def write_chunk(self, offset, stream, chunk_size=64 * 1024):
+        """
+        Пишет часть из потока запроса по смещению offset, читая его кусками.
+        Возвращает новое смещение; ValueError - если часть выходит за размер файла
+        """
+        os.makedirs(settings.IMAGE_UPLOAD_TEMP_DIR, exist_ok=True)
+        mode = 'r+b' if os.path.exists(self.path) else 'wb'
+        position = offset
+        with open(self.path, mode) as file:
+            file.seek(offset)
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                position += len(chunk)
+                if position > self.size:
+                    raise ValueError('Часть выходит за объявленный размер файла')
+                file.write(chunk)
+        return position
+
+    def check_header(self):
+        """Проверяет по первым байтам, что загружается изображение (без полного декодирования)"""
+        try:
+            with Image.open(self.path) as img:
+                img.size
+        except (OSError, SyntaxError, ValueError):
+            return False
+        return True
+
+    def delete_file(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,156 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files import File
+from PIL import Image, features
+
+# Параметры кодирования основного WebP и обрезанной версии для мобильных
+WEBP_OPTIONS = {'quality': 85, 'method': 4}
+CROP_WIDTH = 600
+
+# Параметры кодирования и расширения файлов для форматов вариантов
+VARIANT_FORMATS = {
+    'webp': {'format': 'WebP', 'extension': 'webp', 'options': {'quality': 80, 'method': 4}},
+    'avif': {'format': 'AVIF', 'extension': 'avif', 'options': {'quality': 60, 'speed': 8}},
+}
+
+# При уменьшении Pillow сначала сжимает изображение целочисленным reduce()
+# и только остаток делает фильтром LANCZOS - почти без потери качества
+REDUCING_GAP = 3.0
+
+
+def get_variant_widths():
+    return sorted(settings.IMAGE_VARIANT_WIDTHS)
+
+
+def get_variant_formats():
+    """Форматы из настроек, которые поддерживает установленный Pillow"""
+    return [name for name in settings.IMAGE_VARIANT_FORMATS if features.check(name)]
+
+
+def get_target_widths(width):
+    """
+    Ширины вариантов для изображения заданной ширины: без увеличения,
+    но хотя бы один вариант, даже если изображение уже самого узкого
+    """
+    widths = [target for target in get_variant_widths() if target < width]
+    return widths or [width]
+
+
+def decode_image(file):
+    """
+    Декодирует изображение один раз и приводит к RGB/RGBA
+
+    По умолчанию изображение декодируется в исходном размере: основной WebP
+    заменяет оригинал. Если задан IMAGE_MAX_SIDE, JPEG с помощью draft()
+    декодируется сразу в уменьшенном масштабе (1/2, 1/4, 1/8), остальное
+    доуменьшается thumbnail(). Варианты и обрезанная версия уменьшаются
+    из декодированного буфера через reduce() (см. REDUCING_GAP)
+    """
+    img = Image.open(file)
+    max_side = settings.IMAGE_MAX_SIDE
+    if max_side:
+        img.draft('RGB', (max_side, max_side))
+    img.load()
+
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if img.has_transparency_data else 'RGB')
+    if max_side and max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+    return img
+
+
+def resize_to_width(img, width):
+    if width == img.width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+class ImageWriter:
+    """
+    Кодирует изображения в хранилище через один переиспользуемый буфер
+
+    Хранилище читает буфер по частям, без копирования всего содержимого
+    в промежуточный bytes, как это делает ContentFile(output.read())
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.buffer = BytesIO()
+
+    def write(self, img, path, format, options):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        img.save(self.buffer, format=format, **options)
+        return self.storage.save(path, File(self.buffer, name=path))
+
+
+def generate_variants(img, name, storage, writer=None):
+    """
+    Создает варианты изображения для srcset из уже декодированной картинки
+
+    Ширины обходятся от большей к меньшей, и каждая следующая уменьшается
+    из предыдущей, а не из оригинала. Возвращает {формат: {ширина: путь}}
+    """
+    writer = writer or ImageWriter(storage)
+    stem = os.path.splitext(os.path.basename(name))[0]
+    formats = get_variant_formats()
+    variants = {fmt: {} for fmt in formats}
+
+    source = img
+    for width in reversed(get_target_widths(img.width)):
+        source = resize_to_width(source, width)
+        for fmt in formats:
+            params = VARIANT_FORMATS[fmt]
+            variants[fmt][str(width)] = writer.write(
+                source,
+                f"images/variants/{stem}_{width}.{params['extension']}",
+                params['format'],
+                params['options'],
+            )
+
+    return variants
+
+
+def write_cropped_image(img, name, writer):
+    """Обрезанная версия шириной CROP_WIDTH; None, если изображение не шире ее"""
+    if img.width <= CROP_WIDTH:
+        return None
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return writer.write(
+        resize_to_width(img, CROP_WIDTH), f'images/{stem}_cropped.webp', 'WebP', WEBP_OPTIONS
+    )
+
+
+def process_upload(file, name, storage, crop=False):
+    """
+    Полная обработка загруженного изображения за одно декодирование:
+    основной WebP, обрезанная версия шириной CROP_WIDTH и варианты для srcset.
+    Размеры берутся из декодированного буфера
+    """
+    writer = ImageWriter(storage)
+    stem = os.path.splitext(os.path.basename(name))[0]
+
+    with decode_image(file) as img:
+        result = {
+            'width': img.width,
+            'height': img.height,
+            'image': writer.write(img, f'images/{stem}.webp', 'WebP', WEBP_OPTIONS),
+            'cropped_image': write_cropped_image(img, name, writer) if crop else None,
+        }
+        result['variants'] = generate_variants(img, name, storage, writer)
+
+    return result
+
+
+def build_srcset(variants, url):
+    """Строит srcset для каждого формата; url - функция от пути в хранилище"""
+    return {
+        fmt: ', '.join(
+            f'{url(path)} {width}w'
+            for width, path in sorted(paths.items(), key=lambda item: int(item[0]))
+        )
+        for fmt, paths in variants.items()
+    }
@@ -1,5 +1,12 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils.text import get_valid_filename
 from rest_framework import serializers
-from .models import ImageModel
+from .models import ImageModel, ImageUpload
+from .processing import build_srcset
+from .tasks import enqueue_processing
 
 
 class ImageUploadSerializer(serializers.ModelSerializer):
@@ -16,15 +23,14 @@ class ImageUploadSerializer(serializers.ModelSerializer):
         if not validated_data.get('original_filename'):
             validated_data['original_filename'] = validated_data['image'].name
             
-        # Получаем размер файла
-        validated_data['file_size'] = validated_data['image'].size
-        
-        instance = super().create(validated_data)
-        
-        # Создаем обрезанную версию если нужно
-        if crop:
-            instance.create_cropped_version()
-            instance.save()
+        # Тот же файл уже загружали - возвращаем существующую запись без перекодирования;
+        # в очередь она попадает, только если ей не хватает обрезки или обработка не удалась
+        instance, created = ImageModel.create_from_file(
+            validated_data['image'], validated_data['original_filename'], needs_crop=crop
+        )
+        self.duplicate = not created
+        if instance.status == ImageModel.STATUS_PENDING:
+            enqueue_processing(instance)
             
         return instance
 
@@ -32,12 +38,14 @@ class ImageUploadSerializer(serializers.ModelSerializer):
 class ImageSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     cropped_image_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = ImageModel
         fields = [
-            'id', 'original_filename', 'image_url', 'cropped_image_url',
-            'file_size', 'width', 'height', 'created_at', 'updated_at'
+            'id', 'original_filename', 'image_url', 'cropped_image_url', 'srcset',
+            'file_size', 'width', 'height', 'status', 'processing_error',
+            'processed_at', 'created_at', 'updated_at'
         ]
         
     def get_image_url(self, obj):
@@ -48,6 +56,16 @@ class ImageSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
         
+    def get_srcset(self, obj):
+        """srcset для каждого формата: {"webp": "url 320w, url 640w, ..."}"""
+        request = self.context.get('request')
+
+        def url(path):
+            path = obj.image.storage.url(path)
+            return request.build_absolute_uri(path) if request else path
+
+        return build_srcset(obj.variants, url)
+
     def get_cropped_image_url(self, obj):
         if obj.cropped_image:
             request = self.context.get('request')
@@ -60,4 +78,117 @@ class ImageSerializer(serializers.ModelSerializer):
 class ImageUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ImageModel
-        fields = ['original_filename']
\ No newline at end of file
+        fields = ['original_filename']
+
+
+class ImageResolveSerializer(serializers.Serializer):
+    """Список путей к изображениям для получения одним запросом"""
+    MAX_PATHS = 200
+
+    paths = serializers.ListField(
+        child=serializers.CharField(max_length=1024),
+        allow_empty=False,
+        max_length=MAX_PATHS,
+        help_text="Пути или URL изображений (например: /media/images/photo.webp)"
+    )
+
+
+class ImageUploadSessionSerializer(serializers.ModelSerializer):
+    """Сеанс загрузки по частям: offset - сколько байт уже принято"""
+
+    class Meta:
+        model = ImageUpload
+        fields = ['id', 'filename', 'size', 'offset', 'crop', 'created_at']
+        read_only_fields = ['id', 'offset', 'created_at']
+
+    def validate_filename(self, value):
+        # Имя передается в File(name=...) при сборке: только имя файла, без пути
+        try:
+            return get_valid_filename(os.path.basename(value.replace('\\', '/')))
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError('Недопустимое имя файла')
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Размер файла должен быть положительным')
+        if value > settings.IMAGE_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Размер файла превышает {settings.IMAGE_UPLOAD_MAX_SIZE} байт'
+            )
+        return value
+
+
+class ImageMetadataSerializer(ImageSerializer):
+    """Краткие данные изображения для встраивания в другие ответы"""
+
+    class Meta(ImageSerializer.Meta):
+        fields = ['id', 'image_url', 'cropped_image_url', 'width', 'height', 'srcset']
+
+
+class ImageMetadataMixin:
+    """
+    Встраивает данные изображений (ImageMetadataSerializer) рядом с полями,
+    в которых хранятся пути к ним строкой, при запросе с ?expand=images:
+    image -> image_data, serts -> serts_data (список).
+
+    Для списка все пути страницы находятся одним запросом: первый элемент
+    собирает пути всех элементов родительского ListSerializer.
+    """
+
+    image_fields = ()       # поля со строкой-путем
+    image_list_fields = ()  # JSON-поля со списком путей
+
+    expand_param = 'expand'
+
+    @property
+    def expand_images(self):
+        request = self.context.get('request')
+        if not request:
+            return False
+        return 'images' in request.query_params.get(self.expand_param, '').split(',')
+
+    def get_extra_model_fields(self):
+        """Пути нужны для встраивания, даже если сами поля исключены через ?fields="""
+        fields = super().get_extra_model_fields()
+        if self.expand_images:
+            fields |= {*self.image_fields, *self.image_list_fields}
+        return fields
+
+    def get_image_paths(self, instance):
+        paths = [getattr(instance, field) for field in self.image_fields]
+        for field in self.image_list_fields:
+            value = getattr(instance, field)
+            if isinstance(value, list):
+                paths.extend(value)
+        return [path for path in paths if path and isinstance(path, str)]
+
+    def get_image_metadata(self, instance):
+        """{путь: данные изображения} для всей страницы, кешируется на родителе"""
+        owner = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        metadata = getattr(owner, '_image_metadata', None)
+        if metadata is None:
+            instances = owner.instance if owner is not self else [instance]
+            paths = {path for item in instances for path in self.get_image_paths(item)}
+            found = ImageModel.objects.resolve(paths)
+            metadata = {
+                path: ImageMetadataSerializer(image, context=self.context).data
+                for path, image in found.items()
+            }
+            owner._image_metadata = metadata
+        return metadata
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if not self.expand_images:
+            return data
+
+        metadata = self.get_image_metadata(instance)
+        for field in self.image_fields:
+            data[f'{field}_data'] = metadata.get(getattr(instance, field))
+        for field in self.image_list_fields:
+            value = getattr(instance, field)
+            paths = value if isinstance(value, list) else []
+            data[f'{field}_data'] = [
+                metadata.get(path) if isinstance(path, str) else None for path in paths
+            ]
+        return data
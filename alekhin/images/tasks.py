@@ -0,0 +1,70 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import ImageModel
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    """
+    Пул фоновой обработки изображений.
+
+    Создается лениво, чтобы каждый воркер gunicorn после fork получил свой пул.
+    Потоков достаточно: Pillow отпускает GIL на декодировании и кодировании.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                thread_name_prefix='image-processing',
+            )
+    return _executor
+
+
+def process_image(image_id):
+    """Обрабатывает одно изображение и сохраняет статус"""
+    # В потоке пула соединение с БД свое, его надо обслуживать как в запросе
+    in_worker = not settings.IMAGE_PROCESSING_SYNC
+    if in_worker:
+        close_old_connections()
+    try:
+        updated = ImageModel.objects.filter(
+            id=image_id, status__in=[ImageModel.STATUS_PENDING, ImageModel.STATUS_FAILED]
+        ).update(status=ImageModel.STATUS_PROCESSING)
+        if not updated:
+            # Запись удалена или уже обрабатывается другим воркером
+            return
+
+        instance = ImageModel.objects.get(id=image_id)
+        try:
+            instance.process()
+        except Exception as e:
+            logger.exception('Не удалось обработать изображение %s', image_id)
+            ImageModel.objects.filter(id=image_id).update(
+                status=ImageModel.STATUS_FAILED, processing_error=str(e)
+            )
+    finally:
+        if in_worker:
+            close_old_connections()
+
+
+def enqueue_processing(instance):
+    """
+    Ставит изображение в очередь после коммита транзакции, в которой оно создано.
+    С IMAGE_PROCESSING_SYNC обработка выполняется сразу, в текущем потоке
+    """
+    if settings.IMAGE_PROCESSING_SYNC:
+        process_image(instance.id)
+        instance.refresh_from_db()
+        return
+
+    transaction.on_commit(lambda: get_executor().submit(process_image, instance.id))
@@ -1,3 +1,374 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import ImageModel, ImageUpload
+from .processing import decode_image, process_upload
+from .tasks import enqueue_processing
+
+def make_upload(name='photo.png', size=(1200, 800)):
+    output = BytesIO()
+    Image.new('RGB', size, 'red').save(output, format='PNG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/png')
+
+
+class MediaRootTestCase(APITestCase):
+    """Файлы пишутся во временный MEDIA_ROOT, который удаляется после тестов класса"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+
+@override_settings(IMAGE_PROCESSING_SYNC=False)
+class ImageUploadAPITest(MediaRootTestCase):
+
+    def upload(self, **data):
+        return self.client.post(reverse('image-list'), {'image': make_upload(), **data}, format='multipart')
+
+    def test_upload_returns_202_before_processing(self):
+        """Тест: загрузка возвращает 202, обработка откладывается до коммита"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], ImageModel.STATUS_PENDING)
+        self.assertIsNone(response.data['width'])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_background_processing(self):
+        """Тест: после обработки изображение в WebP, размеры и обрезка заполнены"""
+        with override_settings(IMAGE_PROCESSING_SYNC=True):
+            response = self.upload(crop=True)
+
+        image = ImageModel.objects.get(id=response.data['id'])
+        self.assertEqual(image.status, ImageModel.STATUS_READY)
+        self.assertEqual((image.width, image.height), (1200, 800))
+        self.assertTrue(image.image.name.endswith('.webp'))
+        self.assertTrue(image.cropped_image.name.endswith('_cropped.webp'))
+        self.assertIsNotNone(image.processed_at)
+
+    def test_variants_and_srcset(self):
+        """Тест: варианты создаются без увеличения и отдаются как srcset"""
+        with override_settings(IMAGE_PROCESSING_SYNC=True):
+            response = self.upload()
+
+        image = ImageModel.objects.get(id=response.data['id'])
+        self.assertEqual(set(image.variants['webp']), {'320', '640', '1024'})
+
+        response = self.client.get(reverse('image-detail', kwargs={'id': image.id}))
+        srcset = response.data['srcset']['webp']
+        self.assertIn('320w', srcset)
+        self.assertNotIn('1920w', srcset)
+
+    def test_single_decode(self):
+        """Тест: оригинал декодируется один раз на все выходные файлы"""
+        with override_settings(IMAGE_PROCESSING_SYNC=True), \
+                mock.patch('images.processing.Image.open', wraps=Image.open) as image_open:
+            response = self.upload(crop=True)
+
+        self.assertEqual(image_open.call_count, 1)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_failed_processing(self):
+        """Тест: ошибка декодирования сохраняется в статусе failed"""
+        broken = SimpleUploadedFile('photo.png', b'not an image', content_type='image/png')
+        with override_settings(IMAGE_PROCESSING_SYNC=True):
+            image = ImageModel.objects.create(original_filename='photo.png', image=broken, file_size=12)
+            enqueue_processing(image)
+
+        self.assertEqual(image.status, ImageModel.STATUS_FAILED)
+        self.assertTrue(image.processing_error)
+
+
+@override_settings(IMAGE_PROCESSING_SYNC=True)
+class ImageDeduplicationTest(MediaRootTestCase):
+    def setUp(self):
+        self.payload = make_upload().read()
+
+    def upload(self, **data):
+        upload = SimpleUploadedFile('photo.png', self.payload, content_type='image/png')
+        return self.client.post(reverse('image-list'), {'image': upload, **data}, format='multipart')
+
+    def test_duplicate_upload_returns_existing_record(self):
+        """Тест: повторная загрузка того же файла не создает запись и не перекодирует"""
+        first = self.upload()
+        with mock.patch('images.models.process_upload') as process:
+            second = self.upload()
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['id'], first.data['id'])
+        process.assert_not_called()
+        self.assertEqual(ImageModel.objects.count(), 1)
+        self.assertEqual(ImageModel.objects.get().ref_count, 2)
+
+    def test_duplicate_with_crop_adds_cropped_version(self):
+        """Тест: повтор загрузки с обрезкой достраивает обрезку, не перекодируя основной файл"""
+        first = self.upload()
+        image = ImageModel.objects.get(id=first.data['id'])
+        self.assertFalse(image.cropped_image)
+
+        with mock.patch('images.models.process_upload') as process:
+            self.upload(crop=True)
+
+        process.assert_not_called()
+        updated = ImageModel.objects.get(id=image.id)
+        self.assertEqual(updated.status, ImageModel.STATUS_READY)
+        self.assertEqual(updated.image.name, image.image.name)
+        self.assertTrue(updated.cropped_image.name.endswith('_cropped.webp'))
+
+    def test_duplicate_of_failed_image_is_reprocessed(self):
+        """Тест: повтор загрузки файла, обработка которого не удалась, запускает ее снова"""
+        first = self.upload()
+        ImageModel.objects.filter(id=first.data['id']).update(
+            status=ImageModel.STATUS_FAILED, processed_at=None, processing_error='boom'
+        )
+
+        with mock.patch('images.models.process_upload', wraps=process_upload) as process:
+            second = self.upload()
+
+        process.assert_called_once()
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(ImageModel.objects.get().status, ImageModel.STATUS_READY)
+
+    def test_destroy_keeps_shared_image(self):
+        """Тест: удаление снимает ссылку, файлы удаляются с последней"""
+        self.upload()
+        self.upload()
+        image = ImageModel.objects.get()
+        url = reverse('image-detail-by-slug')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'{url}?slug=media/{image.image.name}')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(ImageModel.objects.get().ref_count, 1)
+        self.assertTrue(image.image.storage.exists(image.image.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'{url}?slug=media/{image.image.name}')
+        self.assertFalse(ImageModel.objects.exists())
+        self.assertFalse(image.image.storage.exists(image.image.name))
+
+    def test_destroy_by_id(self):
+        """Тест: DELETE /images/<id>/ удаляет изображение по ID, неизвестный ID - 404"""
+        image_id = self.upload().data['id']
+        url = reverse('image-detail', kwargs={'id': image_id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(ImageModel.objects.exists())
+
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(IMAGE_PROCESSING_SYNC=True)
+class ImageResolveAPITest(MediaRootTestCase):
+    def setUp(self):
+        self.first = self.client.post(reverse('image-list'), {'image': make_upload('first.png')}, format='multipart').data
+        self.second = self.client.post(
+            reverse('image-list'), {'image': make_upload('second.png', size=(640, 480))}, format='multipart'
+        ).data
+        self.first_key = ImageModel.objects.get(id=self.first['id']).storage_key
+
+    def test_storage_key_follows_converted_file(self):
+        """Тест: ключ хранилища указывает на итоговый WebP"""
+        self.assertTrue(self.first_key.startswith('images/'))
+        self.assertTrue(self.first_key.endswith('.webp'))
+
+    def test_resolve_many_paths_in_one_query(self):
+        """Тест: пути в любом виде находятся одним запросом"""
+        second_key = ImageModel.objects.get(id=self.second['id']).storage_key
+        paths = [
+            f'http://testserver/media/{self.first_key}',
+            f'/media/{second_key}',
+            'images/missing.webp',
+        ]
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('image-resolve'), {'paths': paths}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[paths[0]]['id'], self.first['id'])
+        self.assertEqual(response.data[paths[1]]['id'], self.second['id'])
+        self.assertIsNone(response.data[paths[2]])
+
+    def test_retrieve_by_slug_uses_storage_key(self):
+        """Тест: получение по слагу с полным URL"""
+        response = self.client.generic(
+            'GET', reverse('image-detail-by-slug'),
+            json.dumps({'slug': f'http://testserver/media/{self.first_key}'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.first['id'])
+
+
+@override_settings(IMAGE_PROCESSING_SYNC=True)
+class ImageChunkedUploadAPITest(MediaRootTestCase):
+    def setUp(self):
+        self.enterContext(override_settings(IMAGE_UPLOAD_TEMP_DIR=os.path.join(self.media_root, 'tmp')))
+        self.payload = make_upload(size=(2000, 1500)).read()
+        user = get_user_model().objects.create_user(email='staff@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+
+    def start(self, size=None, filename='scan.png'):
+        response = self.client.post(reverse('image-upload-list'), {
+            'filename': filename, 'size': size or len(self.payload), 'crop': True
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def upload_all(self, upload_id):
+        self.append(upload_id, 0, self.payload)
+        return self.client.post(reverse('image-upload-complete', kwargs={'id': upload_id}))
+
+    def append(self, upload_id, offset, chunk):
+        return self.client.put(
+            reverse('image-upload-detail', kwargs={'id': upload_id}), chunk,
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunked_upload_with_resume(self):
+        """Тест: файл собирается из частей, повтор части после обрыва дает 409 и offset"""
+        upload_id = self.start()
+        middle = len(self.payload) // 2
+
+        self.assertEqual(self.append(upload_id, 0, self.payload[:middle]).data['offset'], middle)
+        # Клиент не получил ответ и повторяет часть с нуля
+        response = self.append(upload_id, 0, self.payload[:middle])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['offset'], middle)
+
+        self.append(upload_id, middle, self.payload[middle:])
+        response = self.client.post(reverse('image-upload-complete', kwargs={'id': upload_id}))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        image = ImageModel.objects.get(id=response.data['id'])
+        self.assertEqual(image.status, ImageModel.STATUS_READY)
+        # Основное изображение хранится в исходном размере, варианты - уменьшенные
+        self.assertEqual((image.width, image.height), (2000, 1500))
+        self.assertEqual(set(image.variants['webp']), {'320', '640', '1024', '1920'})
+        self.assertTrue(image.cropped_image)
+        self.assertFalse(ImageUpload.objects.exists())
+
+    def test_rejects_non_image_early(self):
+        """Тест: не-изображение отклоняется по первой части"""
+        upload_id = self.start(size=ImageUpload.HEADER_SIZE * 4)
+        response = self.append(upload_id, 0, b'x' * ImageUpload.HEADER_SIZE)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ImageUpload.objects.exists())
+
+    def test_complete_requires_all_chunks(self):
+        """Тест: незавершенную загрузку нельзя собрать"""
+        upload_id = self.start()
+        self.append(upload_id, 0, self.payload[:100])
+        response = self.client.post(reverse('image-upload-complete', kwargs={'id': upload_id}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        """Тест: без токена сеанс загрузки не открывается"""
+        self.client.force_authenticate(None)
+        response = self.client.post(reverse('image-upload-list'), {'filename': 'scan.png', 'size': 100})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(ImageUpload.objects.exists())
+
+    def test_filename_path_is_stripped(self):
+        """Тест: путь в имени файла отбрасывается при создании сеанса, сборка не падает"""
+        upload_id = self.start(filename='../../etc/scan.png')
+        self.assertEqual(ImageUpload.objects.get(id=upload_id).filename, 'scan.png')
+
+        response = self.upload_all(upload_id)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['original_filename'], 'scan.png')
+
+    def test_invalid_filename(self):
+        """Тест: имя файла из одного пути - 400"""
+        response = self.client.post(reverse('image-upload-list'), {'filename': '../', 'size': 100})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_append_and_complete_lock_session(self):
+        """Тест: смещение проверяется и сеанс собирается под блокировкой строки"""
+        upload_id = self.start()
+        with CaptureQueriesContext(connection) as queries:
+            self.upload_all(upload_id)
+
+        locked = [query['sql'] for query in queries if 'FOR UPDATE' in query['sql']]
+        self.assertEqual(len(locked), 2)
+        self.assertTrue(all('image_uploads' in sql for sql in locked))
+
+    def test_repeated_complete_takes_one_reference(self):
+        """Тест: повторная сборка того же сеанса - 404, ссылка на изображение одна"""
+        upload_id = self.start()
+        first = self.upload_all(upload_id)
+        second = self.client.post(reverse('image-upload-complete', kwargs={'id': upload_id}))
+
+        self.assertEqual(second.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(ImageModel.objects.get(id=first.data['id']).ref_count, 1)
+
+
+@override_settings(IMAGE_PROCESSING_SYNC=True)
+class GenerateImageVariantsCommandTest(MediaRootTestCase):
+    def test_backfill_skips_complete_images(self):
+        """Тест: команда создает недостающие варианты и пропускает готовые"""
+        image = ImageModel.objects.create(original_filename='photo.png', image=make_upload(), file_size=1)
+        enqueue_processing(image)
+        ImageModel.objects.filter(id=image.id).update(variants={})
+
+        output = StringIO()
+        call_command('generate_image_variants', stdout=output)
+        image.refresh_from_db()
+        self.assertTrue(image.has_all_variants())
+        self.assertIn('Создано: 1', output.getvalue())
+
+        output = StringIO()
+        call_command('generate_image_variants', stdout=output)
+        self.assertIn('пропущено: 1', output.getvalue())
+
+
+class DecodeImageTest(APITestCase):
+    def decode_jpeg(self, size):
+        output = BytesIO()
+        Image.new('RGB', size, 'red').save(output, format='JPEG')
+        output.seek(0)
+        with mock.patch.object(JpegImageFile, 'draft', autospec=True, side_effect=JpegImageFile.draft) as draft:
+            img = decode_image(output)
+        return img, draft
+
+    def test_full_size_by_default(self):
+        """Тест: без IMAGE_MAX_SIDE большой JPEG декодируется в исходном размере"""
+        img, draft = self.decode_jpeg((4000, 3000))
+
+        draft.assert_not_called()
+        self.assertEqual(img.size, (4000, 3000))
+
+    @override_settings(IMAGE_MAX_SIDE=1920)
+    def test_large_jpeg_decoded_in_reduced_scale(self):
+        """Тест: с IMAGE_MAX_SIDE большой JPEG декодируется через draft() в уменьшенном масштабе"""
+        img, draft = self.decode_jpeg((4000, 3000))
+
+        draft.assert_called_once()
+        self.assertEqual(img.size, (1920, 1440))
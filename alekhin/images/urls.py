@@ -1,10 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ImageViewSet
+from .views import ImageViewSet, ImageUploadViewSet
 
 urlpatterns = [
     path('', ImageViewSet.as_view({'get': 'list', 'post': 'create'}), name='image-list'),
-    path('<int:id>/', ImageViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='image-detail'),
+    path('<uuid:id>/', ImageViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='image-detail'),
+    path('resolve/', ImageViewSet.as_view({'post': 'resolve'}), name='image-resolve'),
     path('slug/', ImageViewSet.as_view({'get': 'retrieve_by_slug', 'delete': 'destroy'}), name='image-detail-by-slug'),
+    path('uploads/', ImageUploadViewSet.as_view({'post': 'create'}), name='image-upload-list'),
+    path('uploads/<uuid:id>/', ImageUploadViewSet.as_view({'get': 'retrieve', 'put': 'append', 'delete': 'destroy'}), name='image-upload-detail'),
+    path('uploads/<uuid:id>/complete/', ImageUploadViewSet.as_view({'post': 'complete'}), name='image-upload-complete'),
 
 ]
\ No newline at end of file
@@ -1,17 +1,24 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.permissions import IsAuthenticated
+from django.core.files import File
+from django.db import transaction
 from django.http import Http404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from .models import ImageModel
-from .serializers import ImageUploadSerializer, ImageSerializer, ImageUpdateSerializer
+from .models import ImageModel, ImageUpload, normalize_storage_key
+from .serializers import (
+    ImageUploadSerializer, ImageSerializer, ImageUpdateSerializer, ImageUploadSessionSerializer,
+    ImageResolveSerializer
+)
+from .tasks import enqueue_processing
 
 
 class ImageViewSet(viewsets.ModelViewSet):
     queryset = ImageModel.objects.all()
-    parser_classes = (MultiPartParser, FormParser)
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
     lookup_field = 'id'
     
     def get_serializer_class(self):
@@ -47,19 +54,27 @@ class ImageViewSet(viewsets.ModelViewSet):
             ),
         ],
         responses={
-            201: ImageSerializer,
+            200: ImageSerializer,
+            202: ImageSerializer,
             400: "Ошибка валидации"
         }
     )
     def create(self, request, *args, **kwargs):
-        """Загрузка нового изображения с возможностью обрезки"""
+        """
+        Загрузка нового изображения с возможностью обрезки
+
+        Оригинал сохраняется сразу, ответ 202 возвращается до конвертации.
+        Готовность видна по полю status (pending -> processing -> ready/failed)
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         instance = serializer.save()
         
-        # Возвращаем полную информацию об изображении
+        # Возвращаем полную информацию об изображении; повторная загрузка
+        # того же файла сразу отдает существующую запись
         response_serializer = ImageSerializer(instance, context={'request': request})
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        response_status = status.HTTP_200_OK if serializer.duplicate else status.HTTP_202_ACCEPTED
+        return Response(response_serializer.data, status=response_status)
     
     @swagger_auto_schema(
         operation_description="Получение изображения по ID",
@@ -120,24 +135,21 @@ class ImageViewSet(viewsets.ModelViewSet):
         }
     )
     def destroy(self, request, *args, **kwargs):
-        """Удаление изображения"""
+        """Удаление изображения по ID (/images/<id>/) или по слагу (/images/slug/?slug=)"""
         try:
-            slug = request.query_params.get('slug', None)
-            if not slug:
-                 return Response(
-                    {"error": "Слаг не указан"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-                
-            instance = ImageModel.objects.get(image=slug.split('media/')[-1])
-            
-            # Удаляем файлы с диска
-            if instance.image:
-                instance.image.delete(save=False)
-            if instance.cropped_image:
-                instance.cropped_image.delete(save=False)
-                
-            instance.delete()
+            if 'id' in self.kwargs:
+                instance = ImageModel.objects.get(id=self.kwargs['id'])
+            else:
+                slug = request.query_params.get('slug', None)
+                if not slug:
+                    return Response(
+                        {"error": "Слаг не указан"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                instance = ImageModel.objects.get(storage_key=normalize_storage_key(slug))
+
+            # Запись и файлы удаляются только вместе с последней ссылкой
+            instance.release()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ImageModel.DoesNotExist:
             return Response(
@@ -156,11 +168,176 @@ class ImageViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            instance = ImageModel.objects.get(image=slug.split('media/')[-1])
+            instance = ImageModel.objects.get(storage_key=normalize_storage_key(slug))
             serializer = self.get_serializer(instance)
             return Response(serializer.data)
         except ImageModel.DoesNotExist:
             return Response(
                 {"error": "Изображение не найдено"}, 
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+    @swagger_auto_schema(
+        operation_description="Получение изображений по списку путей одним запросом",
+        request_body=ImageResolveSerializer,
+        responses={200: "Словарь {путь: изображение или null}", 400: "Ошибка валидации"}
+    )
+    def resolve(self, request, *args, **kwargs):
+        """Получение изображений по списку путей (URL, /media/... или images/...)"""
+        serializer = ImageResolveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        paths = serializer.validated_data['paths']
+
+        found = ImageModel.objects.resolve(paths)
+        context = self.get_serializer_context()
+        return Response({
+            path: ImageSerializer(found[path], context=context).data if path in found else None
+            for path in paths
+        })
+
+
+class ImageUploadViewSet(viewsets.GenericViewSet):
+    """
+    Загрузка изображения по частям:
+
+    POST   /images/uploads/                 - начать загрузку (filename, size, crop)
+    PUT    /images/uploads/<id>/            - тело запроса - очередная часть,
+                                              смещение в заголовке Upload-Offset
+    GET    /images/uploads/<id>/            - сколько байт уже принято (для продолжения)
+    POST   /images/uploads/<id>/complete/   - собрать файл и поставить в обработку
+    DELETE /images/uploads/<id>/            - отменить загрузку
+
+    Требует токен: сеанс занимает до IMAGE_UPLOAD_MAX_SIZE на диске.
+    Части и сборка выполняются под блокировкой строки сеанса
+    """
+
+    queryset = ImageUpload.objects.all()
+    serializer_class = ImageUploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'id'
+    offset_header = 'Upload-Offset'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('append', 'complete'):
+            # Параллельный запрос к тому же сеансу ждет конца транзакции
+            # и видит уже новое смещение (или удаленный сеанс)
+            queryset = queryset.select_for_update()
+        return queryset
+
+    @swagger_auto_schema(
+        operation_description="Начать загрузку изображения по частям",
+        responses={201: ImageUploadSessionSerializer, 400: "Ошибка валидации"}
+    )
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_description="Состояние загрузки: offset - сколько байт уже принято",
+        responses={200: ImageUploadSessionSerializer, 404: "Загрузка не найдена"}
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    @swagger_auto_schema(
+        operation_description="Добавить часть файла. Тело запроса - байты части",
+        manual_parameters=[
+            openapi.Parameter(
+                'Upload-Offset', openapi.IN_HEADER, type=openapi.TYPE_INTEGER, required=True,
+                description="Смещение части в файле; должно совпадать с offset загрузки"
+            ),
+        ],
+        responses={
+            200: ImageUploadSessionSerializer,
+            400: "Часть не прошла проверку",
+            409: "Смещение не совпадает с принятым"
+        }
+    )
+    def append(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers.get(self.offset_header, ''))
+        except ValueError:
+            return Response(
+                {"error": f"Не указан заголовок {self.offset_header}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # Смещение проверяется под блокировкой до записи: параллельный
+            # повтор той же части получает 409, не трогая файл
+            upload = self.get_object()
+            if offset != upload.offset:
+                return Response(
+                    {"error": "Смещение не совпадает с принятым", "offset": upload.offset},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            # Тело читается из потока кусками, без request.body и парсеров
+            try:
+                new_offset = upload.write_chunk(offset, request._request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Заголовок проверяем, как только он принят целиком: не-изображение
+            # отклоняется до загрузки остального файла
+            header_ready = new_offset >= min(upload.size, ImageUpload.HEADER_SIZE)
+            if header_ready and not upload.header_checked:
+                if not upload.check_header():
+                    upload.delete_file()
+                    upload.delete()
+                    return Response(
+                        {"error": "Файл не является изображением"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+            upload.offset = new_offset
+            upload.header_checked = upload.header_checked or header_ready
+            upload.save(update_fields=['offset', 'header_checked', 'updated_at'])
+        return Response(self.get_serializer(upload).data)
+
+    @swagger_auto_schema(
+        operation_description="Завершить загрузку и поставить изображение в обработку",
+        responses={
+            200: ImageSerializer,
+            202: ImageSerializer,
+            400: "Загрузка не завершена",
+            404: "Загрузка не найдена"
+        }
+    )
+    def complete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            # Сеанс удаляется в той же транзакции: повторный complete ждет
+            # блокировку и получает 404, ссылка на изображение берется один раз
+            upload = self.get_object()
+            if not upload.is_complete:
+                return Response(
+                    {"error": "Файл загружен не полностью", "offset": upload.offset, "size": upload.size},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Собранный файл копируется в хранилище по частям, как и хешируется
+            with open(upload.path, 'rb') as file:
+                instance, created = ImageModel.create_from_file(
+                    File(file, name=upload.filename), upload.filename, needs_crop=upload.crop
+                )
+            if instance.status == ImageModel.STATUS_PENDING:
+                enqueue_processing(instance)
+
+            upload.delete_file()
+            upload.delete()
+
+        serializer = ImageSerializer(instance, context={'request': request})
+        response_status = status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
+        return Response(serializer.data, status=response_status)
+
+    @swagger_auto_schema(
+        operation_description="Отменить загрузку",
+        responses={204: "Загрузка отменена", 404: "Загрузка не найдена"}
+    )
+    def destroy(self, request, *args, **kwargs):
+        upload = self.get_object()
+        upload.delete_file()
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -22,6 +22,7 @@ class ItemCountResponseSerializer(serializers.Serializer):
     endpoint = serializers.CharField()
     count = serializers.IntegerField()
     model = serializers.CharField(required=False, allow_null=True)
+    estimated = serializers.BooleanField(required=False)
     error = serializers.CharField(required=False, allow_null=True)
 
 
@@ -1,5 +1,6 @@
 from django.apps import apps
-from django.db import models
+from django.conf import settings
+from django.db import connection, DatabaseError, models
 from django.core.exceptions import ImproperlyConfigured
 import importlib
 
@@ -10,15 +11,20 @@ class ItemCountService:
     # Маппинг эндпойнтов к моделям
     ENDPOINT_MODEL_MAPPING = {
         '/specialists/': ('specialists', 'Specialist'),
-        '/images/': ('images', 'Image'),
+        '/images/': ('images', 'ImageModel'),
         '/services/': ('services', 'Service'),
         '/job_titles/': ('job_titles', 'JobTitle'),
         '/tests/': ('tests', 'Test'),
         '/goods/': ('goods', 'Good'),
         '/requests/': ('requests', 'Request'),
         '/news/': ('news', 'News'),
+        '/service_types/': ('service_types', 'ServiceType'),
         # Можно легко добавлять новые эндпойнты
     }
+
+    # Таблицы, в которых по pg_class.reltuples не меньше записей, чем порог,
+    # не пересчитываются, а берется оценка планировщика. None - всегда точно
+    ESTIMATE_THRESHOLD = getattr(settings, 'ITEMS_COUNT_ESTIMATE_THRESHOLD', None)
     
     @classmethod
     def get_model_from_endpoint(cls, endpoint):
@@ -33,6 +39,14 @@ class ItemCountService:
         except LookupError:
             return None
     
+    @classmethod
+    def get_endpoints_for_model(cls, model):
+        """Возвращает эндпойнты, которые считают записи модели"""
+        return [
+            endpoint for endpoint, (app_name, model_name) in cls.ENDPOINT_MODEL_MAPPING.items()
+            if model._meta.app_label == app_name and model.__name__ == model_name
+        ]
+
     @classmethod
     def get_count_for_endpoint(cls, endpoint, user=None):
         """Получает количество записей для конкретного эндпойнта"""
@@ -87,12 +101,89 @@ class ItemCountService:
     @classmethod
     def get_all_counts(cls, user=None):
         """Получает количество записей для всех эндпойнтов"""
+        return cls.get_counts(cls.get_available_endpoints(), user)
+
+    @classmethod
+    def get_counts(cls, endpoints, user=None, estimate_threshold=None):
+        """
+        Получает количество записей для нескольких эндпойнтов одним SQL-запросом
+
+        Для каждой модели строится отфильтрованный COUNT (с учетом _apply_filters),
+        все подсчеты объединяются через UNION ALL. Если задан порог оценки,
+        для нефильтрованных выборок большие таблицы берутся из pg_class.reltuples.
+        """
+        if estimate_threshold is None:
+            estimate_threshold = cls.ESTIMATE_THRESHOLD
+
         results = {}
-        
-        for endpoint in cls.ENDPOINT_MODEL_MAPPING.keys():
-            results[endpoint] = cls.get_count_for_endpoint(endpoint, user)
-        
-        return results
+        models_by_endpoint = {}
+        parts = []
+        params = []
+
+        for endpoint in endpoints:
+            model = cls.get_model_from_endpoint(endpoint)
+            if not model:
+                results[endpoint] = {
+                    'endpoint': endpoint,
+                    'count': 0,
+                    'error': 'Endpoint not found or model not available'
+                }
+                continue
+
+            models_by_endpoint[endpoint] = model
+            queryset = cls._apply_filters(model.objects.all(), model, user)
+            sql, query_params = cls._get_count_sql(queryset, estimate_threshold)
+            parts.append(sql)
+            params.extend([endpoint, *query_params])
+
+        if not parts:
+            return results
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(' UNION ALL '.join(parts), params)
+                rows = cursor.fetchall()
+        except DatabaseError as e:
+            for endpoint in models_by_endpoint:
+                results[endpoint] = {
+                    'endpoint': endpoint,
+                    'count': 0,
+                    'error': str(e)
+                }
+            return results
+
+        for endpoint, count, estimated in rows:
+            model = models_by_endpoint[endpoint]
+            results[endpoint] = {
+                'endpoint': endpoint,
+                'count': count,
+                'model': f"{model._meta.app_label}.{model._meta.model_name}",
+                'estimated': estimated,
+                'error': None
+            }
+
+        # Сохраняем порядок запрошенных эндпойнтов
+        return {endpoint: results[endpoint] for endpoint in endpoints}
+
+    @classmethod
+    def _get_count_sql(cls, queryset, estimate_threshold):
+        """SQL одной строки (endpoint, count, estimated) для UNION ALL"""
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        count_sql = f'(SELECT COUNT(*) FROM ({sql}) AS counted)'
+
+        # Оценка по reltuples годится только для таблицы целиком: долю записей,
+        # прошедших фильтр, она не знает. Для неанализированных таблиц
+        # reltuples = -1 и всегда выполняется точный подсчет
+        if estimate_threshold is None or queryset.query.where:
+            return f'SELECT %s, {count_sql}, false', params
+
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        return (
+            'SELECT %s, CASE WHEN reltuples >= %s THEN reltuples::bigint '
+            f'ELSE {count_sql} END, reltuples >= %s '
+            'FROM pg_class WHERE oid = %s::regclass',
+            [estimate_threshold, *params, estimate_threshold, table]
+        )
     
     @classmethod
     def get_available_endpoints(cls):
@@ -107,6 +198,11 @@ class ItemCountService:
     @classmethod
     def get_detailed_stats(cls, user=None):
         """Получает детальную статистику по всем моделям"""
+        return cls.build_detailed_stats(cls.get_all_counts(user))
+
+    @classmethod
+    def build_detailed_stats(cls, counts):
+        """Собирает детальную статистику из результатов подсчета"""
         stats = {
             'total_endpoints': len(cls.ENDPOINT_MODEL_MAPPING),
             'endpoints': {},
@@ -117,8 +213,7 @@ class ItemCountService:
             }
         }
         
-        for endpoint in cls.ENDPOINT_MODEL_MAPPING.keys():
-            result = cls.get_count_for_endpoint(endpoint, user)
+        for endpoint, result in counts.items():
             stats['endpoints'][endpoint] = result
             
             if result['error']:
@@ -1,40 +1,23 @@
 from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
-from django.core.cache import cache
+from .services import ItemCountService
 from .utils import CachedItemCountService
 
-# Импортируем модели
-try:
-    from specialists.models import Specialist
-    from images.models import Image
-    from services.models import Service
-    from job_titles.models import JobTitle
-    from goods.models import Good
-    # Добавьте другие модели по мере необходимости
-except ImportError:
-    # Модели могут быть недоступны при первой миграции
-    pass
-
 
 def clear_related_cache(sender, **kwargs):
-    """Очищает кеш для связанной модели"""
-    model_name = sender._meta.model_name
-    app_label = sender._meta.app_label
-    
-    # Очищаем кеш для этой модели
-    CachedItemCountService.clear_cache()
+    """Очищает кеш количества записей для изменившейся модели"""
+    CachedItemCountService.invalidate_model(sender)
 
 
-# Регистрируем сигналы для всех моделей
-models_to_watch = []
+def connect_model_signals(model):
+    """Подписывает модель на сброс кеша при сохранении и удалении"""
+    dispatch_uid = f'items_count_{model._meta.label_lower}'
+    post_save.connect(clear_related_cache, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(clear_related_cache, sender=model, dispatch_uid=dispatch_uid)
 
-try:
-    models_to_watch = [
-        Specialist, Image, Service, JobTitle, Good
-    ]
-except NameError:
-    pass
 
-for model in models_to_watch:
-    post_save.connect(clear_related_cache, sender=model)
-    post_delete.connect(clear_related_cache, sender=model)
+def connect_signals():
+    """Регистрирует сигналы для всех моделей из ENDPOINT_MODEL_MAPPING"""
+    for endpoint in ItemCountService.get_available_endpoints():
+        model = ItemCountService.get_model_from_endpoint(endpoint)
+        if model:
+            connect_model_signals(model)
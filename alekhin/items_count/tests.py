@@ -1,3 +1,108 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from goods.models import Good
+from news.models import News
+from specialists.models import Specialist
+from .services import ItemCountService
+from .utils import CachedItemCountService
 
-# Create your tests here.
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'items-count-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedItemCountServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Good.objects.create(name="Бандаж", service_direction=1, price=500)
+        News.objects.create(title="Варикоз", text="Лечение вен")
+
+    def get_count(self, endpoint):
+        return CachedItemCountService.get_count_for_endpoint(endpoint)['count']
+
+    def test_counts_are_served_from_cache(self):
+        """Тест: повторный подсчет не обращается к базе"""
+        self.assertEqual(self.get_count('/goods/'), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_count('/goods/'), 1)
+
+    def test_write_invalidates_only_its_model(self):
+        """Тест: запись товара сбрасывает только счетчик товаров"""
+        self.get_count('/goods/')
+        self.get_count('/news/')
+
+        Good.objects.create(name="Чулки", service_direction=1, price=3000)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_count('/news/'), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_count('/goods/'), 2)
+
+    def test_delete_invalidates_count(self):
+        """Тест: удаление записи сбрасывает счетчик"""
+        self.get_count('/news/')
+        News.objects.all().delete()
+        self.assertEqual(self.get_count('/news/'), 0)
+
+    def test_clear_cache_keeps_foreign_keys(self):
+        """Тест: сброс пространства items_count не затрагивает чужие ключи кеша"""
+        cache.set('other:key', 'value')
+        self.get_count('/news/')
+
+        CachedItemCountService.clear_cache()
+
+        self.assertEqual(cache.get('other:key'), 'value')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_count('/news/'), 1)
+
+
+class ItemCountServiceBatchTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(email='staff@example.com', password='testpass123')
+        Good.objects.create(name="Бандаж", service_direction=1, price=500)
+        Good.objects.create(name="Чулки", service_direction=1, price=3000, enabled=False)
+        Specialist.objects.create(name="Иванова Анна", image="images/a.webp", is_reliable=True)
+        Specialist.objects.create(name="Петров Иван", image="images/b.webp")
+
+    def test_all_counts_in_one_query(self):
+        """Тест: все количества считаются одним SQL-запросом"""
+        with self.assertNumQueries(1):
+            counts = ItemCountService.get_all_counts()
+        self.assertEqual(set(counts), set(ItemCountService.get_available_endpoints()))
+        self.assertTrue(all(result['error'] is None for result in counts.values()))
+
+    def test_anonymous_filters_applied(self):
+        """Тест: для анонимного пользователя учитываются enabled и is_reliable"""
+        anonymous = ItemCountService.get_counts(['/goods/', '/specialists/'])
+        staff = ItemCountService.get_counts(['/goods/', '/specialists/'], self.staff)
+
+        self.assertEqual(anonymous['/goods/']['count'], 1)
+        self.assertEqual(anonymous['/specialists/']['count'], 1)
+        self.assertEqual(staff['/goods/']['count'], 2)
+        self.assertEqual(staff['/specialists/']['count'], 2)
+
+    def test_estimate_mode(self):
+        """Тест: оценка по reltuples только для нефильтрованных выборок"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Good._meta.db_table}')
+
+        staff = ItemCountService.get_counts(['/goods/'], self.staff, estimate_threshold=0)
+        anonymous = ItemCountService.get_counts(['/goods/'], estimate_threshold=0)
+
+        self.assertTrue(staff['/goods/']['estimated'])
+        self.assertFalse(anonymous['/goods/']['estimated'])
+        self.assertEqual(anonymous['/goods/']['count'], 1)
+
+    def test_unknown_endpoint(self):
+        """Тест: неизвестный эндпойнт возвращает ошибку, не ломая остальные"""
+        counts = ItemCountService.get_counts(['/unknown/', '/goods/'])
+        self.assertIsNotNone(counts['/unknown/']['error'])
+        self.assertEqual(counts['/goods/']['count'], 1)
@@ -1,80 +1,143 @@
 from django.core.cache import cache
 from django.conf import settings
 from .services import ItemCountService
-import json
 
 
 class CachedItemCountService:
-    """Сервис с кешированием для улучшения производительности"""
-    
+    """
+    Сервис с кешированием для улучшения производительности
+
+    Ключи раздельные для каждого эндпойнта и аудитории (anonymous/staff):
+    количество зависит только от того, аутентифицирован ли пользователь.
+
+    Инвалидация через счетчики поколений: в ключ входит поколение всего
+    пространства items_count и поколение эндпойнта. Сброс - это инкремент
+    счетчика, старые записи больше не читаются и истекают по таймауту.
+    Ни cache.clear(), ни KEYS/SCAN не нужны, чужие ключи в Redis не трогаются.
+    Кеш модели сбрасывается сигналами post_save/post_delete (см. signals.py).
+    """
+
     CACHE_TIMEOUT = getattr(settings, 'ITEMS_COUNT_CACHE_TIMEOUT', 300)  # 5 минут
     CACHE_KEY_PREFIX = 'items_count'
-    
+    AUDIENCES = ('anonymous', 'staff')
+    NAMESPACE_GENERATION_KEY = f'{CACHE_KEY_PREFIX}:generation'
+
+    @classmethod
+    def get_audience(cls, user):
+        """Аудитория, для которой считается количество"""
+        return 'staff' if user and user.is_authenticated else 'anonymous'
+
+    @classmethod
+    def get_generation_key(cls, endpoint):
+        """Ключ счетчика поколений эндпойнта"""
+        return f"{cls.CACHE_KEY_PREFIX}:generation:{endpoint}"
+
+    @classmethod
+    def get_generations(cls, endpoints):
+        """Текущие поколения пространства и эндпойнтов за один get_many"""
+        keys = [cls.NAMESPACE_GENERATION_KEY] + [cls.get_generation_key(endpoint) for endpoint in endpoints]
+        values = cache.get_many(keys)
+        namespace = values.get(cls.NAMESPACE_GENERATION_KEY, 1)
+        return namespace, {
+            endpoint: values.get(cls.get_generation_key(endpoint), 1)
+            for endpoint in endpoints
+        }
+
     @classmethod
-    def get_cache_key(cls, endpoint, user_id=None):
+    def bump_generation(cls, key):
+        """Увеличивает счетчик поколений; счетчики хранятся без таймаута"""
+        cache.add(key, 1, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Ключ вытеснен между add и incr - начинаем новое поколение
+            cache.set(key, 2, timeout=None)
+
+    @classmethod
+    def get_cache_key(cls, endpoint, audience, namespace=1, generation=1):
         """Генерирует ключ кеша"""
-        user_suffix = f"_user_{user_id}" if user_id else "_anonymous"
-        return f"{cls.CACHE_KEY_PREFIX}_{endpoint.replace('/', '_')}{user_suffix}"
-    
+        return f"{cls.CACHE_KEY_PREFIX}:{namespace}:{endpoint}:{generation}:{audience}"
+
     @classmethod
     def get_count_for_endpoint(cls, endpoint, user=None):
-        """Получает количество с кешированием"""
-        cache_key = cls.get_cache_key(endpoint, user.id if user else None)
-        
-        # Пытаемся получить из кеша
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            return json.loads(cached_result)
-        
-        # Если нет в кеше, получаем из сервиса
-        result = ItemCountService.get_count_for_endpoint(endpoint, user)
-        
-        # Кешируем результат
-        cache.set(cache_key, json.dumps(result), cls.CACHE_TIMEOUT)
-        
-        return result
-    
+        """
+        Получает количество с кешированием
+
+        При промахе тем же запросом досчитываются все эндпойнты аудитории,
+        поэтому следующие вызовы для других моделей попадают в кеш
+        """
+        endpoints = ItemCountService.get_available_endpoints()
+        if endpoint not in endpoints:
+            endpoints.append(endpoint)
+        return cls.get_counts(endpoints, user)[endpoint]
+
     @classmethod
     def get_all_counts(cls, user=None):
         """Получает все количества с кешированием"""
-        cache_key = f"{cls.CACHE_KEY_PREFIX}_all_user_{user.id if user else 'anonymous'}"
-        
-        # Пытаемся получить из кеша
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            return json.loads(cached_result)
-        
-        # Если нет в кеше, получаем из сервиса
-        result = ItemCountService.get_all_counts(user)
-        
-        # Кешируем результат
-        cache.set(cache_key, json.dumps(result), cls.CACHE_TIMEOUT)
-        
-        return result
-    
+        return cls.get_counts(ItemCountService.get_available_endpoints(), user)
+
+    @classmethod
+    def get_counts(cls, endpoints, user=None):
+        """Получает количества для списка эндпойнтов: из кеша одним get_many, недостающие - одним запросом"""
+        audience = cls.get_audience(user)
+        namespace, generations = cls.get_generations(endpoints)
+        keys = {
+            endpoint: cls.get_cache_key(endpoint, audience, namespace, generations[endpoint])
+            for endpoint in endpoints
+        }
+        cached = cache.get_many(keys.values())
+
+        results = {endpoint: cached.get(key) for endpoint, key in keys.items()}
+        missing = [endpoint for endpoint, result in results.items() if result is None]
+        if not missing:
+            return results
+
+        # Все недостающие количества - одним запросом
+        counted = ItemCountService.get_counts(missing, user)
+        results.update(counted)
+        # Ошибки не кешируем, чтобы не закрепить временный сбой
+        cache.set_many({
+            keys[endpoint]: result
+            for endpoint, result in counted.items()
+            if not result['error']
+        }, cls.CACHE_TIMEOUT)
+
+        return results
+
     @classmethod
-    def clear_cache(cls, endpoint=None, user=None):
-        """Очищает кеш"""
+    def get_detailed_stats(cls, user=None):
+        """Получает детальную статистику по закешированным количествам"""
+        return ItemCountService.build_detailed_stats(cls.get_all_counts(user))
+
+    @classmethod
+    def invalidate_model(cls, model):
+        """Сбрасывает кеш эндпойнтов, связанных с моделью, для всех аудиторий"""
+        for endpoint in ItemCountService.get_endpoints_for_model(model):
+            cls.bump_generation(cls.get_generation_key(endpoint))
+
+    @classmethod
+    def clear_cache(cls, endpoint=None):
+        """Очищает кеш эндпойнта или всего пространства items_count"""
         if endpoint:
-            cache_key = cls.get_cache_key(endpoint, user.id if user else None)
-            cache.delete(cache_key)
+            cls.bump_generation(cls.get_generation_key(endpoint))
         else:
-            # Очищаем весь кеш для пользователя
-            cache_pattern = f"{cls.CACHE_KEY_PREFIX}_*_user_{user.id if user else 'anonymous'}"
-            # Примечание: для полной очистки по паттерну нужен Redis или Memcached
-            cache.clear()
+            cls.bump_generation(cls.NAMESPACE_GENERATION_KEY)
 
 
 def register_new_endpoint(endpoint, app_name, model_name):
     """Утилита для регистрации нового эндпойнта"""
+    from .signals import connect_model_signals
+
     ItemCountService.add_endpoint_mapping(endpoint, app_name, model_name)
+    model = ItemCountService.get_model_from_endpoint(endpoint)
+    if model:
+        connect_model_signals(model)
 
 
 def get_quick_stats():
     """Быстрая утилита для получения основной статистики"""
-    service = ItemCountService()
-    stats = service.get_detailed_stats()
-    
+    stats = CachedItemCountService.get_detailed_stats()
+
     return {
         'total_models': stats['summary']['available_models'],
         'total_records': stats['summary']['total_records'],
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .services import ItemCountService
+from .utils import CachedItemCountService
 from .serializers import (
     ItemCountRequestSerializer,
     ItemCountResponseSerializer,
@@ -44,7 +45,7 @@ def items_count(request):
     
     if request.method == 'GET':
         # Получаем количество для всех эндпойнтов
-        results = ItemCountService.get_all_counts(user=request.user)
+        results = CachedItemCountService.get_all_counts(user=request.user)
         
         return Response(results, status=status.HTTP_200_OK)
     
@@ -59,7 +60,7 @@ def items_count(request):
             )
         
         endpoint = serializer.validated_data['endpoint']
-        result = ItemCountService.get_count_for_endpoint(endpoint, user=request.user)
+        result = CachedItemCountService.get_count_for_endpoint(endpoint, user=request.user)
         
         return Response(result, status=status.HTTP_200_OK)
 
@@ -77,7 +78,7 @@ def items_count(request):
 def detailed_stats(request):
     """Получить детальную статистику по всем моделям"""
     
-    stats = ItemCountService.get_detailed_stats(user=request.user)
+    stats = CachedItemCountService.get_detailed_stats(user=request.user)
     
     return Response(stats, status=status.HTTP_200_OK)
 
@@ -116,7 +117,7 @@ def available_endpoints(request):
 @permission_classes([IsAuthenticated])
 def specialists_count(request):
     """Получить количество специалистов"""
-    result = ItemCountService.get_count_for_endpoint('/specialists/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/specialists/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 
@@ -129,7 +130,7 @@ def specialists_count(request):
 @permission_classes([IsAuthenticated])
 def images_count(request):
     """Получить количество изображений"""
-    result = ItemCountService.get_count_for_endpoint('/images/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/images/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 
@@ -142,7 +143,7 @@ def images_count(request):
 @permission_classes([IsAuthenticated])
 def services_count(request):
     """Получить количество услуг"""
-    result = ItemCountService.get_count_for_endpoint('/services/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/services/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 
@@ -155,7 +156,7 @@ def services_count(request):
 @permission_classes([IsAuthenticated])
 def job_titles_count(request):
     """Получить количество должностей"""
-    result = ItemCountService.get_count_for_endpoint('/job_titles/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/job_titles/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 
@@ -168,7 +169,7 @@ def job_titles_count(request):
 @permission_classes([IsAuthenticated])
 def tests_count(request):
     """Получить количество анализов"""
-    result = ItemCountService.get_count_for_endpoint('/tests/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/tests/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 
@@ -181,7 +182,7 @@ def tests_count(request):
 @permission_classes([IsAuthenticated])
 def goods_count(request):
     """Получить количество товаров"""
-    result = ItemCountService.get_count_for_endpoint('/goods/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/goods/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 @swagger_auto_schema(
@@ -193,7 +194,7 @@ def goods_count(request):
 @permission_classes([IsAuthenticated])
 def requests_count(request):
     """Получить количество заявок"""
-    result = ItemCountService.get_count_for_endpoint('/requests/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/requests/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 @swagger_auto_schema(
@@ -205,12 +206,12 @@ def requests_count(request):
 @permission_classes([IsAuthenticated])
 def service_types_count(request):
     """Получить количество типов услуг"""
-    result = ItemCountService.get_count_for_endpoint('/service_types/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/service_types/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def news_count(request):
     """Получить количество новостей"""
-    result = ItemCountService.get_count_for_endpoint('/news/', user=request.user)
+    result = CachedItemCountService.get_count_for_endpoint('/news/', user=request.user)
     return Response(result, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,38 @@
+import core.lookups
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_immutable_unaccent'),
+        ('news', '0002_news_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='news',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('title')),
+                    name='gin_trgm_ops',
+                ),
+                name='news_title_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='news',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('text')),
+                    name='gin_trgm_ops',
+                ),
+                name='news_text_trgm',
+            ),
+        ),
+    ]
@@ -1,13 +1,20 @@
 # alekhin/news/models.py
 from django.db import models
-from django.utils.text import slugify
 from django.core.validators import MinValueValidator
 from django.utils import timezone
-import re
-from unidecode import unidecode
+from django.contrib.postgres.indexes import GinIndex
+from core.indexes import trigram_index
+from core.models import SearchDocumentModel
+from core.slugs import UniqueSlugMixin
 
 
-class News(models.Model):
+class News(UniqueSlugMixin, SearchDocumentModel):
+    SLUG_SOURCE_FIELD = 'title'
+    SEARCH_VECTOR_FIELDS = (
+        ('title', 'A'),
+        ('text', 'B'),
+    )
+
     # Основная информация
     title = models.CharField(max_length=255, verbose_name="Заголовок статьи")
     text = models.TextField(verbose_name="Текст статьи")
@@ -41,23 +48,15 @@ class News(models.Model):
             models.Index(fields=['enabled']),
             models.Index(fields=['slug']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id'], name='news_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='news_search_gin'),
+            trigram_index('title', 'news_title_trgm'),
+            trigram_index('text', 'news_text_trgm'),
         ]
     
     def __str__(self):
         return self.title
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            slug = slugify(unidecode(self.title))
-            slug = re.sub(r'-+', '-', slug)
-            original_slug = slug
-            counter = 1
-            while News.objects.filter(slug=slug).exists():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
-    
     def clean(self):
         from django.core.exceptions import ValidationError
         
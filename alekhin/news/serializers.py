@@ -1,5 +1,7 @@
 # alekhin/news/serializers.py
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
+from images.serializers import ImageMetadataMixin
 from .models import News
 
 
@@ -32,7 +34,9 @@ class NewsCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    image_fields = ('image',)
+
     class Meta:
         model = News
         fields = [
@@ -67,8 +71,10 @@ class NewsUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Упрощенный сериализатор для списка статей"""
+    image_fields = ('image',)
+
     class Meta:
         model = News
         fields = [
@@ -1,3 +1,44 @@
+from io import StringIO
+from django.contrib.postgres.search import SearchQuery
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from core.models import SEARCH_CONFIG
+from .models import News
 
-# Create your tests here.
+
+def matches(query):
+    return SearchQuery(query, config=SEARCH_CONFIG)
+
+
+class NewsSearchVectorTest(TestCase):
+    def test_search_vector_updated_on_save(self):
+        """Тест пересчета поискового документа при сохранении"""
+        news = News.objects.create(title="Варикоз", text="Лечение вен лазером")
+        self.assertTrue(News.objects.filter(pk=news.pk, search_vector=matches('лазер')).exists())
+
+        news.text = "Склеротерапия"
+        news.save()
+        self.assertFalse(News.objects.filter(pk=news.pk, search_vector=matches('лазер')).exists())
+
+    def test_rebuild_search_vectors_command(self):
+        """Тест заполнения поискового документа для существующих записей"""
+        news = News.objects.create(title="Лимфостаз", text="Лимфодренажный массаж")
+        News.objects.update(search_vector=None)
+
+        call_command('rebuild_search_vectors', 'news.News', stdout=StringIO())
+        self.assertTrue(News.objects.filter(pk=news.pk, search_vector=matches('лимфостаз')).exists())
+
+
+class NewsSearchAPITest(APITestCase):
+    def setUp(self):
+        self.veins = News.objects.create(title="Варикозное расширение вен", text="Статья")
+        self.skin = News.objects.create(title="Уход за кожей", text="Статья о пилингах")
+
+    def test_full_text_search_uses_stemming(self):
+        """Тест полнотекстового поиска с учетом словоформ"""
+        response = self.client.get(reverse('news-list'), {'search': 'вены'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.veins.id])
@@ -1,26 +1,26 @@
 # alekhin/news/views.py
-from django.db.models import Q
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters import rest_framework as django_filters
-from rest_framework.pagination import PageNumberPagination
 from .models import News
 from .serializers import (
     NewsCreateSerializer, NewsSerializer, NewsUpdateSerializer, NewsListSerializer
 )
 from .filters import NewsFilter
+from core.mixins import CountedListMixin, ResponseCacheMixin, SparseFieldsetViewMixin
+from core.pagination import CustomPagination
+from core.search import SmartSearch, SearchRankOrderingFilter
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+NEWS_SEARCH = SmartSearch(
+    trigram_fields=['title', 'text'],
+    vector_field='search_vector',
+)
 
 
-class NewsViewSet(viewsets.ModelViewSet):
-    filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'text']
+class NewsViewSet(ResponseCacheMixin, CountedListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    filter_backends = [django_filters.DjangoFilterBackend, SearchRankOrderingFilter]
     filterset_class = NewsFilter
     ordering_fields = ['created_at', 'title', 'time_to_read', 'service_direction']
     ordering = ['-created_at']
@@ -52,49 +52,26 @@ class NewsViewSet(viewsets.ModelViewSet):
         # Smart search
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            search_query = search_query.strip().lower()
-            queryset = queryset.filter(
-                Q(title__unaccent__lower__trigram_similar=search_query) |
-                Q(text__unaccent__lower__trigram_similar=search_query)
-            ).distinct()
+            queryset = NEWS_SEARCH.filter(queryset, search_query)
 
         return queryset
 
     def list(self, request, *args, **kwargs):
         """GET /news - получение списка статей"""
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Фильтр по service_direction
-        service_direction = self.request.query_params.get('service_direction', None)
-        if service_direction:
-            queryset = queryset.filter(service_direction=str(service_direction))
-        
-        # Получаем общее количество статей
-        total_count = queryset.count()
-        enabled_count = queryset.filter(enabled=True).count()
-        
-        # Применяем пагинацию
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-            
-            # Переименовываем поле count в items_count
-            response.data['items_count'] = response.data.pop('count')
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response({
-                'results': serializer.data,
-                'items_count': total_count
-            })
-        
-        # Добавляем счетчики в заголовки
-        response['Total-Count'] = str(total_count)
-        response['Enabled-Count'] = str(enabled_count)
-        response['Access-Control-Expose-Headers'] = 'Total-Count, Enabled-Count'
-        
+        return super().list(request, *args, **kwargs)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # Переименовываем поле count в items_count
+        response.data['items_count'] = response.data.pop('count')
         return response
 
+    def get_unpaginated_response(self, data, counts):
+        return Response({
+            'results': data,
+            'items_count': counts['Total-Count']
+        })
+
     def create(self, request, *args, **kwargs):
         """POST /news - создание статьи (требует токен)"""
         serializer = self.get_serializer(data=request.data)
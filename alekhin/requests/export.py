@@ -0,0 +1,114 @@
+# alekhin/requests/export.py
+"""
+Потоковая выгрузка заявок в CSV и XLSX
+
+Заявки читаются через values_list(...).iterator(chunk_size): Postgres
+отдает их серверным курсором порциями, модели не создаются. CSV
+отдается клиенту по мере чтения, XLSX пишется книгой openpyxl в режиме
+write_only (строки сразу уходят во временный файл) и отдается после
+сборки. Память не зависит от числа заявок.
+"""
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+EXPORT_CHUNK_SIZE = 2000
+# Размер куска при отдаче готового XLSX
+FILE_CHUNK_SIZE = 64 * 1024
+# С этих символов Excel начинает формулу: такие значения экранируются апострофом
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Колонка выгрузки: путь для values_list и заголовок
+EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('created_at', 'Дата создания'),
+    ('name', 'Имя'),
+    ('phone', 'Телефон'),
+    ('email', 'Email'),
+    ('is_service', 'Медицинская услуга'),
+    ('is_goods', 'Товары'),
+    ('is_analysis', 'Анализы'),
+    ('service_name', 'Название услуги'),
+    ('service_direction', 'Направление услуги'),
+    ('service_type', 'Тип услуги'),
+    ('specialist__name', 'Специалист'),
+    ('description', 'Описание'),
+    ('additional_info', 'Дополнительная информация'),
+    ('is_new', 'Новая заявка'),
+]
+
+
+def format_text(value):
+    """
+    Строка без управляющих символов (openpyxl на них падает посреди выгрузки)
+    и без формулы в начале: данные заявок вводят посетители сайта
+    """
+    value = ILLEGAL_CHARACTERS_RE.sub('', value)
+    if value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return 'да' if value else 'нет'
+    if isinstance(value, datetime):
+        # Excel не поддерживает часовые пояса: местное время без смещения
+        return timezone.localtime(value).replace(tzinfo=None, microsecond=0)
+    if isinstance(value, (dict, list)):
+        return format_text(json.dumps(value, ensure_ascii=False)) if value else ''
+    if isinstance(value, str):
+        return format_text(value)
+    if value is None:
+        return ''
+    return value
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки выгрузки из серверного курсора, по chunk_size записей за выборку"""
+    fields = [field for field, _ in EXPORT_COLUMNS]
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield [format_value(value) for value in row]
+
+
+def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """CSV по кускам в chunk_size строк; BOM - чтобы Excel распознал UTF-8"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow([title for _, title in EXPORT_COLUMNS])
+
+    for number, row in enumerate(iter_rows(queryset, chunk_size), start=1):
+        writer.writerow(row)
+        if number % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_xlsx(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """XLSX: книга write_only собирается во временном файле и отдается кусками"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Заявки')
+    sheet.append([title for _, title in EXPORT_COLUMNS])
+    for row in iter_rows(queryset, chunk_size):
+        sheet.append(row)
+
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+        yield from iter(lambda: file.read(FILE_CHUNK_SIZE), b'')
+
+
+# Формат -> (Content-Type, генератор содержимого)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', iter_csv),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', iter_xlsx),
+}
@@ -0,0 +1,89 @@
+import csv
+import io
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from requests.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, iter_rows
+from requests.models import Request
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет потоковую выгрузку заявок (/requests/export) на синтетических данных: '
+        'время до первого куска, скорость и прирост памяти процесса'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Сколько синтетических заявок создать')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Записей за выборку из курсора')
+        parser.add_argument('--file-format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Замерить также выгрузку с чтением всех заявок в память (как до потоковой выгрузки)'
+        )
+        parser.add_argument('--keep', action='store_true', help='Не удалять синтетические заявки после замера')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.create_rows(options['rows'])
+            self.stdout.write(f"Создано заявок: {options['rows']} за {time.perf_counter() - started:.1f} с")
+
+            queryset = Request.objects.order_by('-created_at')
+            _, stream = EXPORT_FORMATS[options['file_format']]
+            self.measure(options['file_format'], stream(queryset, options['chunk_size']))
+            if options['compare']:
+                # Пик RSS не уменьшается, поэтому вариант с памятью замеряется вторым
+                self.measure('в памяти', self.in_memory_csv(queryset))
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def create_rows(self, rows):
+        """Синтетические заявки одним INSERT ... SELECT generate_series"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'''
+                INSERT INTO {Request._meta.db_table} (
+                    name, email, phone, is_service, is_goods, is_analysis, service_name,
+                    service_direction, service_type, additional_info, description, created_at, is_new
+                )
+                SELECT
+                    'Клиент ' || n, 'client' || n || '@example.com', '+7999' || lpad(n::text, 7, '0'),
+                    n % 3 = 0, n % 3 = 1, n % 3 = 2, 'Услуга ' || n % 50,
+                    'Направление ' || n % 10, 'Тип ' || n % 5, jsonb_build_object('source', 'benchmark'),
+                    repeat('Описание заявки ', 5), now() - n * interval '1 second', n % 10 = 0
+                FROM generate_series(1, %s) AS n
+                ''',
+                [rows],
+            )
+
+    def in_memory_csv(self, queryset):
+        rows = list(iter_rows(queryset))
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+    def measure(self, label, chunks):
+        rss_before = self.max_rss()
+        started = time.perf_counter()
+        first_chunk = None
+        size = 0
+        for chunk in chunks:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'{label}: {size / 1024 / 1024:.1f} МБ за {elapsed:.1f} с '
+            f'({size / 1024 / 1024 / elapsed:.1f} МБ/с), первый кусок через {first_chunk * 1000:.0f} мс, '
+            f'прирост пиковой памяти {(self.max_rss() - rss_before) / 1024:.1f} МБ'
+        )
+
+    def max_rss(self):
+        # ru_maxrss в Linux - в килобайтах
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
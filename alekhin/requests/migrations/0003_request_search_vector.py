@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests', '0002_alter_request_email_alter_request_phone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='request',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='requests_search_gin'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+import core.lookups
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_immutable_unaccent'),
+        ('requests', '0003_request_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('email')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_email_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('phone')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_phone_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('service_name')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_svc_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('service_direction')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_svc_dir_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('service_type')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_svc_type_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='request',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('description')),
+                    name='gin_trgm_ops',
+                ),
+                name='requests_descr_trgm',
+            ),
+        ),
+    ]
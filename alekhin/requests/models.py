@@ -1,9 +1,22 @@
 from django.db import models
 from django.core.validators import EmailValidator
+from django.contrib.postgres.indexes import GinIndex
 from specialists.models import Specialist
+from core.indexes import trigram_index
+from core.models import SearchDocumentModel
 
 
-class Request(models.Model):
+class Request(SearchDocumentModel):
+    SEARCH_VECTOR_FIELDS = (
+        ('name', 'A'),
+        ('phone', 'A'),
+        ('email', 'A'),
+        ('service_name', 'B'),
+        ('service_direction', 'C'),
+        ('service_type', 'C'),
+        ('description', 'D'),
+    )
+
     # Основная информация
     name = models.CharField(max_length=255, verbose_name="Имя")
     email = models.EmailField(validators=[EmailValidator()], verbose_name="Email", blank=True)
@@ -38,6 +51,17 @@ class Request(models.Model):
         verbose_name = "Заявка"
         verbose_name_plural = "Заявки"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='requests_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='requests_search_gin'),
+            trigram_index('name', 'requests_name_trgm'),
+            trigram_index('email', 'requests_email_trgm'),
+            trigram_index('phone', 'requests_phone_trgm'),
+            trigram_index('service_name', 'requests_svc_name_trgm'),
+            trigram_index('service_direction', 'requests_svc_dir_trgm'),
+            trigram_index('service_type', 'requests_svc_type_trgm'),
+            trigram_index('description', 'requests_descr_trgm'),
+        ]
     
     def __str__(self):
         return f"Заявка от {self.name} ({self.created_at.strftime('%d.%m.%Y %H:%M')})"
@@ -1,3 +1,150 @@
-from django.test import TestCase
+import csv
+import io
 
-# Create your tests here.
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Request
+
+User = get_user_model()
+
+
+class RequestListAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        Request.objects.create(name="Анна", phone="+79990000001", is_service=True, service_name="Пилинг")
+        Request.objects.create(name="Петр", phone="+79990000002", is_goods=True)
+        Request.objects.create(name="Мария", phone="+79990000003", is_goods=True, is_new=False)
+
+    def get_token(self):
+        """Получение JWT токена для пользователя"""
+        refresh = RefreshToken.for_user(self.user)
+        return str(refresh.access_token)
+
+    def test_list_count_headers(self):
+        """Тест счетчиков Total-Count и New-Count с учетом фильтров"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_token()}')
+        response = self.client.get(reverse('request-list'), {'is_goods': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Total-Count'], '2')
+        self.assertEqual(response['New-Count'], '1')
+        self.assertEqual(response.data['count'], 2)
+
+    def test_list_query_count(self):
+        """Тест: пользователь, один aggregate на все счетчики и выборка страницы"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_token()}')
+        with self.assertNumQueries(3):
+            self.client.get(reverse('request-list'))
+
+    def test_cursor_pagination_walks_all_pages(self):
+        """Тест keyset-пагинации: ?cursor= обходит все заявки без пропусков и повторов"""
+        for index in range(12):
+            Request.objects.create(name=f"Клиент {index}", phone=f"+7999100{index:04d}")
+        expected = list(Request.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_token()}')
+        response = self.client.get(reverse('request-list'), {'cursor': '', 'page_size': 5})
+        self.assertEqual(response['Total-Count'], str(len(expected)))
+        self.assertIsNone(response.data['previous'])
+
+        seen = [item['id'] for item in response.data['results']]
+        pages = [response]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [item['id'] for item in response.data['results']]
+            pages.append(response)
+        self.assertEqual(seen, expected)
+
+        previous = self.client.get(pages[-1].data['previous'])
+        self.assertEqual(previous.data['results'], pages[-2].data['results'])
+
+    def test_invalid_cursor(self):
+        """Тест некорректного курсора"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_token()}')
+        response = self.client.get(reverse('request-list'), {'cursor': 'broken'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RequestExportAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        Request.objects.create(
+            name="Анна", phone="+79990000001", is_service=True, service_name="Пилинг",
+            additional_info={'source': 'site'}
+        )
+        Request.objects.create(name="Петр", phone="+79990000002", is_goods=True)
+        self.url = reverse('request-export')
+
+    def export(self, params=None):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_export_applies_filters(self):
+        """Тест: CSV выгружается потоком с фильтрами списка"""
+        response, content = self.export({'is_service': 'true'})
+
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="requests_', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows[0][:3], ['ID', 'Дата создания', 'Имя'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], "Анна")
+        self.assertIn('"source": "site"', rows[1][-2])
+        self.assertEqual(rows[1][-1], 'да')
+
+    def test_csv_export_reads_in_chunks(self):
+        """Тест: выгрузка читает заявки серверным курсором, а не одним списком"""
+        for index in range(5):
+            Request.objects.create(name=f"Клиент {index}", phone=f"+7999100{index:04d}", is_goods=True)
+
+        with self.assertNumQueries(1):
+            _, content = self.export()
+
+        self.assertEqual(content.decode('utf-8-sig').count('\r\n'), 8)
+
+    def test_xlsx_export(self):
+        """Тест: XLSX выгружается книгой с заголовком и строками заявок"""
+        from openpyxl import load_workbook
+
+        response, content = self.export({'file_format': 'xlsx'})
+
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.openxmlformats'))
+        rows = list(load_workbook(io.BytesIO(content), read_only=True).active.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][2], 'Имя')
+
+    def test_export_escapes_formulas_and_control_characters(self):
+        """Тест: формулы экранируются апострофом, управляющие символы удаляются"""
+        from openpyxl import load_workbook
+
+        Request.objects.create(
+            name="=HYPERLINK(\"http://example.com\")", phone="+79990000003",
+            is_goods=True, description="Текст\x07 с\x1b символами"
+        )
+
+        _, content = self.export({'is_goods': 'true', 'file_format': 'xlsx'})
+
+        rows = list(load_workbook(io.BytesIO(content), read_only=True).active.iter_rows(values_only=True))
+        row = next(row for row in rows if row[2] and 'HYPERLINK' in row[2])
+        self.assertEqual(row[2], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(row[3], "'+79990000003")
+        self.assertEqual(row[12], "Текст с символами")
+
+    def test_unknown_format(self):
+        """Тест: неизвестный формат выгрузки - 400"""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, {'file_format': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_authentication(self):
+        """Тест: выгрузка без токена запрещена"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
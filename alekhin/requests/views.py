@@ -1,28 +1,39 @@
 from django.db.models import Q
-from rest_framework import viewsets, filters, status
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters import rest_framework as django_filters
-from rest_framework.pagination import PageNumberPagination
 from .models import Request
 from .serializers import RequestCreateSerializer, RequestSerializer, RequestUpdateSerializer
 from .filters import RequestFilter
+from .export import EXPORT_FORMATS
+from core.mixins import CountedListMixin
+from core.pagination import CustomPagination
+from core.search import SmartSearch, SearchRankOrderingFilter
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+REQUEST_SEARCH = SmartSearch(
+    trigram_fields=[
+        'name', 'email', 'phone', 'service_name', 'service_direction',
+        'service_type', 'description', 'specialist__name'
+    ],
+    vector_field='search_vector',
+)
 
 
-class RequestViewSet(viewsets.ModelViewSet):
-    filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'email', 'phone', 'service_name', 'description']
+class RequestViewSet(CountedListMixin, viewsets.ModelViewSet):
+    filter_backends = [django_filters.DjangoFilterBackend, SearchRankOrderingFilter]
     filterset_class = RequestFilter
     ordering_fields = ['created_at', 'name', 'is_new']
     ordering = ['-created_at']
     http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     pagination_class = CustomPagination
+    count_headers = {
+        'New-Count': Q(is_new=True),
+    }
 
     def get_permissions(self):
         if self.action == 'create':
@@ -42,16 +53,7 @@ class RequestViewSet(viewsets.ModelViewSet):
         # Smart search
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(
-                Q(name__unaccent__lower__trigram_similar=search_query) |
-                Q(email__unaccent__lower__trigram_similar=search_query) |
-                Q(phone__unaccent__lower__trigram_similar=search_query) |
-                Q(service_name__unaccent__lower__trigram_similar=search_query) |
-                Q(service_direction__unaccent__lower__trigram_similar=search_query) |
-                Q(service_type__unaccent__lower__trigram_similar=search_query) |
-                Q(description__unaccent__lower__trigram_similar=search_query) |
-                Q(specialist__name__unaccent__lower__trigram_similar=search_query)
-            ).distinct()
+            queryset = REQUEST_SEARCH.filter(queryset, search_query)
         return queryset
 
     def list(self, request, *args, **kwargs):
@@ -59,38 +61,7 @@ class RequestViewSet(viewsets.ModelViewSet):
         GET /requests - получение списка заявок с токеном
         Возвращает заявки и добавляет в заголовки общее количество
         """
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Получаем общее количество заявок (до пагинации)
-        total_count = queryset.count()
-        new_count = queryset.filter(is_new=True).count()
-        
-        # Применяем пагинацию если она настроена
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
-        
-        # Добавляем счетчики в заголовки
-        response['Total-Count'] = str(total_count)
-        response['New-Count'] = str(new_count)
-        response['Access-Control-Expose-Headers'] = 'Total-Count, New-Count'
-        service_direction = self.request.query_params.get('service_direction', None)
-        is_service = self.request.query_params.get('is_service', None)
-        is_goods = self.request.query_params.get('is_goods', None)
-        is_analysis = self.request.query_params.get('is_analysis', None)
-        if is_analysis:
-            queryset = queryset.filter(is_analysis=bool(is_analysis))
-        if is_goods:
-            queryset = queryset.filter(is_goods=bool(is_goods))
-        if is_service:
-            queryset = queryset.filter(is_service=bool(is_service))
-        if service_direction:
-            queryset = queryset.filter(service_direction=str(service_direction))
-        return response
+        return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         """
@@ -108,6 +79,26 @@ class RequestViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
 
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        GET /requests/export - выгрузка заявок с фильтрами и поиском списка (требует токен)
+        ?file_format=csv|xlsx (параметр format занят DRF под выбор рендерера)
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {'file_format': [f"Допустимые форматы: {', '.join(EXPORT_FORMATS)}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type, stream = EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        filename = f'requests_{timezone.localdate():%Y%m%d}.{file_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
     def update(self, request, *args, **kwargs):
         """
         PUT/PATCH /requests/{id} - обновление заявки (требует токен)
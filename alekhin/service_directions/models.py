@@ -1,10 +1,10 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.utils.text import slugify
+from core.slugs import UniqueSlugMixin
 
 User = get_user_model()
 
-class ServiceDirection(models.Model):
+class ServiceDirection(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=255, verbose_name="Service Direction Name")
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     types = models.JSONField(default=list, verbose_name="Service Type IDs")
@@ -18,10 +18,3 @@ class ServiceDirection(models.Model):
 
     def __str__(self):
         return self.name
-
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            from django.utils.text import slugify
-            from unidecode import unidecode
-            self.slug = slugify(unidecode(self.name))
-        super().save(*args, **kwargs)
\ No newline at end of file
@@ -1,10 +1,11 @@
 from rest_framework import viewsets, permissions
 from rest_framework.response import Response
+from core.mixins import ConditionalGetMixin
 from .models import ServiceDirection
 from .serializers import ServiceDirectionSerializer
 from django.utils.text import slugify
 
-class ServiceDirectionViewSet(viewsets.ModelViewSet):
+class ServiceDirectionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = ServiceDirection.objects.all()
     serializer_class = ServiceDirectionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
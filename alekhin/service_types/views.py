@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.http import Http404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from core.mixins import ConditionalGetMixin
 from .models import ServiceType
 from .serializers import (
     ServiceTypeSerializer, 
@@ -13,7 +14,7 @@ from .serializers import (
 from .permissions import ServiceTypePermission
 
 
-class ServiceTypeViewSet(viewsets.ModelViewSet):
+class ServiceTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = ServiceType.objects.all()
     permission_classes = [ServiceTypePermission]
     
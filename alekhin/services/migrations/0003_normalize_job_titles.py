@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from core.filters import strip_json_list
+
+
+def normalize_job_titles(apps, schema_editor):
+    """Убирает пробелы по краям ID должностей: элемент " 3" не находится по jsonb @> ни как 3, ни как "3" (типы не меняются)"""
+    Service = apps.get_model('services', 'Service')
+    changed = []
+    for service in Service.objects.only('id', 'job_titles').iterator(chunk_size=500):
+        stripped = strip_json_list(service.job_titles)
+        if stripped != service.job_titles:
+            service.job_titles = stripped
+            changed.append(service)
+    Service.objects.bulk_update(changed, ['job_titles'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_rename_specialists_service_job_titles_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_job_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('services', '0003_normalize_job_titles'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['job_titles'], name='services_job_titles_gin', opclasses=['jsonb_path_ops']
+            ),
+        ),
+    ]
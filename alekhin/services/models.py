@@ -1,9 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
-from django.utils.text import slugify
 from django.utils import timezone
-import re
+from core.slugs import UniqueSlugMixin
 
-class Service(models.Model):
+class Service(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=255)
     price = models.IntegerField(null=True, blank=True)
     main_image = models.TextField()
@@ -25,17 +25,8 @@ class Service(models.Model):
     slug = models.TextField(unique=True)
     created_at = models.DateTimeField(default=timezone.now)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            from django.utils.text import slugify
-            from unidecode import unidecode
-            slug = slugify(unidecode(self.name))
-            slug = re.sub(r'-+', '-', slug)
-            original_slug = slug
-            counter = 1
-            while Service.objects.filter(slug=slug).exists():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
-
+    class Meta:
+        indexes = [
+            # Фильтр ?job_titles= через jsonb @> (core.filters.json_contains_any)
+            GinIndex(fields=['job_titles'], opclasses=['jsonb_path_ops'], name='services_job_titles_gin'),
+        ]
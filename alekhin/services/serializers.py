@@ -1,7 +1,11 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
+from images.serializers import ImageMetadataMixin
 from .models import *
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    image_fields = ('main_image',)
+    image_list_fields = ('images', 'serts')
 
     class Meta:
         model = Service
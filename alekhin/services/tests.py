@@ -1,3 +1,53 @@
-from django.test import TestCase
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Service
+
+
+class ServiceJobTitlesFilterAPITest(APITestCase):
+    def setUp(self):
+        self.first = Service.objects.create(
+            name="Склеротерапия", main_image="images/a.webp", procedure_number=1, job_titles=[1, 3]
+        )
+        self.twelfth = Service.objects.create(
+            name="Лазерная коагуляция", main_image="images/b.webp", procedure_number=1, job_titles=[12]
+        )
+        self.legacy = Service.objects.create(
+            name="УЗИ вен", main_image="images/c.webp", procedure_number=1, job_titles=["3"]
+        )
+
+    def get_ids(self, job_titles):
+        response = self.client.get(reverse('service-list'), {'job_titles': job_titles})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id'] for item in response.data['results']}
+
+    def test_exact_membership(self):
+        """Тест: ?job_titles=1 не находит услугу с должностью 12"""
+        self.assertEqual(self.get_ids('1'), {self.first.id})
+
+    def test_multiple_values(self):
+        """Тест: ?job_titles=1,12 - услуги с любой из должностей"""
+        self.assertEqual(self.get_ids('1,12/'), {self.first.id, self.twelfth.id})
+
+    def test_string_ids_found_and_returned_unchanged(self):
+        """Тест: строковые ID находятся фильтром, а в ответе остаются строками"""
+        self.assertEqual(self.get_ids('3'), {self.first.id, self.legacy.id})
+
+        response = self.client.get(reverse('service-detail', kwargs={'slug': self.legacy.slug}))
+        self.assertEqual(response.data['job_titles'], ["3"])
+
+    def test_migration_strips_whitespace(self):
+        """Тест: миграция убирает пробелы по краям ID, не меняя их тип"""
+        padded = Service.objects.create(
+            name="Флебография", main_image="images/d.webp", procedure_number=1, job_titles=["3 ", 12]
+        )
+        self.assertNotIn(padded.id, self.get_ids('3'))
+
+        import_module('services.migrations.0003_normalize_job_titles').normalize_job_titles(apps, None)
+
+        padded.refresh_from_db()
+        self.assertEqual(padded.job_titles, ["3", 12])
+        self.assertIn(padded.id, self.get_ids('3'))
@@ -10,16 +10,13 @@ from django_filters import rest_framework as django_filters
 from .serializers import *
 from .filters import ServiceFilter
 from django.db.models import Q
-from rest_framework.pagination import PageNumberPagination
 from .models import Service
+from core.filters import json_contains_any, parse_list_param
+from core.mixins import ResponseCacheMixin, SparseFieldsetViewMixin
+from core.pagination import CustomPagination
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ResponseCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Service.objects.all().order_by('-created_at')
     serializer_class = ServiceSerializer
     filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter]
@@ -39,9 +36,9 @@ class ServiceViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         
         # Остальные фильтры
-        job_titles = self.request.query_params.get('job_titles', None)
+        job_titles = parse_list_param(self.request.query_params.get('job_titles', ''))
         if job_titles:
-            queryset = queryset.filter(job_titles__icontains=job_titles.rstrip('/'))
+            queryset = queryset.filter(json_contains_any('job_titles', job_titles))
             
         service_type = self.request.query_params.get('service_type', None)
         if service_type:
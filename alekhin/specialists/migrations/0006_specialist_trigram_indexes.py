@@ -0,0 +1,28 @@
+import core.lookups
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_immutable_unaccent'),
+        ('specialists', '0005_alter_specialist_options_alter_specialist_biography_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='specialist',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='specialists_name_trgm',
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from core.filters import strip_json_list
+
+
+def normalize_directions(apps, schema_editor):
+    """Убирает пробелы по краям направлений: элемент " 3" не находится по jsonb @> ни как 3, ни как "3" (типы не меняются)"""
+    Specialist = apps.get_model('specialists', 'Specialist')
+    changed = []
+    for specialist in Specialist.objects.only('id', 'directions').iterator(chunk_size=500):
+        stripped = strip_json_list(specialist.directions)
+        if stripped != specialist.directions:
+            specialist.directions = stripped
+            changed.append(specialist)
+    Specialist.objects.bulk_update(changed, ['directions'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('specialists', '0006_specialist_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_directions, migrations.RunPython.noop),
+    ]
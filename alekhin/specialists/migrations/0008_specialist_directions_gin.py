@@ -0,0 +1,21 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('specialists', '0007_normalize_directions'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='specialist',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['directions'], name='specialists_directions_gin', opclasses=['jsonb_path_ops']
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 # alekhin/specialists/models.py
 # Исправленная модель Specialist
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from core.indexes import trigram_index
 
 class Specialist(models.Model):
     # ОБЯЗАТЕЛЬНЫЕ ПОЛЯ
@@ -21,6 +23,11 @@ class Specialist(models.Model):
         verbose_name = "Специалист"
         verbose_name_plural = "Специалисты"
         ordering = ['name']
+        indexes = [
+            trigram_index('name', 'specialists_name_trgm'),
+            # Фильтр ?direction= через jsonb @> (core.filters.json_contains_any)
+            GinIndex(fields=['directions'], opclasses=['jsonb_path_ops'], name='specialists_directions_gin'),
+        ]
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
@@ -2,6 +2,8 @@
 # Обновленный сериализатор для модели Specialist
 
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
+from images.serializers import ImageMetadataMixin
 from .models import Specialist
 
 
@@ -34,8 +36,10 @@ class SpecialistCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class SpecialistSerializer(serializers.ModelSerializer):
+class SpecialistSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Основной сериализатор для специалиста"""
+    image_fields = ('image',)
+    image_list_fields = ('serts',)
     
     class Meta:
         model = Specialist
@@ -72,8 +76,9 @@ class SpecialistUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class SpecialistListSerializer(serializers.ModelSerializer):
+class SpecialistListSerializer(ImageMetadataMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Упрощенный сериализатор для списка специалистов"""
+    image_fields = ('image',)
     
     class Meta:
         model = Specialist
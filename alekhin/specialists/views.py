@@ -3,10 +3,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from core.filters import json_contains_any, parse_list_param
+from core.mixins import ResponseCacheMixin, SparseFieldsetViewMixin
 from .models import Specialist
 from .serializers import SpecialistSerializer
 
-class SpecialistViewSet(viewsets.ModelViewSet):
+class SpecialistViewSet(ResponseCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Specialist.objects.all()
     serializer_class = SpecialistSerializer
     filter_backends = [filters.SearchFilter]
@@ -21,8 +23,8 @@ class SpecialistViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         
-        directions = self.request.query_params.get('direction', None)
+        directions = parse_list_param(self.request.query_params.get('direction', ''))
 
         if directions:
-            queryset = queryset.filter(directions__icontains=directions.rstrip('/'))
-        return queryset.distinct()
\ No newline at end of file
+            queryset = queryset.filter(json_contains_any('directions', directions))
+        return queryset
\ No newline at end of file
@@ -0,0 +1,312 @@
+# alekhin/tests/importer.py
+"""
+Импорт прайс-листа анализов (CSV/XLSX) с upsert по номенклатуре
+
+Файл читается потоком и проверяется пачками по chunk_size строк,
+проверенные строки пишутся через COPY во временную таблицу. Затем
+в той же транзакции под блокировкой таблицы анализов выполняются три
+запроса: UPDATE ... FROM для изменившихся строк, INSERT ... SELECT для
+новых и пересчет поисковых документов. Сигналы post_save не вызываются,
+кеши сбрасываются явно.
+
+Пустая ячейка означает "не менять поле": для существующих анализов
+обновляются только заполненные значения. Повторы номенклатуры в файле
+сводятся в одну строку так же: последнее заполненное значение побеждает.
+"""
+import codecs
+import csv
+import io
+import time
+
+from django.db import connection, transaction
+from rest_framework.exceptions import ValidationError
+
+from core.slugs import allocate_slugs, build_base_slug
+from core.versions import bump_model_version
+from items_count.utils import CachedItemCountService
+from .models import Test
+from .serializers import TestImportRowSerializer
+
+STAGING_TABLE = 'tests_import_staging'
+SLUGS_TABLE = 'tests_import_slugs'
+
+# Колонки временной таблицы: поле модели и тип в ней
+STAGING_COLUMNS = [
+    ('nomenclature', 'varchar(255)'),
+    ('name', 'varchar(255)'),
+    ('service_direction', 'integer'),
+    ('price', 'integer'),
+    ('method', 'text'),
+    ('time', 'varchar(255)'),
+    ('characteristic', 'text'),
+    ('rules', 'text'),
+    ('readings', 'text'),
+    ('contraindications', 'text'),
+    ('depends_to', 'text'),
+    ('enabled', 'boolean'),
+]
+IMPORT_FIELDS = [name for name, _ in STAGING_COLUMNS]
+# Без них новый анализ не создать
+REQUIRED_FOR_NEW = ('name', 'service_direction', 'price')
+# Значения по умолчанию для новых анализов, если в файле поле пустое
+INSERT_DEFAULTS = {
+    'method': "''", 'time': "''", 'characteristic': "''", 'rules': "''",
+    'readings': "''", 'contraindications': "''", 'depends_to': "''", 'enabled': 'true',
+}
+MAX_ERROR_DETAILS = 100
+
+
+class TestImportError(ValueError):
+    """Файл целиком не может быть импортирован (формат, заголовок)"""
+
+
+def get_header_map():
+    """Заголовок колонки -> поле: подходит имя поля или verbose_name модели"""
+    mapping = {}
+    for name in IMPORT_FIELDS:
+        field = Test._meta.get_field(name)
+        mapping[name] = name
+        mapping[str(field.verbose_name).lower()] = name
+    return mapping
+
+
+def map_header(header):
+    mapping = get_header_map()
+    fields = [mapping.get(str(title or '').strip().lower()) for title in header]
+    if 'nomenclature' not in fields:
+        raise TestImportError('В заголовке нет колонки nomenclature (Номенклатура)')
+    return fields
+
+
+def iter_csv(file):
+    """Строки CSV по одной; кодировка (UTF-8 или CP1251) и разделитель определяются по началу файла"""
+    sample = file.read(64 * 1024)
+    if isinstance(sample, str):
+        sample = sample.encode()
+    file.seek(0)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        encoding = 'cp1251'
+
+    text = io.TextIOWrapper(file, encoding=encoding, newline='')
+    try:
+        dialect = csv.Sniffer().sniff(sample.decode(encoding, errors='ignore'), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.reader(text, dialect)
+
+
+def iter_xlsx(file):
+    """Строки первого листа XLSX в режиме read_only - без загрузки книги в память"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise TestImportError('Для импорта XLSX нужен пакет openpyxl')
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file, filename):
+    """
+    Генератор (номер строки, {поле: значение}) без пустых ячеек.
+    Формат определяется по расширению файла
+    """
+    name = filename.lower()
+    if name.endswith('.csv'):
+        rows = iter_csv(file)
+    elif name.endswith('.xlsx'):
+        rows = iter_xlsx(file)
+    else:
+        raise TestImportError('Поддерживаются файлы .csv и .xlsx')
+
+    header = next(rows, None)
+    if header is None:
+        raise TestImportError('Файл пуст')
+    fields = map_header(header)
+
+    for line, values in enumerate(rows, start=2):
+        row = {}
+        for field, value in zip(fields, values):
+            if field is None or value is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if not value:
+                    continue
+            elif isinstance(value, float) and value.is_integer():
+                # openpyxl читает числовые ячейки как float: 12345 -> 12345.0
+                value = int(value)
+            row[field] = value
+        if row:
+            yield line, row
+
+
+class TestImporter:
+    def __init__(self, chunk_size=1000, defaults=None, dry_run=False):
+        self.chunk_size = chunk_size
+        # Значения для пустых ячеек новых анализов, например service_direction
+        self.defaults = defaults or {}
+        self.dry_run = dry_run
+        self.serializer = TestImportRowSerializer()
+        # Номенклатуры, уже записанные во временную таблицу: повтор новой
+        # номенклатуры в следующих пачках - изменение, а не новый анализ
+        self.staged_nomenclatures = set()
+        self.report = {
+            'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+            'duplicates': 0, 'errors': 0, 'error_details': [],
+        }
+
+    def run(self, rows):
+        started = time.perf_counter()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                self.create_staging_table(cursor)
+                chunk = []
+                for line, row in rows:
+                    chunk.append((line, row))
+                    if len(chunk) >= self.chunk_size:
+                        self.stage_chunk(cursor, chunk)
+                        chunk = []
+                if chunk:
+                    self.stage_chunk(cursor, chunk)
+                self.merge(cursor)
+            if self.dry_run:
+                transaction.set_rollback(True)
+
+        if not self.dry_run and (self.report['inserted'] or self.report['updated']):
+            bump_model_version(Test)
+            CachedItemCountService.invalidate_model(Test)
+
+        elapsed = time.perf_counter() - started
+        self.report['seconds'] = round(elapsed, 3)
+        self.report['rows_per_second'] = round(self.report['rows'] / elapsed) if elapsed else None
+        return self.report
+
+    def add_error(self, line, errors):
+        self.report['errors'] += 1
+        if len(self.report['error_details']) < MAX_ERROR_DETAILS:
+            self.report['error_details'].append({'line': line, 'errors': errors})
+
+    def create_staging_table(self, cursor):
+        columns = ', '.join(f'{name} {sql_type}' for name, sql_type in STAGING_COLUMNS)
+        cursor.execute(
+            f'CREATE TEMP TABLE {STAGING_TABLE} (line integer, {columns}, slug varchar(255)) ON COMMIT DROP'
+        )
+
+    def stage_chunk(self, cursor, chunk):
+        """Проверяет пачку строк и пишет прошедшие проверку во временную таблицу"""
+        self.report['rows'] += len(chunk)
+        valid = []
+        for line, row in chunk:
+            try:
+                valid.append((line, self.serializer.run_validation(row)))
+            except ValidationError as e:
+                self.add_error(line, e.detail)
+
+        # Для новых анализов нужны обязательные поля - одним запросом узнаем, какие из них новые
+        existing = set(
+            Test.objects.filter(nomenclature__in={data['nomenclature'] for _, data in valid})
+            .values_list('nomenclature', flat=True)
+        )
+        staged = []
+        for line, data in valid:
+            if data['nomenclature'] not in existing and data['nomenclature'] not in self.staged_nomenclatures:
+                data = {**self.defaults, **data}
+                missing = [field for field in REQUIRED_FOR_NEW if data.get(field) is None]
+                if missing:
+                    self.add_error(line, {field: ['Обязательно для нового анализа'] for field in missing})
+                    continue
+            staged.append((line, *(data.get(field) for field in IMPORT_FIELDS)))
+            self.staged_nomenclatures.add(data['nomenclature'])
+
+        columns = ', '.join(['line', *IMPORT_FIELDS])
+        with cursor.copy(f'COPY {STAGING_TABLE} ({columns}) FROM STDIN') as copy:
+            for row in staged:
+                copy.write_row(row)
+
+    def merge(self, cursor):
+        table = Test._meta.db_table
+        # Параллельные записи ждут окончания импорта, чтение не блокируется
+        cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+
+        # Повторы номенклатуры в файле сводятся в последнюю строку: как и для
+        # анализов в таблице, пустая ячейка не затирает значение из предыдущих строк
+        latest = ', '.join(
+            f'(array_agg({field} ORDER BY line DESC) FILTER (WHERE {field} IS NOT NULL))[1] AS {field}'
+            for field in IMPORT_FIELDS[1:]
+        )
+        assignments = ', '.join(f'{field} = m.{field}' for field in IMPORT_FIELDS[1:])
+        cursor.execute(
+            f'UPDATE {STAGING_TABLE} s SET {assignments} FROM ('
+            f'SELECT nomenclature, max(line) AS line, {latest} FROM {STAGING_TABLE} '
+            f'GROUP BY nomenclature HAVING count(*) > 1'
+            f') m WHERE s.nomenclature = m.nomenclature AND s.line = m.line'
+        )
+        cursor.execute(
+            f'DELETE FROM {STAGING_TABLE} a USING {STAGING_TABLE} b '
+            f'WHERE a.nomenclature = b.nomenclature AND a.line < b.line'
+        )
+        self.report['duplicates'] = cursor.rowcount
+        cursor.execute(f'ANALYZE {STAGING_TABLE}')
+
+        cursor.execute(
+            f'SELECT count(*) FROM {STAGING_TABLE} s '
+            f'WHERE EXISTS (SELECT 1 FROM {table} t WHERE t.nomenclature = s.nomenclature)'
+        )
+        matched = cursor.fetchone()[0]
+
+        new_values = [f'COALESCE(s.{field}, t.{field})' for field in IMPORT_FIELDS[1:]]
+        old_values = [f't.{field}' for field in IMPORT_FIELDS[1:]]
+        assignments = ', '.join(f'{field} = {value}' for field, value in zip(IMPORT_FIELDS[1:], new_values))
+        cursor.execute(
+            f'UPDATE {table} t SET {assignments}, updated_at = now() '
+            f'FROM {STAGING_TABLE} s WHERE t.nomenclature = s.nomenclature '
+            f'AND ({", ".join(new_values)}) IS DISTINCT FROM ({", ".join(old_values)}) '
+            f'RETURNING t.id'
+        )
+        updated_ids = [row[0] for row in cursor.fetchall()]
+
+        self.allocate_slugs(cursor, table)
+        values = [
+            f'COALESCE(s.{field}, {INSERT_DEFAULTS[field]})' if field in INSERT_DEFAULTS else f's.{field}'
+            for field in IMPORT_FIELDS
+        ]
+        cursor.execute(
+            f'INSERT INTO {table} ({", ".join(IMPORT_FIELDS)}, slug, created_at, updated_at) '
+            f'SELECT {", ".join(values)}, s.slug, now(), now() FROM {STAGING_TABLE} s '
+            f'WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.nomenclature = s.nomenclature) '
+            f'RETURNING id'
+        )
+        inserted_ids = [row[0] for row in cursor.fetchall()]
+
+        Test.objects.filter(pk__in=updated_ids + inserted_ids).update_search_vector()
+        self.report['updated'] = len(updated_ids)
+        self.report['unchanged'] = max(matched - len(updated_ids), 0)
+        self.report['inserted'] = len(inserted_ids)
+
+    def allocate_slugs(self, cursor, table):
+        """Slug для всех новых анализов одним запросом (core.slugs) и COPY обратно во временную таблицу"""
+        cursor.execute(
+            f'SELECT nomenclature, name FROM {STAGING_TABLE} s '
+            f'WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.nomenclature = s.nomenclature)'
+        )
+        new_rows = cursor.fetchall()
+        if not new_rows:
+            return
+
+        max_length = Test._meta.get_field('slug').max_length
+        slugs = allocate_slugs(Test, [build_base_slug(name, max_length, 'test') for _, name in new_rows])
+
+        cursor.execute(f'CREATE TEMP TABLE {SLUGS_TABLE} (nomenclature varchar(255), slug varchar(255)) ON COMMIT DROP')
+        with cursor.copy(f'COPY {SLUGS_TABLE} (nomenclature, slug) FROM STDIN') as copy:
+            for (nomenclature, _), slug in zip(new_rows, slugs):
+                copy.write_row((nomenclature, slug))
+        cursor.execute(
+            f'UPDATE {STAGING_TABLE} s SET slug = n.slug FROM {SLUGS_TABLE} n WHERE n.nomenclature = s.nomenclature'
+        )
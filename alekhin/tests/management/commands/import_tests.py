@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tests.importer import TestImporter, TestImportError, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует прайс-лист анализов из CSV или XLSX: существующие анализы '
+        'обновляются по номенклатуре, новые создаются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу .csv или .xlsx')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Строк в одной пачке проверки и COPY')
+        parser.add_argument(
+            '--service-direction', type=int,
+            help='ID направления услуги для новых анализов, если в файле колонка пуста'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Проверить и посчитать изменения без записи')
+
+    def handle(self, *args, **options):
+        defaults = {}
+        if options['service_direction']:
+            defaults['service_direction'] = options['service_direction']
+        importer = TestImporter(
+            chunk_size=options['chunk_size'], defaults=defaults, dry_run=options['dry_run']
+        )
+
+        try:
+            with open(options['path'], 'rb') as file:
+                report = importer.run(read_rows(file, options['path']))
+        except (OSError, TestImportError) as e:
+            raise CommandError(str(e))
+
+        for line in report.pop('error_details'):
+            self.stderr.write(f"строка {line['line']}: {json.dumps(line['errors'], ensure_ascii=False)}")
+        self.stdout.write(
+            f"Строк: {report['rows']}, добавлено: {report['inserted']}, обновлено: {report['updated']}, "
+            f"без изменений: {report['unchanged']}, повторов: {report['duplicates']}, ошибок: {report['errors']}"
+        )
+        message = f"{report['seconds']} с, {report['rows_per_second']} строк/с"
+        if options['dry_run']:
+            message += ' (dry run, изменения отменены)'
+        self.stdout.write(self.style.SUCCESS(message))
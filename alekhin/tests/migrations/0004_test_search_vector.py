@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0003_merge_20250606_2045'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tests_search_gin'),
+        ),
+    ]
@@ -0,0 +1,98 @@
+import core.lookups
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_immutable_unaccent'),
+        ('tests', '0004_test_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('nomenclature')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_nomencl_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('method')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_method_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('characteristic')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_charact_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('rules')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_rules_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('readings')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_readings_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('contraindications')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_contra_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower(core.lookups.ImmutableUnaccent('depends_to')),
+                    name='gin_trgm_ops',
+                ),
+                name='tests_depends_trgm',
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tests', '0006_test_created_id_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='test',
+            index=models.Index(fields=['nomenclature'], name='tests_nomenclature_idx'),
+        ),
+    ]
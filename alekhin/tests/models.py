@@ -1,12 +1,23 @@
 from django.db import models
-from django.utils.text import slugify
 from django.core.validators import MinValueValidator
 import uuid
-from django.utils.text import slugify
-import re
-from unidecode import unidecode
+from django.contrib.postgres.indexes import GinIndex
+from core.indexes import trigram_index
+from core.models import SearchDocumentModel
+from core.slugs import UniqueSlugMixin
+
+class Test(UniqueSlugMixin, SearchDocumentModel):
+    SEARCH_VECTOR_FIELDS = (
+        ('name', 'A'),
+        ('nomenclature', 'A'),
+        ('method', 'B'),
+        ('characteristic', 'C'),
+        ('readings', 'C'),
+        ('rules', 'D'),
+        ('contraindications', 'D'),
+        ('depends_to', 'D'),
+    )
 
-class Test(models.Model):
     # Основная информация
     name = models.CharField(max_length=255, verbose_name="Название анализа")
     service_direction = models.PositiveIntegerField(verbose_name="ID направления услуги")
@@ -44,18 +55,22 @@ class Test(models.Model):
             models.Index(fields=['service_direction']),
             models.Index(fields=['enabled']),
             models.Index(fields=['slug']),
+            models.Index(fields=['created_at', 'id'], name='tests_created_id_idx'),
+            models.Index(fields=['nomenclature'], name='tests_nomenclature_idx'),
+            GinIndex(fields=['search_vector'], name='tests_search_gin'),
+            trigram_index('name', 'tests_name_trgm'),
+            trigram_index('nomenclature', 'tests_nomencl_trgm'),
+            trigram_index('method', 'tests_method_trgm'),
+            trigram_index('characteristic', 'tests_charact_trgm'),
+            trigram_index('rules', 'tests_rules_trgm'),
+            trigram_index('readings', 'tests_readings_trgm'),
+            trigram_index('contraindications', 'tests_contra_trgm'),
+            trigram_index('depends_to', 'tests_depends_trgm'),
         ]
     
     def __str__(self):
         return self.name
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            from django.utils.text import slugify
-            from unidecode import unidecode
-            self.slug = slugify(unidecode(self.name))
-        super().save(*args, **kwargs)
-
     
     def clean(self):
         from django.core.exceptions import ValidationError
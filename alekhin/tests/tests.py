@@ -1,3 +1,172 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from openpyxl import Workbook
+from rest_framework.test import APITestCase
+
+from .importer import TestImporter, TestImportError, read_rows
+from .models import Test
+
+
+def csv_file(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+def xlsx_file(rows):
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+class TestImporterTest(APITestCase):
+    def setUp(self):
+        self.existing = Test.objects.create(
+            name="Общий анализ крови", service_direction=1, price=500, nomenclature="A01"
+        )
+        self.unchanged = Test.objects.create(
+            name="Глюкоза", service_direction=1, price=300, nomenclature="A02"
+        )
+
+    def run_import(self, text, **kwargs):
+        return TestImporter(chunk_size=2, **kwargs).run(read_rows(csv_file(text), 'price.csv'))
+
+    def test_upsert_by_nomenclature(self):
+        """Тест: существующие анализы обновляются по номенклатуре, новые создаются"""
+        report = self.run_import(
+            "nomenclature;name;service_direction;price\n"
+            "A01;;;650\n"
+            "A02;Глюкоза;1;300\n"
+            "B01;Ферритин;2;900\n"
+        )
+
+        self.assertEqual(report['rows'], 3)
+        self.assertEqual(report['inserted'], 1)
+        self.assertEqual(report['updated'], 1)
+        self.assertEqual(report['unchanged'], 1)
+        self.existing.refresh_from_db()
+        # Пустая ячейка не затирает значение
+        self.assertEqual((self.existing.name, self.existing.price), ("Общий анализ крови", 650))
+        created = Test.objects.get(nomenclature="B01")
+        self.assertEqual(created.slug, 'ferritin')
+        self.assertTrue(created.enabled)
+        self.assertIsNotNone(created.search_vector)
+
+    def test_verbose_name_header_and_duplicates(self):
+        """Тест: заголовки по verbose_name, при повторе номенклатуры побеждает последняя строка"""
+        report = self.run_import(
+            "Номенклатура,Название анализа,ID направления услуги,Стоимость анализа\n"
+            "C01,Витамин D,3,1500\n"
+            "C01,Витамин D3,3,1700\n"
+        )
+
+        self.assertEqual(report['duplicates'], 1)
+        self.assertEqual(report['inserted'], 1)
+        self.assertEqual(Test.objects.get(nomenclature="C01").price, 1700)
+
+    def test_invalid_rows_are_reported(self):
+        """Тест: ошибочные строки попадают в отчет с номером строки, остальные импортируются"""
+        report = self.run_import(
+            "nomenclature;name;service_direction;price\n"
+            "D01;Железо;1;-5\n"
+            "D02;Без направления;;100\n"
+            "D03;Магний;1;400\n"
+        )
+
+        self.assertEqual(report['errors'], 2)
+        self.assertEqual([error['line'] for error in report['error_details']], [2, 3])
+        self.assertIn('price', report['error_details'][0]['errors'])
+        self.assertIn('service_direction', report['error_details'][1]['errors'])
+        self.assertEqual(report['inserted'], 1)
+
+    def test_defaults_for_new_tests(self):
+        """Тест: направление по умолчанию подставляется только новым анализам"""
+        self.run_import(
+            "nomenclature;name;price\nA01;Общий анализ крови;500\nE01;Калий;250\n",
+            defaults={'service_direction': 7},
+        )
+
+        self.assertEqual(Test.objects.get(nomenclature="E01").service_direction, 7)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.service_direction, 1)
+
+    def test_dry_run_rolls_back(self):
+        """Тест: dry run считает изменения, но ничего не записывает"""
+        report = self.run_import("nomenclature;name;service_direction;price\nF01;Цинк;1;350\n", dry_run=True)
+
+        self.assertEqual(report['inserted'], 1)
+        self.assertFalse(Test.objects.filter(nomenclature="F01").exists())
+
+    def test_new_nomenclature_updated_in_later_chunk(self):
+        """Тест: частичная строка для номенклатуры, созданной ранее в том же файле, - изменение, а не ошибка"""
+        report = self.run_import(
+            "nomenclature;name;service_direction;price\n"
+            "H01;Кальций;1;200\n"
+            "H02;Натрий;1;250\n"
+            "H01;;;220\n"
+        )
+
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual((report['inserted'], report['duplicates']), (2, 1))
+        created = Test.objects.get(nomenclature="H01")
+        self.assertEqual((created.name, created.service_direction, created.price), ("Кальций", 1, 220))
+
+    def test_xlsx_numeric_nomenclature(self):
+        """Тест: числовая номенклатура из XLSX совпадает с существующей строкой, а не 12345.0"""
+        numeric = Test.objects.create(name="Ферритин", service_direction=2, price=900, nomenclature="12345")
+        file = xlsx_file([
+            ['nomenclature', 'name', 'service_direction', 'price'],
+            [12345, None, None, 950],
+        ])
+
+        report = TestImporter(chunk_size=2).run(read_rows(file, 'price.xlsx'))
+
+        self.assertEqual((report['inserted'], report['updated']), (0, 1))
+        numeric.refresh_from_db()
+        self.assertEqual(numeric.price, 950)
+        self.assertFalse(Test.objects.filter(nomenclature="12345.0").exists())
+
+    def test_header_without_nomenclature(self):
+        """Тест: файл без колонки номенклатуры отклоняется целиком"""
+        with self.assertRaises(TestImportError):
+            self.run_import("name;price\nЦинк;350\n")
+
+
+class TestImportAPITest(APITestCase):
+    def setUp(self):
+        self.url = reverse('test-import-file')
+        self.upload = SimpleUploadedFile(
+            'price.csv', "nomenclature;name;service_direction;price\nG01;Кальций;1;200\n".encode('utf-8')
+        )
+
+    def test_import_requires_authentication(self):
+        """Тест: импорт без токена запрещен"""
+        response = self.client.post(self.url, {'file': self.upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_import_returns_report(self):
+        """Тест: импорт через API возвращает отчет"""
+        user = get_user_model().objects.create_user(email='staff@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+
+        response = self.client.post(self.url, {'file': self.upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['inserted'], 1)
+        self.assertTrue(Test.objects.filter(nomenclature="G01").exists())
+
+    def test_unsupported_format(self):
+        """Тест: неподдерживаемый формат файла - 400"""
+        user = get_user_model().objects.create_user(email='staff@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+        upload = SimpleUploadedFile('price.txt', b'nomenclature\nG01\n')
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
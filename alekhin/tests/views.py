@@ -1,5 +1,6 @@
-from django.db.models import Q
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters import rest_framework as django_filters
@@ -8,19 +9,29 @@ from .serializers import (
     TestCreateSerializer, TestSerializer, TestUpdateSerializer, TestListSerializer
 )
 from .filters import TestFilter
+from .importer import TestImporter, TestImportError, read_rows
+from core.mixins import CountedListMixin, ResponseCacheMixin, SparseFieldsetViewMixin
+from core.pagination import CursorOnlyPagination
+from core.search import SmartSearch, SearchRankOrderingFilter
 
 
-class TestViewSet(viewsets.ModelViewSet):
-    filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = [
-        'name', 'nomenclature', 'method', 'characteristic', 'rules', 
+TEST_SEARCH = SmartSearch(
+    trigram_fields=[
+        'name', 'nomenclature', 'method', 'characteristic', 'rules',
         'readings', 'contraindications', 'depends_to'
-    ]
+    ],
+    vector_field='search_vector',
+)
+
+
+class TestViewSet(ResponseCacheMixin, CountedListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    filter_backends = [django_filters.DjangoFilterBackend, SearchRankOrderingFilter]
     filterset_class = TestFilter
     ordering_fields = ['created_at', 'name', 'price', 'service_direction']
     ordering = ['-created_at']
     lookup_field = 'slug'
     http_method_names = ['get', 'post', 'put', 'patch', 'delete']
+    pagination_class = CursorOnlyPagination
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -46,46 +57,13 @@ class TestViewSet(viewsets.ModelViewSet):
         # Smart search
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            search_query = search_query.strip()
-            search_query =  search_query.lower()
-            queryset = queryset.filter(
-                Q(name__unaccent__lower__trigram_similar=search_query) |
-                Q(nomenclature__unaccent__lower__trigram_similar=search_query) |
-                Q(method__unaccent__lower__trigram_similar=search_query) |
-                Q(characteristic__unaccent__lower__trigram_similar=search_query) |
-                Q(rules__unaccent__lower__trigram_similar=search_query) |
-                Q(readings__unaccent__lower__trigram_similar=search_query) |
-                Q(contraindications__unaccent__lower__trigram_similar=search_query) |
-                Q(depends_to__unaccent__lower__trigram_similar=search_query)
-            ).distinct()
+            queryset = TEST_SEARCH.filter(queryset, search_query)
 
         return queryset
 
     def list(self, request, *args, **kwargs):
         """GET /tests - получение списка анализов"""
-        queryset = self.filter_queryset(self.get_queryset())
-        service_direction = self.request.query_params.get('service_direction', None)
-        # Получаем общее количество анализов
-        if service_direction:
-            queryset = queryset.filter(service_direction=str(service_direction))
-        total_count = queryset.count()
-        enabled_count = queryset.filter(enabled=True).count()
-        
-        # Применяем пагинацию если она настроена
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
-        
-        # Добавляем счетчики в заголовки
-        response['Total-Count'] = str(total_count)
-        response['Enabled-Count'] = str(enabled_count)
-        response['Access-Control-Expose-Headers'] = 'Total-Count, Enabled-Count'
-        
-        return response
+        return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         """POST /tests - создание анализа (требует токен)"""
@@ -109,4 +87,29 @@ class TestViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         """DELETE /tests/{slug} - удаление анализа (требует токен)"""
         return super().destroy(request, *args, **kwargs)
-    
\ No newline at end of file
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """
+        POST /tests/import - импорт прайс-листа CSV/XLSX (требует токен).
+        Поля формы: file, service_direction (для новых анализов без направления), dry_run
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['Файл не передан']}, status=status.HTTP_400_BAD_REQUEST)
+
+        defaults = {}
+        if request.data.get('service_direction'):
+            try:
+                defaults['service_direction'] = int(request.data['service_direction'])
+            except ValueError:
+                return Response(
+                    {'service_direction': ['Ожидается ID направления услуги']}, status=status.HTTP_400_BAD_REQUEST
+                )
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+
+        try:
+            report = TestImporter(defaults=defaults, dry_run=dry_run).run(read_rows(upload, upload.name))
+        except TestImportError as e:
+            return Response({'file': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
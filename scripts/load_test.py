@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест публичных списков каталога (только стандартная библиотека)
+
+Сравнение gunicorn с прежним runserver:
+
+    # gunicorn (docker-compose up) - порт 8000
+    # runserver рядом, на порту 8001:
+    docker-compose run --rm -p 8001:8001 backend python manage.py runserver 0.0.0.0:8001 --noreload
+
+    python3 scripts/load_test.py --base-url http://localhost:8001 --base-url http://localhost:8000
+
+Для каждого адреса и эндпойнта печатает число запросов, ошибки, RPS
+и задержки p50/p95/p99, в конце - итоговый RPS каждого адреса
+"""
+import argparse
+import http.client
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/goods/',
+    '/tests/?cursor=',
+    '/news/',
+    '/services/',
+    '/specialists/',
+]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def worker(base_url, path, deadline):
+    """Шлет запросы по одному keep-alive соединению до deadline"""
+    parts = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.netloc, timeout=30)
+    latencies, errors = [], 0
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Accept': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    connection.close()
+    return latencies, errors
+
+
+def run(base_url, path, concurrency, duration):
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: worker(base_url, path, deadline), range(concurrency)))
+
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': len(latencies) / duration,
+        'p50': statistics.median(latencies) if latencies else 0.0,
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--base-url', action='append', dest='base_urls',
+        help='Адрес backend; можно указать несколько для сравнения (по умолчанию http://localhost:8000)'
+    )
+    parser.add_argument('--path', action='append', dest='paths', help='Эндпойнт (по умолчанию - списки каталога)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Одновременных соединений')
+    parser.add_argument('--duration', type=float, default=15, help='Секунд на каждый эндпойнт')
+    parser.add_argument('--warmup', type=float, default=2, help='Секунд прогрева перед замером')
+    args = parser.parse_args()
+
+    base_urls = args.base_urls or ['http://localhost:8000']
+    paths = args.paths or DEFAULT_PATHS
+    totals = {}
+
+    for base_url in base_urls:
+        print(f'\n{base_url} (соединений: {args.concurrency}, {args.duration:g} с на эндпойнт)')
+        print(f"{'эндпойнт':<20} {'запросов':>9} {'ошибок':>7} {'RPS':>8} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+        for path in paths:
+            if args.warmup:
+                run(base_url, path, args.concurrency, args.warmup)
+            result = run(base_url, path, args.concurrency, args.duration)
+            totals[base_url] = totals.get(base_url, 0) + result['requests']
+            print(
+                f"{path:<20} {result['requests']:>9} {result['errors']:>7} {result['rps']:>8.1f} "
+                f"{result['p50'] * 1000:>8.1f} {result['p95'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f}"
+            )
+
+    print('\nИтого, RPS по всем эндпойнтам:')
+    baseline = None
+    for base_url in base_urls:
+        rps = totals[base_url] / (args.duration * len(paths))
+        ratio = f' (x{rps / baseline:.1f} к первому)' if baseline else ''
+        baseline = baseline or rps
+        print(f'  {base_url}: {rps:.1f}{ratio}')
+
+
+if __name__ == '__main__':
+    main()